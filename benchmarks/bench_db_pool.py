@@ -0,0 +1,64 @@
+# /benchmarks/bench_db_pool.py
+# Run from the repository root: python -m benchmarks.bench_db_pool
+
+# GENERAL PYTHON imports ->
+from contextlib import ExitStack, contextmanager
+import sqlite3
+from unittest import mock
+# LOCAL imports ->
+import helpers.db_utils as db_utils
+from helpers.user_data_util_classes import task_module, time_module, user_module
+from helpers.user_data_util_classes.user_module import User
+from benchmarks.common import ops_per_second, register_users, report, use_temporary_database
+
+ITERATIONS = 2000
+USER_ID = 1000
+
+
+def legacy_execute_query(query: str, params: tuple = (), fetch: bool = False):
+    """The pre-pool execute_query: one connect/close per statement."""
+    with sqlite3.connect(db_utils.DATABASE_FILE) as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        if fetch:
+            fetched = cursor.fetchall()
+            return fetched if len(fetched) > 0 else None
+        conn.commit()
+        return None
+
+
+def legacy_execute_many(query: str, params_seq: list[tuple]) -> int:
+    """execute_many on a connection of its own, like :legacy_execute_query."""
+    with sqlite3.connect(db_utils.DATABASE_FILE) as conn:
+        return conn.executemany(query, params_seq).rowcount
+
+
+@contextmanager
+def legacy_queries():
+    with ExitStack() as stack:
+        for module in (db_utils, user_module, task_module, time_module):
+            stack.enter_context(mock.patch.object(module, "execute_query", legacy_execute_query))
+            if hasattr(module, "execute_many"): # TaskManager's inserts go through it
+                stack.enter_context(mock.patch.object(module, "execute_many", legacy_execute_many))
+        yield
+
+
+def compare(label: str, func) -> tuple[str, float, float]:
+    with legacy_queries():
+        before = ops_per_second(func, ITERATIONS)
+    after = ops_per_second(func, ITERATIONS)
+    return (label, before, after)
+
+
+if __name__ == "__main__":
+    use_temporary_database()
+    register_users(1, first_id=USER_ID)
+    user = User(USER_ID)
+
+    # Reads first so both runs see the same number of rows.
+    rows = [
+        compare("User.user_info", user.user_info),
+        compare("TaskManager.add_user_task", lambda: user.task.add_user_task("Benchmark task", 2)),
+    ]
+    report(f"Pooled connections vs. connect-per-query ({ITERATIONS} calls, ops/sec)", rows)
+    db_utils.close_all_connections()
@@ -0,0 +1,152 @@
+# /benchmarks/bench_jobstore_contention.py
+# Run from the repository root: python -m benchmarks.bench_jobstore_contention
+
+# GENERAL PYTHON imports ->
+from datetime import datetime, timedelta
+import multiprocessing
+import pickle
+import statistics
+import time
+from apscheduler.executors.debug import DebugExecutor
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.base import STATE_PAUSED, STATE_RUNNING
+from apscheduler.triggers.interval import IntervalTrigger
+import pytz
+# LOCAL imports ->
+import helpers.db_utils as db_utils
+from helpers.scheduler.jobstore import build_jobstore
+from helpers.user_data_util_classes.task_module import TaskManager
+from benchmarks.common import register_users, use_temporary_database
+
+FIRING_JOBS = 10_000
+FIRST_ID = 1000
+USER_ID = 1
+MIN_FIRING_SECONDS = 3 # Fire again until this much firing was measured, so every row gets enough samples
+
+
+def fire(user_id: int, reminder_type: str):
+    """Stands in for send_reminder_runner; only the jobstore's work is measured."""
+
+
+def add_due_jobs(scheduler, store, due_at: datetime):
+    """FIRING_JOBS reminder jobs, all due at due_at."""
+    if not isinstance(store, SQLAlchemyJobStore):
+        for uid in range(FIRST_ID, FIRST_ID + FIRING_JOBS):
+            scheduler.add_job(fire, IntervalTrigger(days=1, start_date=due_at), args=[uid, 'DONE'],
+                              id=f"reminder_{uid}_DONE", next_run_time=due_at, misfire_grace_time=60)
+        return
+
+    # Written in one transaction, cloned from a real job (see bench_reminder_dispatch)
+    template = scheduler.add_job(fire, IntervalTrigger(days=1, start_date=due_at), args=[FIRST_ID, 'DONE'],
+                                 id="template", next_run_time=due_at, misfire_grace_time=60)
+    state = template.__getstate__()
+    scheduler.remove_job("template")
+    rows = []
+    for uid in range(FIRST_ID, FIRST_ID + FIRING_JOBS):
+        job_id = f"reminder_{uid}_DONE"
+        job_state = {**state, 'id': job_id, 'name': job_id, 'args': (uid, 'DONE'), 'next_run_time': due_at}
+        rows.append({'id': job_id, 'next_run_time': due_at.timestamp(), 'job_state': pickle.dumps(job_state, store.pickle_protocol)})
+    with store.engine.begin() as connection:
+        connection.execute(store.jobs_t.insert(), rows)
+
+
+def add_tasks_meanwhile(database_file, measuring, firing, results):
+    """Adds tasks back to back until *measuring* is cleared and puts the ms \
+    per call of the ones started while *firing* was set into *results*.
+
+    Runs in a process of its own, the way the bot's menus and its scheduler \
+    thread never share a GIL with this benchmark, so what slows the calls \
+    down is SQLite's locking and not Python's.
+    """
+    db_utils.DATA_DIR = database_file.parent
+    db_utils.DATABASE_FILE = database_file
+    tasks = TaskManager(USER_ID)
+    latencies = []
+    while measuring.is_set():
+        if not firing.wait(0.05):
+            continue
+        start = time.perf_counter()
+        tasks.add_user_task("Benchmark task", 1)
+        latencies.append((time.perf_counter() - start) * 1000)
+    db_utils.close_all_connections()
+    results.put(latencies)
+
+
+def measure(database_file, fire_rounds) -> tuple[int, float, list[float]]:
+    """Calls fire_rounds() (which sets/clears *firing* around every round it \
+    fires and returns when done) with the task adding process running.
+
+    Returns:
+        tuple[int, float, list[float]]: (rounds, seconds of firing per round, latencies).
+    """
+    context = multiprocessing.get_context("spawn")
+    measuring, firing, results = context.Event(), context.Event(), context.Queue()
+    measuring.set()
+    adder = context.Process(target=add_tasks_meanwhile, args=(database_file, measuring, firing, results))
+    adder.start()
+    rounds, elapsed = fire_rounds(firing)
+    measuring.clear()
+    latencies = results.get()
+    adder.join()
+    return rounds, elapsed / rounds, latencies
+
+
+def idle(firing) -> tuple[int, float]:
+    """No jobs at all: how fast tasks are added on their own."""
+    firing.set()
+    time.sleep(MIN_FIRING_SECONDS)
+    firing.clear()
+    return 1, float(MIN_FIRING_SECONDS)
+
+
+def while_firing(backend: str, database_file):
+    """Fires FIRING_JOBS jobs kept in backend's jobstore, MIN_FIRING_SECONDS \
+    worth of rounds. Returns fire_rounds for :measure.
+    """
+    def fire_rounds(firing) -> tuple[int, float]:
+        store = build_jobstore(backend, database_file, database_file.parent / f"jobs_{backend}.db")
+        scheduler = BackgroundScheduler(jobstores={'default': store}, executors={'default': DebugExecutor()}, timezone=pytz.utc)
+        scheduler.start(paused=True) # Jobs are stored, the scheduler thread never wakes up
+        rounds, elapsed = 0, 0.0
+        while elapsed < MIN_FIRING_SECONDS:
+            add_due_jobs(scheduler, store, datetime.now(pytz.utc).replace(microsecond=0) - timedelta(seconds=10))
+
+            # What the scheduler thread does when it wakes up: run every due job,
+            # then write each one's next run time back to the jobstore
+            scheduler.state = STATE_RUNNING
+            firing.set()
+            start = time.perf_counter()
+            scheduler._process_jobs()
+            elapsed += time.perf_counter() - start
+            firing.clear()
+            scheduler.state = STATE_PAUSED
+
+            scheduler.remove_all_jobs() # Next round adds them again; also keeps "shared"'s jobs from moving to the next backend
+            rounds += 1
+        scheduler.shutdown(wait=False)
+        return rounds, elapsed
+
+    return fire_rounds
+
+
+def percentile(latencies: list[float], share: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+if __name__ == "__main__":
+    database_file = use_temporary_database()
+    register_users(1, first_id=USER_ID)
+
+    rows = [("idle", *measure(database_file, idle))]
+    for backend in ("shared", "sqlite", "memory"):
+        rows.append((backend, *measure(database_file, while_firing(backend, database_file))))
+
+    print(f"\nadd_user_task (own process) while {FIRING_JOBS:,} reminder jobs fire")
+    print(f"{'jobstore':<10}{'rounds':>8}{'firing (s)':>12}{'tasks added':>13}{'p50 (ms)':>10}{'p99 (ms)':>10}{'p99.9 (ms)':>12}{'max (ms)':>10}")
+    for (label, rounds, firing, latencies) in rows:
+        print(f"{label:<10}{rounds:>8}{firing:>12.2f}{len(latencies):>13,}{statistics.median(latencies):>10.2f}"
+              f"{percentile(latencies, 0.99):>10.2f}{percentile(latencies, 0.999):>12.2f}{max(latencies):>10.2f}")
+    db_utils.shutdown_executors()
+    db_utils.close_all_connections()
@@ -0,0 +1,57 @@
+# /benchmarks/bench_local_time.py
+# Run from the repository root: python -m benchmarks.bench_local_time
+
+# GENERAL PYTHON imports ->
+from datetime import datetime
+import time
+from unittest import mock
+import pytz
+# LOCAL imports ->
+import helpers.db_utils as db_utils
+from helpers.db_utils import execute_query
+from helpers.user_data_util_classes.time_module import TimeManager, tzinfo_for, user_timezones
+from benchmarks.common import register_users, use_temporary_database
+
+ITERATIONS = 20000
+USERS = 1000
+FIRST_ID = 1000
+
+
+def legacy_get_user_timezone(self) -> str | None:
+    """The uncached lookup TimeManager.get_user_timezone replaced."""
+    return execute_query("SELECT IANA_timezone FROM users WHERE telegram_id = ?", (self._uid,), True)[0][0]
+
+
+def legacy_local_time_in(user_tz_string: str | None) -> datetime:
+    """The uncached conversion TimeManager.local_time_in replaced."""
+    return datetime.now(pytz.timezone(user_tz_string))
+
+
+def measure() -> float:
+    """Mean µs per get_user_local_time() over users in round robin."""
+    managers = [TimeManager(FIRST_ID + index) for index in range(USERS)]
+    for manager in managers: # Warm up (fills the caches when they're in use)
+        manager.get_user_local_time()
+
+    start = time.perf_counter()
+    for index in range(ITERATIONS):
+        managers[index % USERS].get_user_local_time()
+    elapsed = time.perf_counter() - start
+    return elapsed / ITERATIONS * 1_000_000
+
+
+if __name__ == "__main__":
+    use_temporary_database()
+    register_users(USERS, timezone="America/New_York", first_id=FIRST_ID)
+
+    with mock.patch.object(TimeManager, "get_user_timezone", legacy_get_user_timezone), \
+         mock.patch.object(TimeManager, "local_time_in", staticmethod(legacy_local_time_in)):
+        before = measure()
+    after = measure()
+
+    print(f"\nTimeManager.get_user_local_time() for {USERS} users ({ITERATIONS} calls)")
+    print(f"{'':<12}{'latency (µs)':>16}")
+    print(f"{'before':<12}{before:>16,.2f}")
+    print(f"{'after':<12}{after:>16,.2f}")
+    print(f"Cached users: {len(user_timezones)}, tzinfo cache: {tzinfo_for.cache_info()}")
+    db_utils.close_all_connections()
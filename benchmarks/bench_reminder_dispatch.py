@@ -0,0 +1,111 @@
+# /benchmarks/bench_reminder_dispatch.py
+# Run from the repository root: python -m benchmarks.bench_reminder_dispatch
+
+# GENERAL PYTHON imports ->
+import asyncio
+from datetime import datetime, timedelta
+import pickle
+import time
+from apscheduler.executors.debug import DebugExecutor
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.base import STATE_RUNNING
+from apscheduler.triggers.interval import IntervalTrigger
+import pytz
+# LOCAL imports ->
+from config import FORMAT_STRING_C
+import helpers.db_utils as db_utils
+from helpers.scheduler.reminder_dispatcher import dispatch_due_reminders
+from benchmarks.common import register_users, use_temporary_database
+
+DUE_REMINDERS = 10_000
+FIRST_ID = 1000
+sent = []
+
+
+def record_send(user_id: int, reminder_type: str):
+    """Stands in for send_reminder_runner: both modes only hand reminders over."""
+    sent.append((user_id, reminder_type))
+
+
+async def record_send_async(user_id: int, reminder_type: str, reminder_content: str):
+    record_send(user_id, reminder_type)
+
+
+def jobs_mode_tick(database_file, due_at: datetime) -> tuple[float, float]:
+    """One job per reminder, all due now. Returns (ms for the wakeup that \
+    fires them, ms for the next, idle wakeup).
+    """
+    store = SQLAlchemyJobStore(url=f"sqlite:///{database_file.resolve()}")
+    scheduler = BackgroundScheduler(jobstores={'default': store}, executors={'default': DebugExecutor()}, timezone=pytz.utc)
+    scheduler.start(paused=True) # Jobs are stored, the scheduler thread never wakes up
+
+    # Scheduling a job for a past moment would move it to tomorrow, so the jobs are
+    # written straight into the jobstore's table, cloned from a real one and due now.
+    template = scheduler.add_job(record_send, IntervalTrigger(days=1, start_date=due_at + timedelta(days=1)),
+                                 args=[FIRST_ID, 'DONE'], id="template", misfire_grace_time=60)
+    state = template.__getstate__()
+    scheduler.remove_job("template")
+    rows = []
+    for uid in range(FIRST_ID, FIRST_ID + DUE_REMINDERS):
+        job_id = f"reminder_{uid}_DONE"
+        job_state = {**state, 'id': job_id, 'name': job_id, 'args': (uid, 'DONE'), 'next_run_time': due_at}
+        rows.append({'id': job_id, 'next_run_time': due_at.timestamp(), 'job_state': pickle.dumps(job_state, store.pickle_protocol)})
+    with store.engine.begin() as connection:
+        connection.execute(store.jobs_t.insert(), rows)
+
+    # What the scheduler thread does when it wakes up, run here so it can be timed
+    scheduler.state = STATE_RUNNING
+    start = time.perf_counter()
+    scheduler._process_jobs()
+    firing = time.perf_counter() - start
+    start = time.perf_counter()
+    scheduler._process_jobs()
+    idle = time.perf_counter() - start
+    scheduler.shutdown(wait=False)
+    return firing * 1000, idle * 1000
+
+
+def dispatcher_mode_tick(due_at: datetime) -> tuple[float, float]:
+    """One *reminders* row per reminder, all due now. Returns (ms for the \
+    tick that sends them, ms for the next, idle tick).
+    """
+    conn = db_utils.get_connection()
+    conn.execute("UPDATE users SET reminder_done_enabled = 1")
+    conn.executemany(
+        "INSERT INTO reminders (user_id, type, reminder_time_locale, next_fire_utc) VALUES (?, 'DONE', ?, ?)",
+        [(uid, due_at.astimezone(pytz.timezone("Europe/Berlin")).strftime(FORMAT_STRING_C), due_at.strftime(FORMAT_STRING_C))
+         for uid in range(FIRST_ID, FIRST_ID + DUE_REMINDERS)]
+    )
+    conn.commit()
+
+    async def ticks():
+        now_utc = datetime.now(pytz.utc)
+        start = time.perf_counter()
+        await dispatch_due_reminders(now_utc, send=record_send_async)
+        firing = time.perf_counter() - start
+        start = time.perf_counter()
+        await dispatch_due_reminders(now_utc, send=record_send_async)
+        idle = time.perf_counter() - start
+        return firing * 1000, idle * 1000
+
+    return asyncio.run(ticks())
+
+
+if __name__ == "__main__":
+    database_file = use_temporary_database()
+    register_users(DUE_REMINDERS, first_id=FIRST_ID)
+    due_at = datetime.now(pytz.utc).replace(microsecond=0) - timedelta(seconds=10)
+
+    jobs = jobs_mode_tick(database_file, due_at)
+    assert len(sent) == DUE_REMINDERS, len(sent)
+    sent.clear()
+    dispatcher = dispatcher_mode_tick(due_at)
+    assert len(sent) == DUE_REMINDERS, len(sent)
+
+    print(f"\nOne minute with {DUE_REMINDERS:,} reminders due at once")
+    print(f"{'mode':<14}{'firing tick (ms)':>18}{'idle tick (ms)':>16}")
+    print(f"{'jobs':<14}{jobs[0]:>18,.1f}{jobs[1]:>16,.2f}")
+    print(f"{'dispatcher':<14}{dispatcher[0]:>18,.1f}{dispatcher[1]:>16,.2f}")
+    db_utils.shutdown_executors()
+    db_utils.close_all_connections()
@@ -0,0 +1,93 @@
+# /benchmarks/bench_reminder_jobs.py
+# Run from the repository root: python -m benchmarks.bench_reminder_jobs
+
+# GENERAL PYTHON imports ->
+from datetime import datetime, timedelta
+import pickle
+import time
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+import pytz
+# LOCAL imports ->
+from benchmarks.common import use_temporary_database
+from helpers.scheduler.scheduler import remove_reminder_job
+from helpers.scheduler.send_reminder_message import send_reminder_runner
+
+SCHEDULED_JOBS = 100_000
+ITERATIONS = 20
+FIRST_ID = 1000
+
+
+def legacy_remove(scheduler, job_id: str) -> bool:
+    """The scan (un)set_user_reminder used before: list every job, filter by id."""
+    jobs_to_remove = [job for job in scheduler.get_jobs(jobstore='default') if job.id == job_id]
+    for job in jobs_to_remove:
+        job.remove()
+    return bool(jobs_to_remove)
+
+
+def reschedule(scheduler, remove, uid: int):
+    """One reminder change: drop the user's job, then schedule it again."""
+    job_id = f"reminder_{uid}_DONE"
+    remove(scheduler, job_id)
+    scheduler.add_job(
+        func = send_reminder_runner,
+        trigger = IntervalTrigger(days=1, start_date=datetime.now(pytz.utc) + timedelta(hours=1)),
+        args = [uid, 'DONE'],
+        id = job_id,
+        replace_existing = True,
+        name = job_id,
+        misfire_grace_time = 60,
+    )
+
+
+def fill_jobstore(scheduler, store: SQLAlchemyJobStore, count: int):
+    """Writes *count* reminder jobs straight into the jobstore's table \
+    (scheduling them one by one would take minutes), cloned from a real one.
+    """
+    reschedule(scheduler, remove_reminder_job, FIRST_ID)
+    template = scheduler.get_job(f"reminder_{FIRST_ID}_DONE", jobstore='default')
+    state = template.__getstate__()
+    next_run_time = template.next_run_time.timestamp()
+
+    rows = []
+    for uid in range(FIRST_ID + 1, FIRST_ID + count):
+        job_id = f"reminder_{uid}_DONE"
+        rows.append({
+            'id': job_id,
+            'next_run_time': next_run_time,
+            'job_state': pickle.dumps({**state, 'id': job_id, 'name': job_id, 'args': (uid, 'DONE')}, store.pickle_protocol),
+        })
+    with store.engine.begin() as connection:
+        connection.execute(store.jobs_t.insert(), rows)
+
+
+def measure(scheduler, remove) -> float:
+    """Mean ms per reminder change, spread over the scheduled users."""
+    step = SCHEDULED_JOBS // ITERATIONS
+    start = time.perf_counter()
+    for index in range(ITERATIONS):
+        reschedule(scheduler, remove, FIRST_ID + index * step)
+    elapsed = time.perf_counter() - start
+    return elapsed / ITERATIONS * 1000
+
+
+if __name__ == "__main__":
+    database_file = use_temporary_database()
+    store = SQLAlchemyJobStore(url=f"sqlite:///{database_file.resolve()}")
+    scheduler = BackgroundScheduler(jobstores={'default': store}, timezone=pytz.utc)
+    scheduler.start(paused=True) # Jobs are stored, never run
+
+    fill_jobstore(scheduler, store, SCHEDULED_JOBS)
+    assert len(scheduler.get_jobs(jobstore='default')) == SCHEDULED_JOBS
+
+    before = measure(scheduler, legacy_remove)
+    after = measure(scheduler, remove_reminder_job)
+    assert len(scheduler.get_jobs(jobstore='default')) == SCHEDULED_JOBS
+
+    print(f"\nReminder change (remove + add job) with {SCHEDULED_JOBS:,} scheduled jobs ({ITERATIONS} runs)")
+    print(f"{'':<12}{'latency (ms)':>16}")
+    print(f"{'before':<12}{before:>16,.2f}")
+    print(f"{'after':<12}{after:>16,.2f}")
+    scheduler.shutdown(wait=False)
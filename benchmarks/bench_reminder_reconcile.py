@@ -0,0 +1,123 @@
+# /benchmarks/bench_reminder_reconcile.py
+# Run from the repository root: python -m benchmarks.bench_reminder_reconcile
+
+# GENERAL PYTHON imports ->
+from datetime import datetime, timedelta
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+import pytz
+# LOCAL imports ->
+import helpers.db_utils as db_utils
+from helpers.scheduler.jobstore import build_jobstore
+from helpers.scheduler.reconciliation import (
+    delete_jobs,
+    expected_fire_times,
+    read_reminder_jobs,
+    reconcile_reminders,
+    supports_bulk_writes
+)
+from helpers.scheduler.scheduler import reminder_job_id, schedule_reminder_job
+from helpers.scheduler.send_reminder_message import send_reminder_runner
+from benchmarks.common import register_users, use_temporary_database
+
+USERS = 100_000
+DRIFTED = 1000 # Of each kind of drift
+FIRST_ID = 1000
+
+
+def add_reminders(conn):
+    """A DONE and a LEFT reminder for every user, at a handful of local times."""
+    conn.executemany(
+        "INSERT INTO reminders (user_id, type, reminder_time_locale) VALUES (?, ?, ?)",
+        [(uid, reminder_type, f"2026-01-01 {hour:02d}:{(uid % 4) * 15:02d}:00")
+         for uid in range(FIRST_ID, FIRST_ID + USERS) for (reminder_type, hour) in (('DONE', 9), ('LEFT', 21))]
+    )
+    conn.execute("UPDATE users SET reminder_done_enabled = 1, reminder_left_enabled = 1")
+    conn.commit()
+
+
+def add_drift(conn, scheduler, store):
+    """DRIFTED cases of every kind of disagreement reconcile_reminders repairs."""
+    drifted = range(FIRST_ID, FIRST_ID + DRIFTED)
+    conn.executemany("INSERT INTO reminders (user_id, type, reminder_time_locale) VALUES (?, 'DONE', '2026-01-01 08:00:00')",
+                     [(uid + 10 * USERS,) for uid in drifted]) # Their users were removed
+    conn.executemany("UPDATE users SET reminder_done_enabled = 0 WHERE telegram_id = ?", [(uid,) for uid in drifted])
+    conn.executemany("DELETE FROM reminders WHERE (user_id = ? AND type = 'LEFT')", [(uid + DRIFTED,) for uid in drifted])
+    conn.commit()
+
+    bulk = supports_bulk_writes(store)
+    fire_time = datetime.fromtimestamp(next(iter(read_reminder_jobs(store, bulk).values())), pytz.utc)
+    delete_jobs(store, [f"reminder_{uid + 2 * DRIFTED}_DONE" for uid in drifted], bulk)
+    for uid in drifted:
+        schedule_reminder_job(scheduler, uid + 3 * DRIFTED, 'DONE', fire_time + timedelta(hours=1)) # Old timezone
+        schedule_reminder_job(scheduler, uid + 20 * USERS, 'DONE', fire_time) # No reminder left
+
+
+def check_jobs(conn, scheduler) -> tuple[int, int]:
+    """Loads every job back through scheduler.get_jobs() (so bulk written \
+    ones are unpickled like the scheduler would) and compares them with the \
+    *reminders* rows.
+
+    Returns:
+        tuple[int, int]: Reminder jobs loaded, and how many reminders have \
+        no job or one with other args or another trigger, plus the jobs \
+        that have no reminder.
+    """
+    rows = conn.execute(
+        "SELECT r.rowid, r.user_id, r.type, r.reminder_time_locale, u.IANA_timezone, r.next_fire_utc "
+        "FROM reminders AS r JOIN users AS u ON (u.telegram_id = r.user_id)"
+    ).fetchall()
+    expected, _ = expected_fire_times(rows, datetime.now(pytz.utc))
+    jobs = {job.id: job for job in scheduler.get_jobs() if job.id.startswith("reminder_")}
+    loaded = len(jobs)
+
+    wrong = 0
+    for ((user_id, reminder_type), fire_time) in expected.items():
+        job = jobs.pop(reminder_job_id(user_id, reminder_type), None)
+        if job is None:
+            wrong += 1
+            continue
+        trigger = job.trigger
+        # Whole days apart is the same schedule, the next fire may have moved on since
+        if (job.func is not send_reminder_runner or tuple(job.args) != (user_id, reminder_type)
+                or not isinstance(trigger, IntervalTrigger) or trigger.interval != timedelta(days=1)
+                or str(trigger.timezone) != fire_time.iana_timezone
+                or round(trigger.start_date.timestamp() - fire_time.timestamp) % 86400
+                or round(job.next_run_time.timestamp() - fire_time.timestamp) % 86400):
+            wrong += 1
+    return loaded, wrong + len(jobs)
+
+
+def run(label: str, database_file, backend: str, mode: str = "jobs") -> list[tuple]:
+    """Reconciles an empty jobstore, then one with drift, then a clean one, \
+    checking the jobs after each (see :check_jobs)."""
+    store = build_jobstore(backend, database_file, database_file.parent / "jobs.db")
+    scheduler = BackgroundScheduler(jobstores={'default': store}, timezone=pytz.utc)
+    scheduler.start(paused=True) # Jobs go straight to the store, so the timings include writing them
+    conn = db_utils.get_connection()
+    rows = [(f"{label}, empty jobstore", reconcile_reminders(conn, scheduler, store, mode), *check_jobs(conn, scheduler))]
+    add_drift(conn, scheduler, store)
+    rows.append((f"{label}, drifted", reconcile_reminders(conn, scheduler, store, mode), *check_jobs(conn, scheduler)))
+    rows.append((f"{label}, in sync", reconcile_reminders(conn, scheduler, store, mode), *check_jobs(conn, scheduler)))
+    scheduler.remove_all_jobs()
+    scheduler.shutdown(wait=False)
+    return rows
+
+
+if __name__ == "__main__":
+    database_file = use_temporary_database()
+    register_users(USERS, first_id=FIRST_ID)
+    conn = db_utils.get_connection()
+    add_reminders(conn)
+
+    rows = run("sqlite", database_file, "sqlite")
+    conn.execute("DELETE FROM reminders"); conn.commit(); add_reminders(conn)
+    rows += run("memory", database_file, "memory")
+
+    print(f"\nStartup reconciliation, {USERS:,} users with two reminders each ({DRIFTED:,} cases per kind of drift)")
+    print(f"{'run':<24}{'seconds':>9}{'orphans':>9}{'flags':>7}{'added':>9}{'removed':>9}{'moved':>7}{'jobs':>9}{'wrong':>7}")
+    for (label, report, loaded, wrong) in rows:
+        print(f"{label:<24}{report.seconds:>9.2f}{report.orphaned_rows:>9,}{report.flags_enabled + report.flags_cleared:>7,}"
+              f"{report.jobs_added:>9,}{report.jobs_removed:>9,}{report.jobs_rescheduled:>7,}{loaded:>9,}{wrong:>7,}")
+    db_utils.shutdown_executors()
+    db_utils.close_all_connections()
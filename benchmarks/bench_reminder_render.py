@@ -0,0 +1,67 @@
+# /benchmarks/bench_reminder_render.py
+# Run from the repository root: python -m benchmarks.bench_reminder_render
+
+# GENERAL PYTHON imports ->
+from datetime import datetime
+import time
+import pytz
+# LOCAL imports ->
+from config import FORMAT_STRING_C, FORMAT_STRING_DATE
+import helpers.db_utils as db_utils
+from helpers.scheduler.send_reminder_message import render_reminder, render_reminders
+from helpers.user_data_util_classes.time_module import user_timezones
+from helpers.user_data_util_classes.user_module import User
+from benchmarks.common import register_users, use_temporary_database
+
+DUE_USERS = 1000 # One dispatcher batch (REMINDER_DISPATCH_BATCH_SIZE)
+TASKS_PER_USER = 8
+FIRST_ID = 1000
+
+
+def legacy_determine_message(user_id: int, reminder_type: str) -> str:
+    """What rendering one reminder cost before: a full User, then its tasks."""
+    user_at_hand = User(user_id)
+    user_tasks = user_at_hand.task.get_user_tasks()
+    user_at_hand._info
+    return render_reminder(reminder_type, user_tasks)
+
+
+def measure(render, reminders: list[tuple[int, str]]) -> tuple[list[str], int, float]:
+    """Returns (texts, statements run, ms) for rendering every reminder, \
+    starting from a cold timezone cache like a tick after a restart.
+    """
+    for (user_id, _) in reminders:
+        user_timezones.invalidate(user_id)
+    statements = []
+    conn = db_utils.get_connection()
+    conn.set_trace_callback(statements.append)
+    start = time.perf_counter()
+    texts = render(reminders)
+    elapsed = time.perf_counter() - start
+    conn.set_trace_callback(None)
+    return texts, len(statements), elapsed * 1000
+
+
+if __name__ == "__main__":
+    use_temporary_database()
+    register_users(DUE_USERS, first_id=FIRST_ID)
+    now = datetime.now(pytz.timezone("Europe/Berlin"))
+    conn = db_utils.get_connection()
+    conn.executemany(
+        "INSERT INTO tasks (user_id, content, priority, is_done, created_at, local_day) VALUES (?, ?, ?, ?, ?, ?)",
+        [(uid, f"Task {n} of user {uid}", n % 3 + 1, n % 2, now.strftime(FORMAT_STRING_C), now.strftime(FORMAT_STRING_DATE))
+         for uid in range(FIRST_ID, FIRST_ID + DUE_USERS) for n in range(TASKS_PER_USER)]
+    )
+    conn.commit()
+    reminders = [(uid, 'DONE' if uid % 2 else 'LEFT') for uid in range(FIRST_ID, FIRST_ID + DUE_USERS)]
+
+    before = measure(lambda due: [legacy_determine_message(*reminder) for reminder in due], reminders)
+    after = measure(render_reminders, reminders)
+    assert before[0] == after[0], "Both paths must render the same texts"
+
+    print(f"\nRendering {DUE_USERS:,} reminders due in one tick ({TASKS_PER_USER} tasks each)")
+    print(f"{'path':<14}{'statements':>12}{'total (ms)':>14}")
+    print(f"{'per user':<14}{before[1]:>12,}{before[2]:>14,.1f}")
+    print(f"{'bulk':<14}{after[1]:>12,}{after[2]:>14,.1f}")
+    db_utils.shutdown_executors()
+    db_utils.close_all_connections()
@@ -0,0 +1,83 @@
+# /benchmarks/bench_user_info.py
+# Run from the repository root: python -m benchmarks.bench_user_info
+
+# GENERAL PYTHON imports ->
+from datetime import datetime
+import time
+from unittest import mock
+# LOCAL imports ->
+from config import FORMAT_STRING_DATE
+import helpers.db_utils as db_utils
+from helpers.db_utils import execute_query
+from helpers.user_data_util_classes.user_module import User
+from benchmarks.common import register_users, use_temporary_database
+
+ITERATIONS = 2000
+HISTORY_ROWS = 5000
+USER_ID = 1000
+
+
+def legacy_user_info(self) -> dict:
+    """The per-field implementation User.user_info replaced."""
+    timezone = execute_query("SELECT utc_offset, IANA_timezone FROM users WHERE telegram_id = ?", (self._uid,), True)[0]
+    tasks_logged = execute_query("SELECT COUNT(id) FROM tasks WHERE user_id = ?", (self._uid,), True)[0][0]
+    tasks_done = execute_query("SELECT COUNT(id) FROM tasks WHERE (user_id = ? AND is_done = 1)", (self._uid,), True)[0][0]
+    tasks_left = execute_query("SELECT COUNT(id) FROM tasks WHERE (user_id = ? AND is_done = 0)", (self._uid,), True)[0][0]
+    todays_date = datetime.strftime(self.time.get_user_local_time(), FORMAT_STRING_DATE) + "%"
+    todays_tasks = execute_query("SELECT COUNT(id) FROM tasks WHERE (user_id = ? AND (created_at LIKE ?))", (self._uid, todays_date), True)[0][0]
+    todays_tasks_done = execute_query("SELECT COUNT(id) FROM tasks WHERE (user_id = ? AND is_done = 1 AND (created_at LIKE ?))", (self._uid, todays_date), True)[0][0]
+    reminder_done = reminder_left = None
+    if execute_query("SELECT reminder_done_enabled FROM users WHERE telegram_id = ?", (self._uid,), True)[0][0] == 1:
+        reminder_done = execute_query("SELECT reminder_time_locale FROM reminders WHERE (user_id = ? AND type = 'DONE')", (self._uid,), True)[0][0]
+    if execute_query("SELECT reminder_left_enabled FROM users WHERE telegram_id = ?", (self._uid,), True)[0][0] == 1:
+        reminder_left = execute_query("SELECT reminder_time_locale FROM reminders WHERE (user_id = ? AND type = 'LEFT')", (self._uid,), True)[0][0]
+    return {
+        "utc_offset": timezone[0], "IANA_timezone": timezone[1],
+        "tasks_logged": tasks_logged, "tasks_done": tasks_done, "tasks_left": tasks_left,
+        "todays_tasks": todays_tasks, "todays_tasks_done": todays_tasks_done,
+        "reminder_done": reminder_done, "reminder_left": reminder_left
+    }
+
+
+def measure_construction() -> tuple[int, float]:
+    """Returns (statements per profile load of a fresh User, mean latency in µs)."""
+    statements = []
+    conn = db_utils.get_connection()
+    conn.set_trace_callback(statements.append)
+    User(USER_ID)._info
+    conn.set_trace_callback(None)
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        User(USER_ID)._info
+    elapsed = time.perf_counter() - start
+    return len(statements), elapsed / ITERATIONS * 1_000_000
+
+
+if __name__ == "__main__":
+    use_temporary_database()
+    register_users(1, first_id=USER_ID)
+    # A year of history plus a handful of tasks for today.
+    conn = db_utils.get_connection()
+    conn.executemany(
+        "INSERT INTO tasks (user_id, content, priority, is_done, created_at, local_day) VALUES (?, ?, ?, ?, ?, ?)",
+        [(USER_ID, f"Task {index}", index % 3 + 1, index % 2, f"{day} 10:00:00", day)
+         for index in range(HISTORY_ROWS)
+         for day in [f"2025-{index % 12 + 1:02d}-{index % 28 + 1:02d}"]]
+    )
+    conn.commit()
+    user = User(USER_ID)
+    for index in range(10):
+        user.task.add_user_task(f"Today {index}", index % 3 + 1)
+    user.reminder.log_reminder("DONE", "2025-01-01 09:00:00")
+
+    with mock.patch.object(User, "user_info", legacy_user_info):
+        assert legacy_user_info(user) == user.user_info(), "Loaders disagree"
+        before = measure_construction()
+    after = measure_construction()
+
+    print(f"\nUser(...)._info profile load with {HISTORY_ROWS} task rows ({ITERATIONS} runs)")
+    print(f"{'':<12}{'statements':>12}{'latency (µs)':>16}")
+    print(f"{'before':<12}{before[0]:>12}{before[1]:>16,.1f}")
+    print(f"{'after':<12}{after[0]:>12}{after[1]:>16,.1f}")
+    db_utils.close_all_connections()
@@ -0,0 +1,50 @@
+# /benchmarks/common.py
+
+# GENERAL PYTHON imports ->
+from pathlib import Path
+import tempfile
+import time
+# LOCAL imports ->
+import helpers.db_utils as db_utils
+
+
+def use_temporary_database() -> Path:
+    """Points helpers.db_utils at a fresh database file in a temp directory \
+    and creates the schema there, so benchmarks never touch data/database.db.
+
+    Returns:
+        Path: Path of the temporary database file.
+    """
+    data_dir = Path(tempfile.mkdtemp(prefix="todoprompt_bench_"))
+    db_utils.close_all_connections()
+    db_utils.DATA_DIR = data_dir
+    db_utils.DATABASE_FILE = data_dir / "database.db"
+    db_utils.db_initiator()
+    return db_utils.DATABASE_FILE
+
+
+def register_users(count: int, timezone: str = "Europe/Berlin", first_id: int = 1000):
+    """Inserts *count* users with the given timezone directly."""
+    conn = db_utils.get_connection()
+    conn.executemany(
+        "INSERT INTO users VALUES (?, 'UTC+01:00', ?, 0, 0)",
+        [(first_id + i, timezone) for i in range(count)]
+    )
+    conn.commit()
+
+
+def ops_per_second(func, iterations: int) -> float:
+    """Calls *func* *iterations* times and returns the achieved rate."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed
+
+
+def report(title: str, rows: list[tuple[str, float, float]]):
+    """Prints a before/after table of (label, before, after) rates."""
+    print(f"\n{title}")
+    print(f"{'operation':<32}{'before':>14}{'after':>14}{'speedup':>10}")
+    for label, before, after in rows:
+        print(f"{label:<32}{before:>14,.0f}{after:>14,.0f}{after / before:>9.1f}x")
@@ -1,30 +1,44 @@
 # /bot.py
 
 # GENERAL PYTHON imports ->
+import asyncio
 import logging
-from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 # TELEGRAM BOT related imports ->
 from telegram.ext import (ApplicationBuilder, PicklePersistence, JobQueue)
 # LOCAL IMPORTS ->
     # Bot TOKEN import ->
 from config import TOKEN
+    # Reminder delivery mode ->
+from config import JOBSTORE_BACKEND, REMINDER_MODE
     # Paths import ->
-from config import DATABASE_FILE, PERSISTENCE_FILE
+from config import PERSISTENCE_FILE
     # Main parts' handlers ->
 from handlers.main.main_menu_handler import get_main_menu_handler
 from handlers.main.start_conversation_handler import get_setup_conversation_handler
     # Tasks' handlers ->
+from handlers.tasks.find_task_handler import get_find_task_handler
 from handlers.tasks.prompt_add_task_handler import get_prompt_add_task_handler
 from handlers.tasks.prompt_check_task_handler import get_prompt_check_task_handler
 from handlers.tasks.prompt_remove_task_handler import get_prompt_remove_task_handler
-from handlers.tasks.task_menu_handler import get_task_menu_handler
+from handlers.tasks.task_menu_handler import get_task_menu_handler, get_task_page_handler
     # Reminders' handlers ->
 from handlers.reminders.reminders_menu_handler import get_reminders_menu_handler
 from handlers.reminders.prompt_d_reminder_handler import get_prompt_d_reminder_handler
 from handlers.reminders.prompt_l_reminder_handler import get_prompt_l_reminder_handler
     # Settings handler ->
 from handlers.settings.settings_handler import get_settings_handler
+    # Stats handler ->
+from handlers.stats.stats_handler import get_stats_handler
 import helpers.db_utils as helpers
+from helpers.outbound_queue import outbound_queue
+from helpers.scheduler.jobstore import build_jobstore
+from helpers.scheduler.reconciliation import reconcile_reminders
+from helpers.scheduler.reminder_dispatcher import dispatch_reminders_forever
+from helpers.scheduler.reminder_sender import reminder_sender
+from helpers.task_archive import archive_in_background
+from helpers.update_scope import UpdateScopedApplication
+from helpers.user_data_util_classes.task_list_cache import task_list_cache
+from helpers.user_data_util_classes.user_registry import registered_users
 
 # Enable logging
 logging.basicConfig(
@@ -32,10 +46,58 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Long-running loops on_startup starts. PTB neither awaits nor cancels tasks created
+# before the application runs, so on_shutdown stops these itself, before the
+# executors and connections they use are gone.
+background_tasks: set[asyncio.Task] = set()
+
+
+def start_background_task(coroutine) -> asyncio.Task:
+    task = asyncio.get_running_loop().create_task(coroutine)
+    background_tasks.add(task)
+    return task
+
+
+async def stop_background_tasks():
+    """Cancels the background loops and waits until they have stopped."""
+    for task in background_tasks:
+        task.cancel()
+    results = await asyncio.gather(*background_tasks, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"{result}-> A background task had failed before shutdown.")
+    background_tasks.clear()
+
+
+async def on_startup(application):
+    """Starts background work that needs the running event loop."""
+    await reminder_sender.start() # Warm, pooled Bot for reminders
+    # Reminders' rows, flags and jobs brought back in line before anything fires
+    report = await helpers.run_db_call(
+        lambda: reconcile_reminders(helpers.get_connection(), application.job_queue.scheduler, reminder_jobstore),
+        write=True
+    )
+    logger.info(f"Reminder reconciliation: {report._asdict()}")
+    start_background_task(helpers.backfill_in_background()) # Online schema backfills
+    start_background_task(archive_in_background()) # Moving old tasks to tasks_archive
+    if REMINDER_MODE == "dispatcher":
+        start_background_task(dispatch_reminders_forever()) # Minute reminder ticks
+    logger.info(f"Reminders are delivered in {REMINDER_MODE!r} mode (jobstore: {JOBSTORE_BACKEND!r}).")
+
+
+async def on_shutdown(application):
+    """Releases process-wide resources once polling has stopped."""
+    await stop_background_tasks() # First, they still use the executors and connections
+    await reminder_sender.stop() # Closing the reminders' HTTP connections (logs its pool metrics)
+    helpers.shutdown_executors() # Letting queued database work finish
+    helpers.close_all_connections() # Closing pooled SQLite connections
+    logger.info(f"Task list cache: {task_list_cache.stats()}")
+
 
 if __name__ == "__main__":
     # Initiate the DB
     helpers.db_initiator() # Initiating database schema if it doesn't exist.
+    registered_users.load() # In-memory index behind User.is_a_user()
     persistence = PicklePersistence(filepath=PERSISTENCE_FILE) # Clean object presistence store
 
     # NOTE:
@@ -43,14 +105,26 @@ if __name__ == "__main__":
     # flow of things especially the main_menu and setup_convo assignment.
     # This change was suggested by Gemini.
     ptb_job_queue = JobQueue()
-    app_builder = ApplicationBuilder().token(TOKEN).persistence(persistence).job_queue(ptb_job_queue)
+    app_builder = (
+        ApplicationBuilder()
+        .application_class(UpdateScopedApplication) # Per-update DB hit counting
+        .token(TOKEN)
+        .persistence(persistence)
+        .rate_limiter(outbound_queue) # Flood limits and priority lanes for every message sent
+        .job_queue(ptb_job_queue)
+        .post_init(on_startup)
+        .post_shutdown(on_shutdown)
+    )
 
     # --- Handler Assignments ---
     setup_convo = get_setup_conversation_handler()
     main_menu = get_main_menu_handler()
     task_menu = get_task_menu_handler()
+    task_pages = get_task_page_handler()
+    find_tasks = get_find_task_handler()
     reminders_menu = get_reminders_menu_handler()
     settings_menu = get_settings_handler()
+    stats_menu = get_stats_handler()
     prompt_add_task = get_prompt_add_task_handler()
     prompt_remove_task = get_prompt_remove_task_handler()
     prompt_task_check = get_prompt_check_task_handler()
@@ -60,14 +134,9 @@ if __name__ == "__main__":
     # --- App Build and Jobstore Setup ---
     application = app_builder.build()
 
-    # Workaround for Jobstore Connection to Database
-    job_stores_config = {
-        'default': {
-            'type': 'sqlalchemy',
-            'url': f'sqlite:///{DATABASE_FILE.resolve()}'
-        }
-    }
-    application.job_queue.scheduler.add_jobstore(SQLAlchemyJobStore(url=f"sqlite:///{DATABASE_FILE.resolve()}"))
+    # Reminder jobs live apart from the tasks' database (see helpers/scheduler/jobstore.py)
+    reminder_jobstore = build_jobstore() # Also handed to the reconciliation in on_startup
+    application.job_queue.scheduler.add_jobstore(reminder_jobstore)
 
     # --- Putting Assigned Handlers to Use ---
     application.add_handlers(
@@ -75,8 +144,11 @@ if __name__ == "__main__":
             setup_convo, 
             main_menu, 
             task_menu, 
+            task_pages,
+            find_tasks,
             reminders_menu,
             settings_menu,
+            stats_menu,
             prompt_add_task,
             prompt_remove_task,
             prompt_task_check,
@@ -13,6 +13,7 @@ from pathlib import Path
 DATA_DIR = Path('data')
 PERSISTENCE_FILE = DATA_DIR / "bot_data.pickle"
 DATABASE_FILE = DATA_DIR / "database.db"
+JOBSTORE_FILE = DATA_DIR / "jobs.db" # APScheduler's jobs with JOBSTORE_BACKEND = "sqlite"
 
 # Global Formatting Strings used for datetime.strftime ->
 FORMAT_STRING_C = "%Y-%m-%d %H:%M:%S"
@@ -29,10 +30,61 @@ VIEW_TASKS_STATE = 200
 PROMPT_ADD_TASK_STATE = 201
 PROMPT_REMOVE_TASK_STATE = 202
 PROMPT_CHECK_TASK_STATE = 203
+FIND_TASKS_STATE = 204
 
 VIEW_REMINDERS_STATE = 300
 PROMPT_D_REMINDER_STATE = 301
 PROMPT_L_REMINDER_STATE = 302
 
 VIEW_SETTINGS = 400
-RESET_TIMEZONE = 401
\ No newline at end of file
+RESET_TIMEZONE = 401
+
+VIEW_STATS_STATE = 500
+
+# SQLite connection pool tuning (see helpers/db_utils.py) ->
+DB_BUSY_TIMEOUT_MS = 5000
+DB_SYNCHRONOUS = "NORMAL"         # Safe with WAL, far fewer fsyncs than FULL
+DB_CACHE_SIZE_KIB = 16384         # Page cache per connection (negative PRAGMA value = KiB)
+DB_MMAP_SIZE_BYTES = 128 * 1024 * 1024
+DB_HEALTH_CHECK_INTERVAL = 60     # Seconds between liveness probes of a pooled connection
+DB_BACKFILL_BATCH_SIZE = 500       # Rows per committed batch of an online schema backfill
+DB_BACKFILL_PAUSE = 0.05          # Seconds between backfill batches, leaving the writer lock to the bot
+DB_READER_THREADS = 4             # Size of the async layer's reader pool (writes use one dedicated thread)
+
+# Timezone caches (see helpers/user_data_util_classes/time_module.py) ->
+TZINFO_CACHE_SIZE = 1024 # Built pytz zones; the tz database has fewer than 600
+USER_TIMEZONE_CACHE_SIZE = 100000 # Users whose IANA timezone name is kept in memory (LRU)
+
+# Task list rendering ->
+TASKS_PAGE_SIZE = 15 # Rows per page of the tasks menu (keeps messages far below 4096 characters)
+TASK_LIST_CACHE_SIZE = 10000 # Users whose task list pages are kept in memory (LRU)
+FIND_PAGE_SIZE = 10 # Matches per page of /find results
+
+# Task archival (see helpers/task_archive.py) ->
+TASK_RETENTION_DAYS = 30 # Tasks older than this move from *tasks* to *tasks_archive*
+ARCHIVE_BATCH_SIZE = 500
+ARCHIVE_INTERVAL = 60 * 60 # Seconds between archival runs
+
+# Reminder delivery ->
+# "jobs": one APScheduler job per reminder (see helpers/scheduler/scheduler.py);
+# "dispatcher": one tick per minute over reminders.next_fire_utc (see helpers/scheduler/reminder_dispatcher.py)
+REMINDER_MODE = getenv("REMINDER_MODE", "jobs")
+REMINDER_DISPATCH_BATCH_SIZE = 1000 # Due reminders claimed per write transaction
+REMINDER_DISPATCH_CONCURRENCY = 50 # Reminder sends in flight at once
+REMINDER_MISFIRE_GRACE = 5 * 60 # Seconds late a reminder may still be sent (e.g. after a restart)
+REMINDER_CONNECTION_POOL_SIZE = 64 # Keep-alive connections of the Bot reminders are sent through
+REMINDER_POOL_TIMEOUT = 10.0 # Seconds a send may wait for a free connection
+# Where "jobs" mode keeps its jobs (see helpers/scheduler/jobstore.py): "sqlite" (JOBSTORE_FILE),
+# "memory" (rebuilt from the reminders table at startup) or "shared" (inside DATABASE_FILE, as before)
+JOBSTORE_BACKEND = getenv("JOBSTORE_BACKEND", "sqlite")
+
+# Outbound messages (see helpers/outbound_queue.py), Telegram's flood limits ->
+OUTBOUND_MESSAGES_PER_SECOND = 30 # Across all chats
+OUTBOUND_CHAT_MESSAGES_PER_SECOND = 1 # Per private chat...
+OUTBOUND_GROUP_MESSAGES_PER_MINUTE = 20 # ...and per group or channel
+OUTBOUND_CHAT_BURST = 3 # Messages a chat may get back to back before its limit applies
+OUTBOUND_MAX_RETRIES = 3 # Retries of a request answered with RetryAfter
+OUTBOUND_RETRY_BACKOFF = 0.5 # Seconds added to RetryAfter's wait, doubled on every retry
+
+# Stats screen (see helpers/user_data_util_classes/stats_module.py) ->
+STATS_WINDOWS = (7, 30, 365) # Trend windows in days; the longest bounds the daily_stats rows read
@@ -2,17 +2,20 @@
 
 # GENERAL PYTHON imports ->
 import logging
+import sys
 # TELEGRAM BOT IMPORTS
 from telegram import Update, InlineKeyboardMarkup
 from telegram.constants import ParseMode
 from telegram.error import BadRequest, Forbidden
 from telegram.ext import ContextTypes, ConversationHandler
 # LOCAL imports ->
+from config import TASKS_PAGE_SIZE
 from handlers.common.inline_keyboard_handlers import (
     main_menu_keyboard, 
     tasks_keyboard, 
     reminder_menu_keyboard
 )
+from helpers.user_data_util_classes.task_module import TaskRow, format_task_rows
 from helpers.user_data_util_classes.user_module import User
 
 logger = logging.getLogger(__name__)
@@ -76,6 +79,122 @@ async def edit_previous_menu(update: Update, context: ContextTypes.DEFAULT_TYPE,
             logger.info(f"Message {to_be_edited_id} was successfully edited in user{user_id}'s chat.")
 # THE HARDESTS PILLS HAVE BEEN SWALLOWED.
 
+
+# >>> Task Row Cache >>>
+# NOTE:
+## Task lists are shown a page (TASKS_PAGE_SIZE rows) at a time, numbered from 1 on
+## the first page and continuing on the next ones. The rows of the pages loaded so
+## far are kept in user_data, so when the user answers with row numbers the tasks
+## are found (and then written to) by id, without fetching the list again or parsing
+## anything out of the rendered text; going back a page needs no query either.
+async def load_task_list(context: ContextTypes.DEFAULT_TYPE, user_at_hand: User) -> list[str] | None:
+    """Fetches the first page of the user's tasks for today and remembers it.
+
+    Returns:
+        list[str] | None: The rendered lines of the page, None if there are no tasks.
+    """
+    rows = await user_at_hand.task.get_user_tasks_page_async(limit=TASKS_PAGE_SIZE + 1) or []
+    return remember_task_rows(context, rows[:TASKS_PAGE_SIZE], has_more=len(rows) > TASKS_PAGE_SIZE)
+
+
+def remember_task_rows(context: ContextTypes.DEFAULT_TYPE, rows: list[TaskRow] | None, has_more: bool = False, page: int = 0) -> list[str] | None:
+    """Caches the rows loaded so far (row 1 onwards) and which page is shown.
+
+    Args:
+        rows (list[TaskRow] | None): Every loaded row, first page first.
+        has_more (bool, optional): Whether rows after the loaded ones exist. \
+        Defaults to False.
+        page (int, optional): The page about to be shown; clamped to the \
+        last loaded one. Defaults to 0.
+
+    Returns:
+        list[str] | None: The rendered lines of that page, None if it's empty.
+    """
+    rows = list(rows) if rows else []
+    last_page = max((len(rows) - 1) // TASKS_PAGE_SIZE, 0)
+    context.user_data['task_rows'] = rows
+    context.user_data['task_rows_have_more'] = has_more
+    context.user_data['task_page'] = min(page, last_page)
+    return task_page_lines(context)
+
+
+def remembered_task_rows(context: ContextTypes.DEFAULT_TYPE) -> list[TaskRow] | None:
+    """Returns the rows loaded so far, or None if no list was shown yet."""
+    return context.user_data.get('task_rows', None)
+
+
+def task_page_lines(context: ContextTypes.DEFAULT_TYPE) -> list[str] | None:
+    """Renders the remembered current page with its absolute row numbers."""
+    first_index = context.user_data.get('task_page', 0) * TASKS_PAGE_SIZE
+    page_rows = (remembered_task_rows(context) or [])[first_index:first_index + TASKS_PAGE_SIZE]
+    return format_task_rows(page_rows, first_row_number=first_index + 1) if page_rows else None
+
+
+async def load_task_rows_up_to(context: ContextTypes.DEFAULT_TYPE, user_at_hand: User, row_count: int) -> list[TaskRow]:
+    """Makes sure rows 1..row_count are loaded, as far as the list has them.
+
+    Row numbers outside the pages shown in the menu are still valid (e.g. \
+    the reminders number the whole list), so the rows that are missing are \
+    fetched after the last loaded one in one query and remembered with the \
+    rest; the page shown stays the same.
+
+    Args:
+        row_count (int): The largest row number that is about to be used.
+
+    Returns:
+        list[TaskRow]: Every loaded row. Fewer than row_count only if the \
+        list is that short, so its length can be reported as the row count.
+    """
+    rows = remembered_task_rows(context)
+    if rows is None:
+        await load_task_list(context, user_at_hand)
+        rows = remembered_task_rows(context)
+
+    missing = row_count - len(rows)
+    if missing > 0 and rows and context.user_data.get('task_rows_have_more', False):
+        missing = min(missing, sys.maxsize - 1) # SQLite can't bind a larger LIMIT
+        next_rows = await user_at_hand.task.get_user_tasks_page_async(limit=missing + 1, after=rows[-1]) or []
+        rows = rows + next_rows[:missing]
+        remember_task_rows(context, rows, has_more=len(next_rows) > missing, page=context.user_data.get('task_page', 0))
+    return rows
+
+
+def task_list_keyboard(context: ContextTypes.DEFAULT_TYPE) -> InlineKeyboardMarkup:
+    """:tasks_keyboard with previous/next buttons where there are such pages."""
+    page = context.user_data.get('task_page', 0)
+    loaded = len(remembered_task_rows(context) or [])
+    has_next_page = loaded > (page + 1) * TASKS_PAGE_SIZE or context.user_data.get('task_rows_have_more', False)
+    return tasks_keyboard(has_previous_page=page > 0, has_next_page=has_next_page)
+
+
+async def turn_task_page(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handles the previous/next buttons beneath a task list."""
+    query = update.callback_query
+    await query.answer()
+
+    user_at_hand = User.for_context(context, update.effective_chat.id)
+    if remembered_task_rows(context) is None:
+        await load_task_list(context, user_at_hand)
+
+    rows = remembered_task_rows(context)
+    has_more = context.user_data.get('task_rows_have_more', False)
+    page = context.user_data.get('task_page', 0)
+    page = page + 1 if query.data == 'tasks_page_next' else max(page - 1, 0)
+
+    if len(rows) <= page * TASKS_PAGE_SIZE and has_more: # Next page isn't loaded yet
+        next_rows = await user_at_hand.task.get_user_tasks_page_async(limit=TASKS_PAGE_SIZE + 1, after=rows[-1]) or []
+        rows = rows + next_rows[:TASKS_PAGE_SIZE]
+        has_more = len(next_rows) > TASKS_PAGE_SIZE
+
+    page_lines = remember_task_rows(context, rows, has_more=has_more, page=page)
+    context.user_data['main_menu_message_id'] = query.message.message_id
+
+    user_tasks_string = "\n".join(page_lines) if page_lines else "--NO TASKS ADDED YET--"
+    await edit_previous_menu(update, context, f"Tasks:\n{user_tasks_string}", task_list_keyboard(context))
+
+    del user_at_hand
+# <<< Task Row Cache <<<
+
 async def close_all_convos(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     This handler, closes all open menus and windows, and ends the main menu
@@ -123,7 +242,7 @@ async def return_to_tasks(update: Update, context: ContextTypes.DEFAULT_TYPE):
     prior_main_menu = context.user_data['main_menu_message_id']
 
     user_id = update.effective_chat.id
-    user_at_hand = User(user_id)
+    user_at_hand = User.for_context(context, user_id)
 
     if prior_main_menu != message_to_edit_id:
         await delete_previous_menu(update, context)
@@ -133,8 +252,8 @@ async def return_to_tasks(update: Update, context: ContextTypes.DEFAULT_TYPE):
     no_task_text = "No tasks are added yet. Try adding one by touching the button \"➕ Add\"" \
     "or through the command /add_task task:priority(1, 2 or 3). \nExample: /add_task Go shopping:2"
 
-    user_tasks = user_at_hand.task.get_user_tasks()
-    tasks_markup = tasks_keyboard()
+    user_tasks = await load_task_list(context, user_at_hand)
+    tasks_markup = task_list_keyboard(context)
 
     if not user_tasks:
         user_tasks_string = "\n".join("--NO TASKS ADDED YET--")
@@ -154,9 +273,9 @@ async def return_to_reminders_menu(update: Update, context: ContextTypes.DEFAULT
     prior_main_menu = context.user_data['main_menu_message_id']
 
     user_id = update.effective_chat.id
-    user_at_hand = User(user_id)
+    user_at_hand = User.for_context(context, user_id)
     reminders = user_at_hand.reminder
-    info = user_at_hand._info
+    info = await user_at_hand.user_info_async()
 
     if prior_main_menu != message_to_edit_id:
         await delete_previous_menu(update, context)
@@ -168,8 +287,8 @@ async def return_to_reminders_menu(update: Update, context: ContextTypes.DEFAULT
     " (or /settings) to remove the once you've set some.  O.O\n"
     some_instances_text = "You've set the following reminders:\n"
 
-    reminder_done_state = reminders.check_reminder_state('DONE', 1)
-    reminder_left_state = reminders.check_reminder_state('LEFT', 1)
+    reminder_done_state = await reminders.check_reminder_state_async('DONE', 1)
+    reminder_left_state = await reminders.check_reminder_state_async('LEFT', 1)
 
     flag = 0
     if (reminder_done_state != 0) and (reminder_left_state != 0):
@@ -7,7 +7,7 @@ from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 # >>> Inline Keyboard >>>
 def main_menu_keyboard() -> InlineKeyboardMarkup:
     keyboard = [
-        [InlineKeyboardButton("👤 View Your Profile.", callback_data="menu_view_profile")],
+        [InlineKeyboardButton("👤 View Your Profile.", callback_data="menu_view_profile"), InlineKeyboardButton("📊 Stats", callback_data="menu_view_stats")],
         [InlineKeyboardButton("📝 View Tasks", callback_data="menu_view_tasks"), InlineKeyboardButton("🔔 Set Reminders", callback_data="menu_view_reminders")],
         [InlineKeyboardButton("⚙️ Settings", callback_data="menu_settings"), InlineKeyboardButton("❌ Close Menue", callback_data="menu_close")]
     ]
@@ -23,13 +23,45 @@ def profile_menu_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
-def tasks_keyboard() -> InlineKeyboardMarkup:
+def stats_menu_keyboard() -> InlineKeyboardMarkup:
+    keyboard = [
+        [InlineKeyboardButton("🔙 Return to Menu", callback_data="stats_return")]
+    ]
+
+    return InlineKeyboardMarkup(keyboard)
+
+
+def tasks_keyboard(has_previous_page: bool = False, has_next_page: bool = False) -> InlineKeyboardMarkup:
     keyboard = [
         [InlineKeyboardButton("➕ Add", callback_data="tasks_add"), InlineKeyboardButton("➖ Remove", callback_data="tasks_remove")],
         [InlineKeyboardButton("✅ Mark Done", callback_data="tasks_check")],
         [InlineKeyboardButton("🔙 Return to Menu", callback_data="tasks_return")]
     ]
 
+    page_buttons = []
+    if has_previous_page:
+        page_buttons.append(InlineKeyboardButton("◀️ Previous", callback_data="tasks_page_prev"))
+    if has_next_page:
+        page_buttons.append(InlineKeyboardButton("Next ▶️", callback_data="tasks_page_next"))
+    if page_buttons:
+        keyboard.insert(0, page_buttons)
+
+    return InlineKeyboardMarkup(keyboard)
+
+
+def find_results_keyboard(has_previous_page: bool = False, has_next_page: bool = False) -> InlineKeyboardMarkup:
+    keyboard = [
+        [InlineKeyboardButton("🔙 Return to Menu", callback_data="find_return")]
+    ]
+
+    page_buttons = []
+    if has_previous_page:
+        page_buttons.append(InlineKeyboardButton("◀️ Previous", callback_data="find_page_prev"))
+    if has_next_page:
+        page_buttons.append(InlineKeyboardButton("Next ▶️", callback_data="find_page_next"))
+    if page_buttons:
+        keyboard.insert(0, page_buttons)
+
     return InlineKeyboardMarkup(keyboard)
 
 
@@ -33,7 +33,7 @@ async def main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     This handler, handles the main menu's appearance and behavior. 
     """
     user_id = update.effective_chat.id
-    user_at_hand = User(user_id)
+    user_at_hand = await User.create(user_id, context)
 
     await delete_previous_menu(update, context)
 
@@ -77,8 +77,8 @@ async def view_profile(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data['main_menu_message_id'] = query.message.message_id
 
     user_id = update.effective_chat.id
-    user_at_hand = User(user_id)
-    user_profile = user_at_hand.get_user_profile()
+    user_at_hand = User.for_context(context, user_id)
+    user_profile = await user_at_hand.get_user_profile_async()
     profile_menu_markup = profile_menu_keyboard()
 
     await edit_previous_menu(update, context, user_profile, profile_menu_markup)
@@ -22,7 +22,7 @@ logger = logging.getLogger(__name__)
 # >>> User timezone setup >>>
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_chat.id
-    user_at_hand = User(user_id)
+    user_at_hand = await User.create(user_id, context)
 
     if not user_at_hand._is_a_user:
         await context.bot.send_message(chat_id=user_id,
@@ -36,7 +36,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def get_timezone(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_chat.id
-    user_at_hand = User(user_id)
+    user_at_hand = User.for_context(context, user_id)
     user_input = update.message.text
 
     if not user_at_hand.time.is_timezone_valid(user_input):
@@ -44,7 +44,7 @@ async def get_timezone(update: Update, context: ContextTypes.DEFAULT_TYPE):
                                        text="Doens't look like a valid IANA timezone. You could search for country's IANA and retry.")
         return GET_TIMEZONE_STATE
 
-    user_at_hand.create_user_profile(user_input)
+    await user_at_hand.create_user_profile_async(user_input)
     logger.info(f"User {user_id} registered with timezone {user_input}")
 
     await context.bot.send_message(chat_id=user_id, text=f"Your timezone has been set to {user_input}. Tap /menu to use my functionalities.")
@@ -27,7 +27,7 @@ logger = logging.getLogger(__name__)
 
 async def view_reminder_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_chat.id
-    user_at_hand = User(user_id)
+    user_at_hand = await User.create(user_id, context)
 
     await delete_previous_menu(update, context)
 
@@ -38,7 +38,7 @@ async def view_reminder_menu(update: Update, context: ContextTypes.DEFAULT_TYPE)
         raise ApplicationHandlerStop(ConversationHandler.END)
     else:
 
-        info = user_at_hand._info
+        info = await user_at_hand.user_info_async()
         # Setup for editing the reminders menu
         no_instance_text = "No reminders set just yet! You can navigate this menue " \
         "(also accessible through /reminders command) to set new ones or go to settings" \
@@ -46,8 +46,8 @@ async def view_reminder_menu(update: Update, context: ContextTypes.DEFAULT_TYPE)
         some_instances_text = "You've set the following reminders:\n"
 
         reminders = user_at_hand.reminder
-        reminder_done_state = reminders.check_reminder_state('DONE', 1)
-        reminder_left_state = reminders.check_reminder_state('LEFT', 1)
+        reminder_done_state = await reminders.check_reminder_state_async('DONE', 1)
+        reminder_left_state = await reminders.check_reminder_state_async('LEFT', 1)
 
         flag = 0
         if (reminder_done_state != 0) and (reminder_left_state != 0):
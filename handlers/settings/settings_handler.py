@@ -23,7 +23,7 @@ from handlers.common.common_handlers import (
     close_all_convos
 )
 from handlers.common.inline_keyboard_handlers import settings_keyboard, sub_settings_keyboard
-from helpers.scheduler.scheduler import unset_user_reminder
+from helpers.scheduler.scheduler import reschedule_user_reminders, unset_user_reminder
 from helpers.user_data_util_classes.user_module import User
 
 logger = logging.getLogger(__name__)
@@ -32,7 +32,7 @@ logger = logging.getLogger(__name__)
 async def view_settings_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     user_id = update.effective_chat.id
-    user_at_hand = User(user_id)
+    user_at_hand = await User.create(user_id, context)
 
 
     if not user_at_hand._is_a_user:
@@ -62,7 +62,7 @@ async def view_settings_menu(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 async def reset_timezone(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_chat.id
-    user_at_hand = User(user_id)
+    user_at_hand = User.for_context(context, user_id)
     user_input = update.message.text
 
     if not user_at_hand.time.is_timezone_valid(user_input):
@@ -71,10 +71,14 @@ async def reset_timezone(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await edit_previous_menu(update, context, text, sub_settings_markup)
         return RESET_TIMEZONE
 
-    user_at_hand.create_user_profile(user_input)
+    await user_at_hand.create_user_profile_async(user_input)
     logger.info(f"User {user_id} reset timezone into {user_input}")
+    # Reminders keep their local time in the new timezone
+    rescheduled = await reschedule_user_reminders(update, context)
 
     success_text = f"Your timezone has been set to {user_input}. Tap /menu or use the return button to use my functionalities."
+    if rescheduled:
+        success_text += f"\nYour {rescheduled} reminder(s) will now follow it too."
     settings_markup = settings_keyboard()
     await edit_previous_menu(update, context, success_text, settings_markup)
     return VIEW_SETTINGS
@@ -126,15 +130,15 @@ async def delete_l_reminder(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def remove_account(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_chat.id
-    user_at_hand = User(user_id)
+    user_at_hand = User.for_context(context, user_id)
 
-    # Database info removal:
-    user_at_hand.delete_user_profile()
-
-    # JobSchedule and Reminders removal
+    # JobSchedule and Reminders removal, while the user's reminder flags still exist
     await unset_user_reminder(update, context, "DONE")
     await unset_user_reminder(update, context, "LEFT")
 
+    # Database info removal:
+    await user_at_hand.delete_user_profile_async()
+
     # Final Interaction:
     text = "You are now stir clear of me. *_Goodbye friend!_*🥲\nIt would be a good idea to clear our history and then /start the chat again, just in case."
     await delete_previous_menu(update, context)
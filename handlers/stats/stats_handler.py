@@ -0,0 +1,79 @@
+# /handlers/stats/stats_handler.py
+
+# GENERAL PYTHON imports ->
+import logging
+# TELEGRAM BOT imports ->
+from telegram import Update
+from telegram.ext import (
+    ApplicationHandlerStop,
+    CallbackQueryHandler,
+    CommandHandler,
+    ContextTypes,
+    ConversationHandler,
+)
+# LOCAL imports ->
+from config import VIEW_MENU, VIEW_STATS_STATE
+from handlers.common.inline_keyboard_handlers import stats_menu_keyboard
+from handlers.common.common_handlers import (
+    delete_previous_menu,
+    send_new_menu,
+    edit_previous_menu,
+    return_to_menu,
+    close_all_convos
+)
+from helpers.user_data_util_classes.user_module import User
+
+logger = logging.getLogger(__name__)
+
+
+async def view_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    This handler shows the user's 7/30/365-day trends, read from the
+    daily_stats rollup. Reachable from the main menu and through /stats.
+    """
+    user_id = update.effective_chat.id
+    user_at_hand = await User.create(user_id, context)
+
+    if not user_at_hand._is_a_user:
+        text = "You have not registered your timezone! You can do so tapping the /start command."
+
+        await delete_previous_menu(update, context)
+        await send_new_menu(update, context, text, None)
+        raise ApplicationHandlerStop(ConversationHandler.END)
+    else:
+        text = await user_at_hand.stats.get_user_stats_async()
+        stats_markup = stats_menu_keyboard()
+
+        if update.callback_query:
+            query = update.callback_query
+            await query.answer()
+            context.user_data['main_menu_message_id'] = query.message.message_id
+
+            await edit_previous_menu(update, context, text, stats_markup)
+        else:
+            await delete_previous_menu(update, context)
+            await send_new_menu(update, context, text, stats_markup)
+
+        del user_at_hand
+        return VIEW_STATS_STATE
+
+
+def get_stats_handler():
+    return ConversationHandler(
+        entry_points = [
+            CommandHandler('stats', view_stats),
+            CallbackQueryHandler(pattern="^menu_view_stats$", callback=view_stats),
+        ],
+        states = {
+            VIEW_STATS_STATE : [
+                CallbackQueryHandler(pattern="^stats_return$", callback=return_to_menu)
+            ]
+        },
+        map_to_parent = {
+            ConversationHandler.END : VIEW_MENU
+        },
+        fallbacks = [
+            CommandHandler('cancel', close_all_convos)
+        ],
+        allow_reentry = True
+    )
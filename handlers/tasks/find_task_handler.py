@@ -0,0 +1,123 @@
+# /handlers/tasks/find_task_handler.py
+
+# GENERAL PYTHON imports ->
+import logging
+# TELEGRAM BOT imports ->
+from telegram import Update
+from telegram.ext import (
+    ApplicationHandlerStop,
+    CallbackQueryHandler,
+    CommandHandler,
+    ContextTypes,
+    ConversationHandler,
+)
+# LOCAL imports ->
+from config import FIND_PAGE_SIZE, FIND_TASKS_STATE
+from handlers.common.common_handlers import (
+    close_all_convos,
+    return_to_menu,
+    delete_previous_menu,
+    send_new_menu,
+    edit_previous_menu
+)
+from handlers.common.inline_keyboard_handlers import find_results_keyboard
+from helpers.user_data_util_classes.task_module import format_task_matches
+from helpers.user_data_util_classes.user_module import User
+
+logger = logging.getLogger(__name__)
+
+
+async def find_results_page(context: ContextTypes.DEFAULT_TYPE, user_at_hand: User) -> tuple[str, bool]:
+    """Fetches and renders the remembered page of the remembered search.
+
+    Returns:
+        tuple[str, bool]: The message text, and whether a next page exists.
+    """
+    terms = context.user_data.get('find_terms', "")
+    page = context.user_data.get('find_page', 0)
+
+    # One more than a page, to learn whether another page follows
+    matches = await user_at_hand.task.search_user_tasks_async(terms, FIND_PAGE_SIZE + 1, page * FIND_PAGE_SIZE) or []
+    page_lines = format_task_matches(matches[:FIND_PAGE_SIZE], first_row_number=page * FIND_PAGE_SIZE + 1)
+
+    if page_lines:
+        text = f"🔎 Tasks matching \"{terms}\" (page {page + 1}):\n" + "\n".join(page_lines)
+    elif page == 0:
+        text = f"🔎 No tasks match \"{terms}\"."
+    else:
+        text = f"🔎 No more tasks match \"{terms}\"."
+    return text, len(matches) > FIND_PAGE_SIZE
+
+
+async def find_tasks(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    This handler searches all of the user's tasks (archived ones included)
+    for the words sent after /find and shows the best matches a page at a time.
+    """
+    user_id = update.effective_chat.id
+    user_input = update.message.text
+
+    user_at_hand = await User.create(user_id, context)
+
+    await delete_previous_menu(update, context)
+
+    if not user_at_hand._is_a_user:
+        text = "You have not registered your timezone! You can do so tapping the /start command."
+
+        await send_new_menu(update, context, text, None)
+        raise ApplicationHandlerStop(ConversationHandler.END)
+
+    # Everything after "/find"
+    command_and_terms = user_input.split(maxsplit=1)
+    if len(command_and_terms) < 2:
+        text = "Send the words to look for after the command.\nExample: /find groceries"
+        await send_new_menu(update, context, text, None)
+
+        del user_at_hand
+        return ConversationHandler.END
+
+    context.user_data['find_terms'] = command_and_terms[1].strip()
+    context.user_data['find_page'] = 0
+
+    text, has_next_page = await find_results_page(context, user_at_hand)
+    await send_new_menu(update, context, text, find_results_keyboard(has_next_page=has_next_page))
+
+    del user_at_hand
+    return FIND_TASKS_STATE
+
+
+async def turn_find_page(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handles the previous/next buttons beneath search results."""
+    query = update.callback_query
+    await query.answer()
+    context.user_data['main_menu_message_id'] = query.message.message_id
+
+    page = context.user_data.get('find_page', 0)
+    context.user_data['find_page'] = page + 1 if query.data == 'find_page_next' else max(page - 1, 0)
+
+    user_at_hand = User.for_context(context, update.effective_chat.id)
+    text, has_next_page = await find_results_page(context, user_at_hand)
+    has_previous_page = context.user_data['find_page'] > 0
+
+    await edit_previous_menu(update, context, text, find_results_keyboard(has_previous_page, has_next_page))
+
+    del user_at_hand
+    return FIND_TASKS_STATE
+
+
+def get_find_task_handler() -> ConversationHandler:
+    return ConversationHandler(
+        entry_points = [
+            CommandHandler('find', find_tasks),
+        ],
+        states = {
+            FIND_TASKS_STATE : [
+                CallbackQueryHandler(pattern='^find_page_(prev|next)$', callback=turn_find_page),
+                CallbackQueryHandler(pattern='^find_return$', callback=return_to_menu),
+            ],
+        },
+        fallbacks = [
+            CommandHandler('cancel', close_all_convos)
+        ],
+        allow_reentry = True
+    )
@@ -20,20 +20,34 @@ from handlers.common.common_handlers import (
     return_to_tasks,
     delete_previous_menu,
     send_new_menu,
-    edit_previous_menu
+    edit_previous_menu,
+    load_task_list,
+    task_list_keyboard
 )
-from handlers.common.inline_keyboard_handlers import tasks_keyboard, subtasks_keyboard
+from handlers.common.inline_keyboard_handlers import subtasks_keyboard
+from helpers.input_parsers import parse_task_lines
 from helpers.user_data_util_classes.user_module import User
 
 # Initiating logger
 logger = logging.getLogger(__name__)
 
 
+def added_tasks_report(added: int, errors: list[str], user_tasks: list[str] | None) -> str:
+    """Builds the reply to a (possibly multi-line) add: what was added, \
+    which lines were skipped and why, and the updated list.
+    """
+    report = f"{"Your task was" if added == 1 else f"{added} tasks were"} successfully added✅\n"
+    if errors:
+        report += "These lines were skipped:\n" + "\n".join(errors) + "\n"
+    user_tasks_string = "\n".join(user_tasks) if user_tasks else "---NO TASKS ADDED YET---"
+    return report + f"Your tasks:\n{user_tasks_string}"
+
+
 async def recieve_new_task_via_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_chat.id
     user_input = update.message.text
 
-    user_at_hand = User(user_id)
+    user_at_hand = await User.create(user_id, context)
 
     await delete_previous_menu(update, context)
 
@@ -44,31 +58,28 @@ async def recieve_new_task_via_command(update: Update, context: ContextTypes.DEF
         raise ApplicationHandlerStop(ConversationHandler.END)
     else:
         # InlineKeyboardMarkup ->
-        tasks_markup = tasks_keyboard()
         subtask_markup = subtasks_keyboard()
 
-        if user_input.startswith('/'):
-            new_task = user_input.strip('/add_task ').split(":")
-        else:
-            new_task = None
+        # Everything after "/add_task", one task:priority per line
+        command_and_tasks = user_input.split(maxsplit=1) if user_input.startswith('/') else []
+        new_tasks, errors = parse_task_lines(command_and_tasks[1] if len(command_and_tasks) == 2 else "")
 
-        if new_task != None:
-            result = user_at_hand.task.add_user_task(task = new_task[0], priority=int(new_task[1]))
+        if new_tasks:
+            result = await user_at_hand.task.add_user_tasks_async(new_tasks)
         else:
             result = 1
 
         if result != 0:
-            error_text_1 = "Invalid input. Try again!"
+            error_text_1 = "Invalid input. Try again!\n" + "\n".join(errors)
             await send_new_menu(update, context, error_text_1, subtask_markup)
             
 
         else:
-            logger.info(f"Task {new_task[0]} for user {user_id}, was addded successfully.")
-            user_tasks = user_at_hand.task.get_user_tasks()
-            user_tasks_string = "\n".join(user_tasks) if user_tasks else "---NO TASKS ADDED YET---"
-            success_text_1 = f"Your task was successfully added✅\nYour tasks:\n{user_tasks_string}"
+            logger.info(f"{len(new_tasks)} task(s) for user {user_id}, were addded successfully.")
+            user_tasks = await load_task_list(context, user_at_hand)
+            success_text_1 = added_tasks_report(len(new_tasks), errors, user_tasks)
             
-            await send_new_menu(update, context, success_text_1, tasks_markup)
+            await send_new_menu(update, context, success_text_1, task_list_keyboard(context))
 
         del user_at_hand
         return ConversationHandler.END
@@ -77,33 +88,28 @@ async def recieve_new_task_via_text(update: Update, context: ContextTypes.DEFAUL
     user_id = update.effective_chat.id
     user_input = update.message.text
     # InlineKeyboardMarkup ->
-    tasks_markup = tasks_keyboard()
     subtask_markup = subtasks_keyboard()
 
-    if ":" in user_input:
-        new_task = user_input.split(":")
-    else:
-        new_task = None
+    new_tasks, errors = parse_task_lines(user_input)
     
-    if new_task != None:
-        user_at_hand = User(user_id)
-        result = user_at_hand.task.add_user_task(task = new_task[0], priority=int(new_task[1]))
+    user_at_hand = User.for_context(context, user_id)
+    if new_tasks:
+        result = await user_at_hand.task.add_user_tasks_async(new_tasks)
     else:
         result = 1
 
     if result != 0:
-        error_text_1 = "Invalid input. Try again!"
+        error_text_1 = "Invalid input. Try again!\n" + "\n".join(errors)
         await edit_previous_menu(update, context, error_text_1, subtask_markup)
 
         del user_at_hand
         return PROMPT_ADD_TASK_STATE
     else:
-        logger.info(f"Task {new_task[0]} for user {user_id}, was addded successfully.")
-        user_tasks = user_at_hand.task.get_user_tasks()
-        user_tasks_string = "\n".join(user_tasks) if user_tasks else "---NO TASKS ADDED YET---"
-        success_text_1 = f"Your task was successfully added✅\nYour tasks:\n{user_tasks_string}"
+        logger.info(f"{len(new_tasks)} task(s) for user {user_id}, were addded successfully.")
+        user_tasks = await load_task_list(context, user_at_hand)
+        success_text_1 = added_tasks_report(len(new_tasks), errors, user_tasks)
         
-        await edit_previous_menu(update, context, success_text_1, tasks_markup)
+        await edit_previous_menu(update, context, success_text_1, task_list_keyboard(context))
 
         del user_at_hand
         return ConversationHandler.END
@@ -117,7 +123,7 @@ async def prompt_add_task(update: Update, context: ContextTypes.DEFAULT_TYPE):
     prior_main_menu = context.user_data['main_menu_message_id']
     message_to_edit_id = query.message.message_id
 
-    add_task_guide_text = "You can send your \"task\" followed by a \":\" and then its \"priority\" (or urgency) as an integer from 1 to 3. You can always (from anywhere in the bot) use the /add_task command followed by the same instructions to add your task.\nExample: Go shopping:2\nor /add_task Go shopping:2"
+    add_task_guide_text = "You can send your \"task\" followed by a \":\" and then its \"priority\" (or urgency) as an integer from 1 to 3. You can always (from anywhere in the bot) use the /add_task command followed by the same instructions to add your task. Several tasks can be sent at once, one per line.\nExample: Go shopping:2\nor /add_task Go shopping:2"
     subtask_markup = subtasks_keyboard()
 
     if prior_main_menu == message_to_edit_id:
@@ -20,9 +20,16 @@ from handlers.common.common_handlers import (
     return_to_tasks,
     delete_previous_menu,
     send_new_menu,
-    edit_previous_menu
+    edit_previous_menu,
+    load_task_list,
+    load_task_rows_up_to,
+    remember_task_rows,
+    remembered_task_rows,
+    task_list_keyboard,
+    task_page_lines
 )
-from handlers.common.inline_keyboard_handlers import tasks_keyboard, subtasks_keyboard
+from handlers.common.inline_keyboard_handlers import subtasks_keyboard
+from helpers.input_parsers import highest_row_number, parse_row_selection
 from helpers.user_data_util_classes.user_module import User
 
 # Initiating logger
@@ -34,82 +41,63 @@ async def mark_task_done(update: Update, context: ContextTypes.DEFAULT_TYPE, uid
     user_id = uid
     user_input = row_number
 
-    # Getting user_tasks list 
-    user_at_hand = User(user_id)
-    user_task_list = user_at_hand.task.get_user_tasks()
-    if user_task_list:
-        user_tasks = "Your tasks are as follows:\n" + ("\n".join(user_task_list))
-    else:
-        user_tasks = "\n".join("---NO TASKS ADDED YET---")
+    user_at_hand = User.for_context(context, user_id)
+    if remembered_task_rows(context) is None: # No list was shown to this user yet
+        await load_task_list(context, user_at_hand)
 
-    tasks_markup = tasks_keyboard()
+    def current_tasks_text() -> str:
+        user_task_list = task_page_lines(context)
+        if user_task_list:
+            return "Your tasks are as follows:\n" + ("\n".join(user_task_list))
+        else:
+            return "---NO TASKS ADDED YET---"
 
-    try:
-        user_input = int(user_input) - 1
-    except (ValueError, TypeError):
-        error_text_1 = "❌Failed: Input was not an integer.\n"
-        
-        logger.info(error_text_1)
+    async def reply_with_error(error_text: str):
+        logger.info(error_text)
         if query_type == "text":
-            await edit_previous_menu(update=update, context=context, content=(error_text_1 + user_tasks), markup=tasks_markup)
+            await edit_previous_menu(update=update, context=context, content=(error_text + current_tasks_text()), markup=task_list_keyboard(context))
             return PROMPT_CHECK_TASK_STATE
         elif query_type == "command":
             await delete_previous_menu(update, context)
-            await send_new_menu(update, context, content=(error_text_1 + user_tasks), markup=tasks_markup)
+            await send_new_menu(update, context, content=(error_text + current_tasks_text()), markup=task_list_keyboard(context))
             return ConversationHandler.END
-    else:
-        if not (0 <= user_input < len(user_task_list)):
-            error_text_2 = "❌Failed: The integer user entered is out of range.\n"
-
-            logger.info(error_text_2)
-            if query_type == "text":
-                await edit_previous_menu(update=update, context=context, content=(error_text_2 + user_tasks), markup=tasks_markup)
-                return PROMPT_CHECK_TASK_STATE
-            elif query_type == "command":
-                await delete_previous_menu(update, context)
-                await send_new_menu(update, context, content=(error_text_2 + user_tasks), markup=tasks_markup)
-                return ConversationHandler.END
-        
-        else:
-            task_to_be_marked_string : str = user_task_list[user_input]
-            task_to_be_marked = task_to_be_marked_string.split('--')[1].strip()
-
-            results = user_at_hand.task.mark_done_and_return_new_list(task_to_be_marked)
-
-            if results is None:
-                error_text_3 = "❌Failed: Updating the database failed.\n"
-
-                logger.info(error_text_3)
-                if query_type == "text":
-                    await edit_previous_menu(update=update, context=context, content=(error_text_3 + user_tasks), markup=tasks_markup)
-                    return PROMPT_CHECK_TASK_STATE
-                elif query_type == "command":
-                    await delete_previous_menu(update, context)
-                    await send_new_menu(update, context, content=(error_text_3 + user_tasks), markup=tasks_markup)
-                    return ConversationHandler.END
-            
-            elif results == 1:
-                error_text_4 = "❌Failed: Couldn't retreive the tasklist.\n"
-
-                logger.info(error_text_4)
-                if query_type == "text":
-                    await edit_previous_menu(update=update, context=context, content=(error_text_4 + user_tasks), markup=tasks_markup)
-                    return PROMPT_CHECK_TASK_STATE
-                elif query_type == "command":
-                    await delete_previous_menu(update, context)
-                    await send_new_menu(update, context, content=(error_text_4 + user_tasks), markup=tasks_markup)
-                    return ConversationHandler.END
-            
-            else:
-                success_text = "^_-  Success: Task was marked done."
-                results = f"Tasks:\n" + ("\n".join(results))
-                logger.info(success_text)
-                if query_type == "text":
-                    await edit_previous_menu(update=update, context=context, content=(success_text + results), markup=tasks_markup)
-                elif query_type == "command":
-                    await delete_previous_menu(update, context)
-                    await send_new_menu(update, context, content=(success_text + results), markup=tasks_markup)
-                return ConversationHandler.END
+
+    rows = await load_task_rows_up_to(context, user_at_hand, highest_row_number(user_input or ""))
+    row_numbers, errors = parse_row_selection(user_input or "", len(rows))
+    if errors:
+        return await reply_with_error("❌Failed: " + " ".join(errors) + "\n")
+    task_rows = [rows[row_number - 1] for row_number in row_numbers]
+
+    result = await user_at_hand.task.mark_user_tasks_done_async([row.id for row in task_rows])
+
+    if result == 2:
+        # The list the row numbers refer to isn't today's anymore (e.g. it was
+        # shown before midnight). The same numbers may name other tasks on the
+        # fresh list, so show it and let the user pick again instead of guessing.
+        await load_task_list(context, user_at_hand)
+        return await reply_with_error("❌Failed: Your task list has changed since it was shown, pick the rows again.\n")
+
+    if result != 0:
+        return await reply_with_error("❌Failed: Updating the database failed.\n")
+
+    marked_ids = {row.id for row in task_rows}
+    updated_rows = [
+        row._replace(is_done=True) if row.id in marked_ids else row
+        for row in remembered_task_rows(context)
+    ]
+    success_text = "^_-  Success: Task was marked done." if len(task_rows) == 1 else f"^_-  Success: {len(task_rows)} tasks were marked done."
+    updated_page = remember_task_rows(
+        context, updated_rows,
+        has_more=context.user_data.get('task_rows_have_more', False), page=context.user_data.get('task_page', 0)
+    )
+    results = f"Tasks:\n" + ("\n".join(updated_page))
+    logger.info(success_text)
+    if query_type == "text":
+        await edit_previous_menu(update=update, context=context, content=(success_text + results), markup=task_list_keyboard(context))
+    elif query_type == "command":
+        await delete_previous_menu(update, context)
+        await send_new_menu(update, context, content=(success_text + results), markup=task_list_keyboard(context))
+    return ConversationHandler.END
 
 async def mark_done_via_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_chat.id
@@ -118,7 +106,7 @@ async def mark_done_via_command(update: Update, context: ContextTypes.DEFAULT_TY
     subtasks_markup = subtasks_keyboard()
     # User instantiation
 
-    user_at_hand = User(user_id)
+    user_at_hand = await User.create(user_id, context)
 
     await delete_previous_menu(update, context)
 
@@ -129,12 +117,13 @@ async def mark_done_via_command(update: Update, context: ContextTypes.DEFAULT_TY
         raise ApplicationHandlerStop(ConversationHandler.END)
     else:
         if user_input.startswith('/'):
-            user_input = user_input.replace('/mark_done ', "").strip()
+            command_and_rows = user_input.split(maxsplit=1)
+            user_input = command_and_rows[1] if len(command_and_rows) == 2 else ""
             await mark_task_done(update, context, user_id, user_input, "command")
         else:
             error_text_1 = "U_U  An error occured while marking your task done. Try again! Your tasks: \n"
 
-            user_tasks_list = user_at_hand.task.get_user_tasks()
+            user_tasks_list = await load_task_list(context, user_at_hand)
             if user_tasks_list:
                 user_tasks = "\n".join(user_tasks_list)
             else:
@@ -165,7 +154,7 @@ async def prompt_check_task(update: Update, context: ContextTypes.DEFAULT_TYPE):
     prior_main_menu = context.user_data['main_menu_message_id']
     message_to_edit_id = query.message.message_id
 
-    add_task_guide_text = "(～￣▽￣)～  Mark your tasks done by sending their row number, right here!\nOr you can use /mark_done <row number> anywhere in the bot."
+    add_task_guide_text = "(～￣▽￣)～  Mark your tasks done by sending their row number, right here! Several at once work too, e.g. 1-3,5.\nOr you can use /mark_done <row numbers> anywhere in the bot."
     subtask_markup = subtasks_keyboard()
 
     if prior_main_menu == message_to_edit_id:
@@ -20,9 +20,16 @@ from handlers.common.common_handlers import (
     close_all_convos, 
     return_to_tasks,
     delete_previous_menu,
-    edit_previous_menu
+    edit_previous_menu,
+    load_task_list,
+    load_task_rows_up_to,
+    remember_task_rows,
+    remembered_task_rows,
+    task_list_keyboard,
+    task_page_lines
 )
-from handlers.common.inline_keyboard_handlers import tasks_keyboard, subtasks_keyboard
+from handlers.common.inline_keyboard_handlers import subtasks_keyboard
+from helpers.input_parsers import highest_row_number, parse_row_selection
 from helpers.user_data_util_classes.user_module import User
 
 # Initiating logger
@@ -37,15 +44,18 @@ async def prompt_remove_task(update: Update, context: ContextTypes.DEFAULT_TYPE)
     prior_main_menu = context.user_data['main_menu_message_id']
 
     user_id = update.effective_chat.id
-    user_at_hand = User(user_id)
+    user_at_hand = User.for_context(context, user_id)
 
-    user_tasks = user_at_hand.task.get_user_tasks()
+    # Keep the page the user is on, so the row numbers they see stay usable
+    if remembered_task_rows(context) is None:
+        await load_task_list(context, user_at_hand)
+    user_tasks = task_page_lines(context)
     if user_tasks:
         user_tasks_string = "\n".join(user_tasks) 
     else:
         user_tasks_string = "\n".join("---NO TASKS ADDED YET---")
 
-    suffix_string = "\n\nTo remove a task from the list below, just send the row number, I'll handle the rest ╰(*°▽°*)╯"
+    suffix_string = "\n\nTo remove tasks from the list below, just send their row numbers (e.g. 2 or 1-3,5), I'll handle the rest ╰(*°▽°*)╯"
     whole_string = user_tasks_string + suffix_string
     remove_task_markup = subtasks_keyboard()
 
@@ -64,70 +74,64 @@ async def prompt_remove_task(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 async def remove_task(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_chat.id
-    user_at_hand = User(user_id)
+    user_at_hand = User.for_context(context, user_id)
 
-    user_tasks = user_at_hand.task.get_user_tasks()
+    # The rows are the ones prompt_remove_task just showed (see remember_task_rows)
+    if remembered_task_rows(context) is None:
+        await load_task_list(context, user_at_hand)
+    user_tasks = task_page_lines(context)
     if user_tasks:
         user_tasks_string = "\n".join(user_tasks) 
     else:
         user_tasks_string = "\n".join("---NO TASKS ADDED YET---")
-    text_string = f"Your tasks are as follows:\n{"\n".join(user_tasks_string)}"
+    text_string = f"Your tasks are as follows:\n{user_tasks_string}"
     remove_task_markup = subtasks_keyboard()
 
-    try:
-        user_input = int(update.message.text) - 1
-    except ValueError:
-        logging.info(f"User entered an input that is not a number.")
-        error_text_1 = text_string + "\n*❌Your input was not a parsable integer. Try again!*"
+    rows = await load_task_rows_up_to(context, user_at_hand, highest_row_number(update.message.text or ""))
+    row_numbers, errors = parse_row_selection(update.message.text or "", len(rows))
+    if errors:
+        logging.info(f"User entered a selection that couldn't be applied to their tasklist.")
+        error_text_1 = text_string + "\n*❌" + " ".join(errors) + " Try again!*"
 
         await edit_previous_menu(update, context, error_text_1, remove_task_markup)
         del user_at_hand
         return PROMPT_REMOVE_TASK_STATE
-    except TypeError:
-        logging.info(f"User entered an empty input that is probably of type <NoneType>.")
-        error_text_2 = text_string + "\n*❌Your input was not a parsable integer. Try again!*"
-
-        await edit_previous_menu(update, context, error_text_2, remove_task_markup)
-        del user_at_hand
-        return PROMPT_REMOVE_TASK_STATE
     else:
-        if not 0 <= user_input < len(user_tasks):
-            logging.info(f"User entered an input out of their tasklist range.")
-            error_text_3 = text_string + "\n*❌Your input was out of range. Try again!*"
+        to_be_removed = [rows[row_number - 1] for row_number in row_numbers]
+        result = await user_at_hand.task.remove_user_tasks_async([row.id for row in to_be_removed])
+
+        if result == 0:
+            logging.info(f"{len(to_be_removed)} task(s) were successfully removed for user {user_id}")
+            
+            removed_ids = {row.id for row in to_be_removed}
+            remaining_rows = [row for row in rows if row.id not in removed_ids]
+            refetch_list = remember_task_rows(
+                context, remaining_rows,
+                has_more=context.user_data.get('task_rows_have_more', False), page=context.user_data.get('task_page', 0)
+            )
+            if refetch_list:
+                refetch_string = "\n".join(refetch_list) 
+            else:
+                refetch_string = "\n".join("---NO TASKS ADDED YET---")
 
-            await edit_previous_menu(update, context, error_text_3, remove_task_markup)
+            removed_text = "Your task was" if len(to_be_removed) == 1 else f"{len(to_be_removed)} tasks were"
+            success_string = f"*✅{removed_text} removed successfully. If you wish you can remove another (assuming there are still tasks to remove.)*\n" + refetch_string
+            task_menu_markup = task_list_keyboard(context)
+
+            await edit_previous_menu(update, context, success_string, task_menu_markup)
+            
             del user_at_hand
-            return PROMPT_REMOVE_TASK_STATE
+            return ConversationHandler.END
         else:
-            to_be_removed_string: str = user_tasks[user_input]
-            to_be_removed_task =  to_be_removed_string.split('--')[1].strip()
-
-            result = user_at_hand.task.remove_user_task(to_be_removed_task)
-
-            if result == 0:
-                logging.info(f"Task `{to_be_removed_task}` was successfully removed for user {user_id}")
-                
-                refetch_list = user_at_hand.task.get_user_tasks()
-                if refetch_list:
-                    refetch_string = "\n".join(refetch_list) 
-                else:
-                    refetch_string = "\n".join("---NO TASKS ADDED YET---")
-
-                success_string = "*✅Your task was removed successfully. If you wish you can remove another (assuming there are still tasks to remove.)*\n" + refetch_string
-                task_menu_markup = tasks_keyboard()
-
-                await edit_previous_menu(update, context, success_string, task_menu_markup)
-                
-                del user_at_hand
-                return ConversationHandler.END
-            else:
-                logging.info("Unsuccessful attempt to remove the task")
-                error_text_4 = text_string + "\n*❌Unsuccessful attempt to remove your task. Try again!*"
+            logging.info("Unsuccessful attempt to remove the task")
+            if result == 2: # Some were already gone or the list isn't today's; show the list as it is now
+                refreshed = await load_task_list(context, user_at_hand)
+                text_string = "Your tasks are as follows:\n" + ("\n".join(refreshed) if refreshed else "---NO TASKS ADDED YET---")
+            error_text_2 = text_string + "\n*❌Unsuccessful attempt to remove your task(s). Try again!*"
 
-                await edit_previous_menu(update, context, error_text_4, remove_task_markup)
-                del user_at_hand
-                return PROMPT_REMOVE_TASK_STATE
-                
+            await edit_previous_menu(update, context, error_text_2, remove_task_markup)
+            del user_at_hand
+            return PROMPT_REMOVE_TASK_STATE
             
 
 # <<< Remove Task State Prompts <<<
@@ -18,9 +18,11 @@ from handlers.common.common_handlers import (
     return_to_menu,
     delete_previous_menu,
     send_new_menu,
-    edit_previous_menu
+    edit_previous_menu,
+    load_task_list,
+    task_list_keyboard,
+    turn_task_page
 )
-from handlers.common.inline_keyboard_handlers import tasks_keyboard
 from helpers.user_data_util_classes.user_module import User
 
 logger = logging.getLogger(__name__)
@@ -31,7 +33,7 @@ async def view_task_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Get user info and tasks
     user_id = update.effective_chat.id
 
-    user_at_hand = User(user_id)
+    user_at_hand = await User.create(user_id, context)
     
 
     if not user_at_hand._is_a_user:
@@ -42,7 +44,7 @@ async def view_task_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
         raise ApplicationHandlerStop(ConversationHandler.END)
     else:
-        user_tasks_list = user_at_hand.task.get_user_tasks()
+        user_tasks_list = await load_task_list(context, user_at_hand)
         if user_tasks_list:
             user_tasks = "\n".join(user_tasks_list)
         else:
@@ -50,7 +52,7 @@ async def view_task_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 
         # Setting up keyboard markup
-        tasks_markup = tasks_keyboard()
+        tasks_markup = task_list_keyboard(context)
 
         # Unsuccessful task retrieval text
         add_task_guide_text = "No tasks are added yet. Try adding one by touching the button \"➕ Add\" or through the command /add_task task:priority(1, 2 or 3). \nExample: /add_task Go shopping:2\n" + ("\n".join("---NO TASKS ADDED YET---"))
@@ -87,4 +89,10 @@ def get_task_menu_handler() -> ConversationHandler:
         },
         allow_reentry = True
     )
+
+
+def get_task_page_handler() -> CallbackQueryHandler:
+    # Not part of a conversation: lists with page buttons are also sent by
+    # /add_task and /mark_done, outside of the task menu.
+    return CallbackQueryHandler(pattern='^tasks_page_(prev|next)$', callback=turn_task_page)
 # <<< Task Menu <<<
@@ -0,0 +1,463 @@
+# /helpers/db_migrations.py
+
+# GENERAL PYTHON imports ->
+import argparse
+from datetime import datetime, timezone
+import logging
+import sqlite3
+# LOCAL imports ->
+from config import DATABASE_FILE, DB_BACKFILL_BATCH_SIZE, FORMAT_STRING_C
+
+logger = logging.getLogger(__name__)
+
+
+# NOTE:
+## Schema changes are applied as numbered migrations recorded in *schema_version*.
+## A migration has two parts:
+##  1. apply(conn): quick DDL (CREATE/ALTER/INDEX) run in one transaction at startup.
+##  2. an optional Backfill that fills new columns afterwards in small committed
+##     batches, walking the table by primary key from the newest row down (so
+##     today's rows are correct first) and remembering its cursor in
+##     *schema_version*. Each batch holds the writer lock for milliseconds, which
+##     lets the bot keep serving while a large table is upgraded.
+## Code reading a backfilled column must therefore tolerate rows not reached yet.
+
+
+class Backfill:
+    """Describes a batched pass over tables with an integer *id* key.
+
+    By default a batch is an UPDATE of *table*. A backfill that fills another \
+    table instead (e.g. a rollup) passes *statement*: it is run once per id \
+    span, with the span given as :lower (inclusive) and :upper (exclusive).
+
+    Only rows that existed when the migration was applied are visited: the \
+    cursor starts above the largest id at that moment, and writes made since \
+    are the new code's business.
+
+    Args:
+        table (str): The table to walk.
+        assignment (str, optional): The SET clause, e.g. "local_day = substr(created_at, 1, 10)".
+        condition (str, optional): Which rows in a batch still need it, e.g. "local_day IS NULL".
+        statement (str | None, optional): Replaces the UPDATE, see above.
+        id_sources (tuple[str, ...], optional): Tables whose ids the walk \
+        has to cover. Defaults to (table,).
+    """
+    def __init__(self, table: str, assignment: str = "", condition: str = "",
+                 statement: str | None = None, id_sources: tuple[str, ...] = ()):
+        self.table = table
+        self.assignment = assignment
+        self.condition = condition
+        self.statement = statement
+        self.id_sources = id_sources or (table,)
+
+    def start_cursor(self, conn: sqlite3.Connection) -> int:
+        """One above the largest id in any of the id sources."""
+        maxima = " UNION ALL ".join(f"SELECT MAX(id) AS id FROM {source}" for source in self.id_sources)
+        return conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM ({maxima})").fetchone()[0]
+
+
+class Migration:
+    def __init__(self, version: int, description: str, apply, backfill: Backfill | None = None):
+        self.version = version
+        self.description = description
+        self.apply = apply
+        self.backfill = backfill
+
+
+def _column_names(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+# >>> Migrations >>>
+def _baseline_schema(conn: sqlite3.Connection):
+    # The schema every database had before migrations existed (no-op on those).
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users(
+            telegram_id INTEGER UNIQUE PRIMARY KEY,
+            utc_offset TEXT,
+            IANA_timezone TEXT,
+            reminder_done_enabled BOOLEAN DEFAULT 0,
+            reminder_left_enabled BOOLEAN DEFAULT 0
+        )''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS tasks(
+            id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            content TEXT,
+            priority INTEGER CHECK (priority IN (1, 2, 3)),
+            is_done BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(telegram_id))''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS reminders(
+            user_id INTEGER,
+            type TEXT CHECK (type IN ('DONE', 'LEFT')),
+            reminder_time_locale TEXT,
+            FOREIGN KEY (user_id) REFERENCES users(telegram_id)
+        )''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_telegram_id ON users(telegram_id)")
+
+
+def _tasks_local_day(conn: sqlite3.Connection):
+    # *tasks.local_day* holds the user's local calendar day (YYYY-MM-DD) the task
+    # was logged on; created_at is already stored in local time, so older rows are
+    # backfilled from its first ten characters. The composite index serves "today's
+    # tasks" as a range scan in the exact ORDER BY of TaskManager.get_user_tasks.
+    if 'local_day' not in _column_names(conn, 'tasks'):
+        conn.execute("ALTER TABLE tasks ADD COLUMN local_day TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_user_day ON tasks(user_id, local_day, priority DESC, created_at)")
+
+
+def _tasks_archive(conn: sqlite3.Connection):
+    # Cold storage for tasks past TASK_RETENTION_DAYS (see helpers/task_archive.py).
+    # Rows keep their original id, which AUTOINCREMENT never hands out again.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS tasks_archive(
+            id INTEGER NOT NULL PRIMARY KEY,
+            user_id INTEGER,
+            content TEXT,
+            priority INTEGER,
+            is_done BOOLEAN,
+            created_at TIMESTAMP,
+            local_day TEXT,
+            archived_at TEXT
+        )''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_archive_user_day ON tasks_archive(user_id, local_day)")
+
+
+def _user_stats(conn: sqlite3.Connection):
+    # Lifetime per-user counters, kept exact by triggers in the same transaction as
+    # every write to *tasks*. Moving a task to the archive isn't a removal: it's
+    # already in *tasks_archive* when it's deleted, which the delete trigger checks.
+    # Existing tasks are counted by the backfill, not here (see _reached_by_backfill).
+    # See helpers/user_stats.py for check/rebuild.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS user_stats(
+            user_id INTEGER NOT NULL PRIMARY KEY,
+            tasks_logged INTEGER NOT NULL DEFAULT 0,
+            tasks_done INTEGER NOT NULL DEFAULT 0
+        )''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_user_stats_task_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO user_stats (user_id, tasks_logged, tasks_done) VALUES (NEW.user_id, 1, NEW.is_done = 1)
+            ON CONFLICT(user_id) DO UPDATE SET
+                tasks_logged = tasks_logged + 1, tasks_done = tasks_done + (NEW.is_done = 1);
+        END''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_user_stats_task_delete AFTER DELETE ON tasks
+        WHEN NOT EXISTS (SELECT 1 FROM tasks_archive WHERE id = OLD.id) AND {_reached_by_backfill(4, "OLD")}
+        BEGIN
+            UPDATE user_stats SET tasks_logged = tasks_logged - 1, tasks_done = tasks_done - (OLD.is_done = 1)
+            WHERE user_id = OLD.user_id;
+        END''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_user_stats_task_done AFTER UPDATE OF is_done ON tasks
+        WHEN (OLD.is_done = 1) IS NOT (NEW.is_done = 1) AND {_reached_by_backfill(4, "NEW")}
+        BEGIN
+            UPDATE user_stats SET tasks_done = tasks_done + (NEW.is_done = 1) - (OLD.is_done = 1)
+            WHERE user_id = NEW.user_id;
+        END''')
+
+
+# Recomputes *user_stats* from scratch (also used by helpers/user_stats.py).
+USER_STATS_REBUILD_QUERY = (
+    "INSERT INTO user_stats (user_id, tasks_logged, tasks_done) "
+    "SELECT user_id, COUNT(id), SUM(is_done = 1) FROM ("
+        "SELECT user_id, id, is_done FROM tasks UNION ALL SELECT user_id, id, is_done FROM tasks_archive"
+    ") WHERE user_id IS NOT NULL GROUP BY user_id"
+)
+
+_USER_STATS_BACKFILL = (
+    "INSERT INTO user_stats (user_id, tasks_logged, tasks_done) "
+    "SELECT user_id, COUNT(id), SUM(is_done = 1) FROM ("
+        "SELECT user_id, id, is_done FROM tasks WHERE id >= :lower AND id < :upper "
+        "UNION ALL "
+        "SELECT user_id, id, is_done FROM tasks_archive WHERE id >= :lower AND id < :upper"
+    ") WHERE user_id IS NOT NULL GROUP BY user_id "
+    "ON CONFLICT(user_id) DO UPDATE SET "
+        "tasks_logged = tasks_logged + excluded.tasks_logged, tasks_done = tasks_done + excluded.tasks_done"
+)
+
+
+def _reached_by_backfill(version: int, row: str) -> str:
+    # Trigger condition for tables filled by a statement backfill: a task row is
+    # handled either by the backfill (rows older than the migration, walked from the
+    # top down) or by the triggers, never both. Until the backfill is done, triggers
+    # leave rows below its cursor alone; it will see their state when it gets there.
+    return (
+        "NOT EXISTS (SELECT 1 FROM schema_version "
+        f"WHERE version = {version} AND backfill_done = 0 AND {row}.id < backfill_cursor)"
+    )
+
+
+def _daily_stats(conn: sqlite3.Connection):
+    # Per user and local day: tasks logged and done. Small enough that a year of
+    # trends is a few hundred primary-key-ordered rows (see StatsManager).
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS daily_stats(
+            user_id INTEGER NOT NULL,
+            local_day TEXT NOT NULL,
+            logged INTEGER NOT NULL DEFAULT 0,
+            done INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, local_day)
+        ) WITHOUT ROWID''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_daily_stats_task_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO daily_stats (user_id, local_day, logged, done)
+            VALUES (NEW.user_id, COALESCE(NEW.local_day, substr(NEW.created_at, 1, 10)), 1, NEW.is_done = 1)
+            ON CONFLICT(user_id, local_day) DO UPDATE SET logged = logged + 1, done = done + (NEW.is_done = 1);
+        END''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_daily_stats_task_delete AFTER DELETE ON tasks
+        WHEN NOT EXISTS (SELECT 1 FROM tasks_archive WHERE id = OLD.id) AND {_reached_by_backfill(5, "OLD")}
+        BEGIN
+            UPDATE daily_stats SET logged = logged - 1, done = done - (OLD.is_done = 1)
+            WHERE user_id = OLD.user_id AND local_day = COALESCE(OLD.local_day, substr(OLD.created_at, 1, 10));
+        END''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_daily_stats_task_done AFTER UPDATE OF is_done ON tasks
+        WHEN (OLD.is_done = 1) IS NOT (NEW.is_done = 1) AND {_reached_by_backfill(5, "NEW")}
+        BEGIN
+            UPDATE daily_stats SET done = done + (NEW.is_done = 1) - (OLD.is_done = 1)
+            WHERE user_id = NEW.user_id AND local_day = COALESCE(NEW.local_day, substr(NEW.created_at, 1, 10));
+        END''')
+
+
+_DAILY_STATS_BACKFILL = (
+    "INSERT INTO daily_stats (user_id, local_day, logged, done) "
+    "SELECT user_id, day, COUNT(id), SUM(is_done = 1) FROM ("
+        "SELECT user_id, id, is_done, COALESCE(local_day, substr(created_at, 1, 10)) AS day "
+        "FROM tasks WHERE id >= :lower AND id < :upper "
+        "UNION ALL "
+        "SELECT user_id, id, is_done, local_day FROM tasks_archive WHERE id >= :lower AND id < :upper"
+    ") WHERE user_id IS NOT NULL GROUP BY user_id, day "
+    "ON CONFLICT(user_id, local_day) DO UPDATE SET logged = logged + excluded.logged, done = done + excluded.done"
+)
+
+
+def _tasks_fts(conn: sqlite3.Connection):
+    # Full-text index over the content of every task, live or archived, keyed by the
+    # task id (rowid). *owner* holds a "u<user_id>" token so a user's search is one
+    # more term FTS5 intersects with, instead of filtering every user's matches.
+    # Moving a task to the archive keeps its entry (the id doesn't change); only
+    # deleting it for good, from either table, removes it.
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            content, owner, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+        )''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_task_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (rowid, content, owner) VALUES (NEW.id, NEW.content, 'u' || NEW.user_id);
+        END''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_task_delete AFTER DELETE ON tasks
+        WHEN NOT EXISTS (SELECT 1 FROM tasks_archive WHERE id = OLD.id)
+        BEGIN
+            DELETE FROM tasks_fts WHERE rowid = OLD.id;
+        END''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_task_update AFTER UPDATE OF content, user_id ON tasks
+        WHEN {_reached_by_backfill(6, "NEW")}
+        BEGIN
+            DELETE FROM tasks_fts WHERE rowid = OLD.id;
+            INSERT INTO tasks_fts (rowid, content, owner) VALUES (NEW.id, NEW.content, 'u' || NEW.user_id);
+        END''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_archive_delete AFTER DELETE ON tasks_archive
+        BEGIN
+            DELETE FROM tasks_fts WHERE rowid = OLD.id;
+        END''')
+
+
+_TASKS_FTS_BACKFILL = (
+    "INSERT INTO tasks_fts (rowid, content, owner) "
+    "SELECT id, content, 'u' || user_id FROM tasks WHERE id >= :lower AND id < :upper AND user_id IS NOT NULL "
+    "UNION ALL "
+    "SELECT id, content, 'u' || user_id FROM tasks_archive WHERE id >= :lower AND id < :upper AND user_id IS NOT NULL"
+)
+
+
+def _reminder_dispatch(conn: sqlite3.Connection):
+    # *reminders.next_fire_utc* ("YYYY-MM-DD HH:MM:SS", UTC) is when a reminder is
+    # due next, so the minute dispatcher (see helpers/scheduler/reminder_dispatcher.py)
+    # finds everything due with one index range scan. It needs the user's timezone
+    # to compute, so rows from before this migration get it when the dispatcher
+    # starts. Reminder updates used to rewrite all of a user's rows (the UPDATE had
+    # no type filter), leaving duplicates behind; only the newest per type is kept,
+    # and a unique index keeps it that way.
+    if 'next_fire_utc' not in _column_names(conn, 'reminders'):
+        conn.execute("ALTER TABLE reminders ADD COLUMN next_fire_utc TEXT")
+    conn.execute("DELETE FROM reminders WHERE rowid NOT IN (SELECT MAX(rowid) FROM reminders GROUP BY user_id, type)")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_reminders_user_type ON reminders(user_id, type)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_reminders_next_fire ON reminders(next_fire_utc)")
+
+
+MIGRATIONS = [
+    Migration(1, "Baseline users/tasks/reminders schema", _baseline_schema),
+    Migration(
+        2, "tasks.local_day with a (user_id, local_day, priority, created_at) index", _tasks_local_day,
+        Backfill("tasks", "local_day = substr(created_at, 1, 10)", "local_day IS NULL")
+    ),
+    Migration(3, "tasks_archive cold storage", _tasks_archive),
+    Migration(
+        4, "user_stats lifetime counters maintained by triggers", _user_stats,
+        Backfill("user_stats", statement=_USER_STATS_BACKFILL, id_sources=("tasks", "tasks_archive"))
+    ),
+    Migration(
+        5, "daily_stats per-day rollup maintained by triggers", _daily_stats,
+        Backfill("daily_stats", statement=_DAILY_STATS_BACKFILL, id_sources=("tasks", "tasks_archive"))
+    ),
+    Migration(
+        6, "tasks_fts full-text index of tasks and the archive", _tasks_fts,
+        Backfill("tasks_fts", statement=_TASKS_FTS_BACKFILL, id_sources=("tasks", "tasks_archive"))
+    ),
+    Migration(7, "reminders.next_fire_utc for the minute dispatcher, one row per type", _reminder_dispatch),
+]
+# <<< Migrations <<<
+
+
+def _ensure_version_table(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version(
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT,
+            backfill_cursor INTEGER,
+            backfill_done BOOLEAN DEFAULT 1
+        )''')
+    conn.commit()
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    _ensure_version_table(conn)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def _table_names(conn: sqlite3.Connection) -> set[str]:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def apply_migrations(conn: sqlite3.Connection, dry_run: bool = False) -> list[int]:
+    """Applies every migration newer than the database's schema version.
+
+    Each migration's DDL and its *schema_version* row are committed together, \
+    so a failure leaves the database at the previous version. Backfills are \
+    only registered here; :run_backfill_batch does the actual work.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the bot's database.
+        dry_run (bool, optional): Only log what would be applied (and how \
+        many rows a backfill would touch) without changing anything. \
+        Defaults to False.
+
+    Returns:
+        list[int]: Versions that were (or, in a dry run, would be) applied.
+    """
+    version = current_version(conn)
+    pending = [migration for migration in MIGRATIONS if migration.version > version]
+
+    for migration in pending:
+        if dry_run:
+            backfill_note = ""
+            if migration.backfill and migration.backfill.table in _table_names(conn):
+                rows = conn.execute(f"SELECT COUNT(*) FROM {migration.backfill.table}").fetchone()[0]
+                backfill_note = f" (+ batched backfill visiting {rows} {migration.backfill.table} row(s))"
+            logger.info(f"[dry run] Would apply migration {migration.version}: {migration.description}{backfill_note}")
+            continue
+
+        try:
+            conn.execute("BEGIN")
+            migration.apply(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description, applied_at, backfill_cursor, backfill_done) VALUES (?, ?, ?, ?, ?)",
+                (migration.version, migration.description, datetime.now(timezone.utc).strftime(FORMAT_STRING_C),
+                 migration.backfill.start_cursor(conn) if migration.backfill else None,
+                 0 if migration.backfill else 1)
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.error(f"{e}-> Migration {migration.version} failed and was rolled back.")
+            raise
+        else:
+            logger.info(f"Applied migration {migration.version}: {migration.description}")
+
+    return [migration.version for migration in pending]
+
+
+def run_backfill_batch(conn: sqlite3.Connection, batch_size: int = DB_BACKFILL_BATCH_SIZE) -> bool:
+    """Advances the oldest unfinished backfill by one committed batch.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the bot's database.
+        batch_size (int, optional): Rows (by primary key) per batch. \
+        Defaults to DB_BACKFILL_BATCH_SIZE.
+
+    Returns:
+        bool: True while any backfill still has work left.
+    """
+    row = conn.execute(
+        "SELECT version, backfill_cursor FROM schema_version WHERE backfill_done = 0 ORDER BY version LIMIT 1"
+    ).fetchone()
+    if row is None:
+        return False
+
+    version, cursor = row
+    backfill = next(migration.backfill for migration in MIGRATIONS if migration.version == version)
+
+    if cursor is None: # Registered before cursors were set on apply; start above the newest row
+        cursor = backfill.start_cursor(conn)
+
+    if backfill.statement is not None: # Fixed-width id spans, so every id source is covered
+        lower_bound = max(cursor - batch_size, 1) if cursor > 1 else None
+    else:
+        lower_bound = conn.execute(
+            f"SELECT MIN(id) FROM (SELECT id FROM {backfill.table} WHERE id < ? ORDER BY id DESC LIMIT ?)",
+            (cursor, batch_size)
+        ).fetchone()[0]
+
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        if lower_bound is None:
+            conn.execute("UPDATE schema_version SET backfill_cursor = 0, backfill_done = 1 WHERE version = ?", (version,))
+            logger.info(f"Backfill of migration {version} is complete.")
+        else:
+            if backfill.statement is not None:
+                updated = conn.execute(backfill.statement, {'lower': lower_bound, 'upper': cursor}).rowcount
+            else:
+                updated = conn.execute(
+                    f"UPDATE {backfill.table} SET {backfill.assignment} WHERE id >= ? AND id < ? AND ({backfill.condition})",
+                    (lower_bound, cursor)
+                ).rowcount
+            conn.execute("UPDATE schema_version SET backfill_cursor = ? WHERE version = ?", (lower_bound, version))
+            logger.debug(f"Backfill of migration {version}: {updated} row(s) in [{lower_bound}, {cursor}).")
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.error(f"{e}-> Backfill batch of migration {version} failed; it will be retried.")
+
+    return True
+
+
+if __name__ == "__main__":
+    # python -m helpers.db_migrations [--dry-run] [--backfill]
+    parser = argparse.ArgumentParser(description="Apply pending TodoPrompt schema migrations.")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be applied")
+    parser.add_argument("--backfill", action="store_true", help="also run pending backfills to completion")
+    parser.add_argument("--batch-size", type=int, default=DB_BACKFILL_BATCH_SIZE)
+    arguments = parser.parse_args()
+
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', level=logging.INFO)
+    if not DATABASE_FILE.exists():
+        parser.exit(1, f"No database at {DATABASE_FILE.resolve()}; run this from the bot's directory.\n")
+    connection = sqlite3.connect(DATABASE_FILE)
+    logger.info(f"Database is at schema version {current_version(connection)}.")
+    apply_migrations(connection, dry_run=arguments.dry_run)
+
+    if arguments.backfill and not arguments.dry_run:
+        while run_backfill_batch(connection, arguments.batch_size):
+            pass
+    connection.close()
@@ -1,19 +1,167 @@
 # /helpers/db_utils.py
 
 # GENERAL PYTON imports ->
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from functools import partial
+import logging
 import sqlite3
+import threading
+import time
 # LOCAL imports ->
-from config import DATA_DIR, DATABASE_FILE
+from config import (
+    DATA_DIR,
+    DATABASE_FILE,
+    DB_BACKFILL_PAUSE,
+    DB_BUSY_TIMEOUT_MS,
+    DB_CACHE_SIZE_KIB,
+    DB_HEALTH_CHECK_INTERVAL,
+    DB_MMAP_SIZE_BYTES,
+    DB_READER_THREADS,
+    DB_SYNCHRONOUS,
+)
+from helpers.db_migrations import apply_migrations, run_backfill_batch
+
+logger = logging.getLogger(__name__)
+
+
+# >>> Connection Pool >>>
+# NOTE:
+## Every thread that talks to the database (the event loop thread, APScheduler's
+## workers, ...) keeps one long-lived connection in a thread-local slot instead of
+## opening and closing a new one per query. All of them are also registered in
+## _pool so that close_all_connections() can tear them down on shutdown.
+_local = threading.local()
+_pool: dict[int, sqlite3.Connection] = {}
+_pool_lock = threading.Lock()
+
+
+def _open_connection() -> sqlite3.Connection:
+    """Opens a new connection and applies the pragmas the bot relies on.
+
+    Returns:
+        sqlite3.Connection: A connection in WAL journal mode, tuned for \
+        many small reads and short write transactions.
+    """
+    # check_same_thread is off only so that close_all_connections() can close
+    # connections owned by other threads on shutdown. Each connection is still
+    # only ever used by the thread that opened it.
+    conn = sqlite3.connect(DATABASE_FILE, timeout=DB_BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(f"PRAGMA synchronous = {DB_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size = -{DB_CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE_BYTES}")
+    conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+
+def _is_healthy(conn: sqlite3.Connection) -> bool:
+    try:
+        conn.execute("SELECT 1").fetchone()
+    except sqlite3.Error as e:
+        logger.warning(f"{e}-> Pooled database connection failed its health check.")
+        return False
+    else:
+        return True
+
+
+def _discard_connection(conn: sqlite3.Connection):
+    with _pool_lock:
+        _pool.pop(id(conn), None)
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+    _local.conn = None
+
+
+def get_connection() -> sqlite3.Connection:
+    """Returns the calling thread's pooled connection, opening it on first use.
+
+    A connection that has been idle for more than DB_HEALTH_CHECK_INTERVAL \
+    seconds is probed before being handed out and transparently replaced if \
+    the probe fails.
+
+    Returns:
+        sqlite3.Connection: The thread-local connection.
+    """
+    conn = getattr(_local, 'conn', None)
+    now = time.monotonic()
+
+    if conn is not None and now - _local.last_checked > DB_HEALTH_CHECK_INTERVAL:
+        if not _is_healthy(conn):
+            _discard_connection(conn)
+            conn = None
+        else:
+            _local.last_checked = now
+
+    if conn is None:
+        conn = _open_connection()
+        _local.conn = conn
+        _local.last_checked = now
+        with _pool_lock:
+            _pool[id(conn)] = conn
+        logger.info(f"Opened a pooled database connection for thread {threading.current_thread().name}.")
+
+    return conn
+
+
+def close_all_connections():
+    """Closes every pooled connection. Meant to be called once on shutdown."""
+    with _pool_lock:
+        connections = list(_pool.values())
+        _pool.clear()
+
+    for conn in connections:
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"{e}-> Could not close a pooled database connection.")
+
+    _local.conn = None
+    logger.info(f"Closed {len(connections)} pooled database connection(s).")
+# <<< Connection Pool <<<
+
+
+# >>> Query Counting >>>
+class QueryCounter:
+    """Tally of statements executed while a :count_queries scope is active."""
+    def __init__(self):
+        self.queries = 0
+
+_query_counter: ContextVar[QueryCounter | None] = ContextVar('query_counter', default=None)
+
+
+@contextmanager
+def count_queries():
+    """Counts every :execute_query call made inside the block, including \
+    the ones run_db_call sends to the executors on its behalf.
+
+    Yields:
+        QueryCounter: The counter, readable once the block exits.
+    """
+    counter = QueryCounter()
+    token = _query_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _query_counter.reset(token)
+# <<< Query Counting <<<
 
 
 def execute_query(query: str, params: tuple = (), fetch: bool = False):
     """A util function for reading and writing data from and to the databace
 
     This function acts as the central database utility function to ease connection
-    to the database file. It takes the queries and parameters provided to it and 
-    run them by the database (using Python's native sqlite3) in a controlled-flow 
+    to the database file. It takes the queries and parameters provided to it and
+    run them by the database (using Python's native sqlite3) in a controlled-flow
     structure and commits the changes made to the database if user didn't require
-    a result (if fetch is set to False, in other words.)
+    a result (if fetch is set to False, in other words.) The connection used is the
+    calling thread's pooled one (see get_connection), so no connect/close cost is
+    paid per query.
 
     Args:
         query (str): An SQL query of any sorts.
@@ -25,15 +173,18 @@ def execute_query(query: str, params: tuple = (), fetch: bool = False):
         Defaults to False.
 
     Returns:
-        list | None: If the query has a return value (logically or syntactically),
-        it will return a list of the rows (each row as a tuple) that SQL gave back.\
-        Otherwise, return value would be None.
-        
+        list | int | None: If fetch is set, a list of the rows (each row as a tuple) \
+        that SQL gave back, or None if there were none. Otherwise, the number of \
+        rows the statement changed.
+
     """
-    
-    with sqlite3.connect(DATABASE_FILE) as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
+    conn = get_connection()
+    counter = _query_counter.get()
+    if counter is not None:
+        counter.queries += 1
+
+    try:
+        cursor = conn.execute(query, params)
         if fetch:
             fetched = cursor.fetchall()
             if len(fetched) > 0:
@@ -42,33 +193,122 @@ def execute_query(query: str, params: tuple = (), fetch: bool = False):
                 return None
         else:
             conn.commit()
-            return None
+            return cursor.rowcount
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+
+
+def execute_many(query: str, params_seq: list[tuple]) -> int:
+    """Runs one write statement for every parameter tuple in a single \
+    transaction (sqlite3's executemany), committing once at the end. \
+    Either all rows are written or, on error, none are.
+
+    Args:
+        query (str): An INSERT/UPDATE/DELETE query.
+        params_seq (list[tuple]): One parameter tuple per execution.
+
+    Returns:
+        int: The number of rows changed.
+    """
+    conn = get_connection()
+    counter = _query_counter.get()
+    if counter is not None:
+        counter.queries += 1
+
+    try:
+        cursor = conn.executemany(query, params_seq)
+        conn.commit()
+        return cursor.rowcount
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+
+
+@contextmanager
+def transaction():
+    """Runs the statements of the block in one (immediate) transaction on the \
+    calling thread's pooled connection: committed if the block completes, \
+    rolled back if it raises.
+
+    Yields:
+        sqlite3.Connection: The connection to execute the statements on.
+    """
+    conn = get_connection()
+    counter = _query_counter.get()
+    if counter is not None:
+        counter.queries += 1
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+
+
+# >>> Async Layer >>>
+# NOTE:
+## Handlers are coroutines running on PTB's event loop, so a blocking sqlite3 call
+## made from them stalls every other update. The helpers below move the work onto
+## bounded executors instead: a single writer thread (SQLite only allows one writer
+## at a time anyway, so more threads would just queue on the lock) and a small pool
+## of readers that WAL mode lets run alongside it. Each executor thread gets its own
+## pooled connection through get_connection().
+_writer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+_reader_executor = ThreadPoolExecutor(max_workers=DB_READER_THREADS, thread_name_prefix="db-reader")
+
 
-def db_initiator():
+async def run_db_call(func, *args, write: bool = False, **kwargs):
+    """Runs a blocking database function off the event loop.
+
+    Args:
+        func (Callable): Any function that (eventually) calls :execute_query.
+        write (bool, optional): Routes the call to the single writer thread \
+        when True, to the reader pool otherwise. Anything that may write must \
+        pass True. Defaults to False.
+
+    Returns:
+        Any: Whatever func returns.
+    """
+    loop = asyncio.get_running_loop()
+    executor = _writer_executor if write else _reader_executor
+    # Running inside a copy of the caller's context keeps count_queries() scopes working.
+    return await loop.run_in_executor(executor, copy_context().run, partial(func, *args, **kwargs))
+
+
+async def execute_query_async(query: str, params: tuple = (), fetch: bool = False):
+    """Awaitable counterpart of :execute_query. Statements that don't fetch \
+    are treated as writes and run on the writer thread.
+    """
+    return await run_db_call(execute_query, query, params, fetch, write=not fetch)
+
+
+def shutdown_executors():
+    """Waits for queued database work to finish and stops the executors."""
+    _writer_executor.shutdown(wait=True)
+    _reader_executor.shutdown(wait=True)
+    logger.info("Database executors were shut down.")
+# <<< Async Layer <<<
+
+
+def db_initiator(dry_run: bool = False):
+    """Creates the database (if needed) and applies pending schema migrations.
+
+    Only the migrations' quick DDL runs here; their row backfills are left to \
+    :backfill_in_background once the bot is serving. See :module:db_migrations.
+    """
     DATA_DIR.mkdir(parents=True, exist_ok=True) # Checking for database directory existence
+    apply_migrations(get_connection(), dry_run=dry_run)
 
-    with sqlite3.connect(DATABASE_FILE) as conn: # Try to recreate database schema if doesn't exist
-        conn.executescript('''
-            CREATE TABLE IF NOT EXISTS users(
-                telegram_id INTEGER UNIQUE PRIMARY KEY,
-                utc_offset TEXT,
-                IANA_timezone TEXT,
-                reminder_done_enabled BOOLEAN DEFAULT 0,
-                reminder_left_enabled BOOLEAN DEFAULT 0
-            );
-            CREATE TABLE IF NOT EXISTS tasks(
-                id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT, 
-                user_id INTEGER, 
-                content TEXT,
-                priority INTEGER CHECK (priority IN (1, 2, 3)), 
-                is_done BOOLEAN DEFAULT 0, 
-                created_at TIMESTAMP, 
-                FOREIGN KEY (user_id) REFERENCES users(telegram_id));
-            CREATE TABLE IF NOT EXISTS reminders(
-                user_id INTEGER,
-                type TEXT CHECK (type IN ('DONE', 'LEFT')),
-                reminder_time_locale TEXT,
-                FOREIGN KEY (user_id) REFERENCES users(telegram_id)
-            );
-            CREATE INDEX IF NOT EXISTS idx_telegram_id ON users(telegram_id);
-        ''')
\ No newline at end of file
+
+async def backfill_in_background():
+    """Runs pending migration backfills batch by batch on the writer thread, \
+    pausing between batches so interactive writes are never blocked for long.
+    """
+    while await run_db_call(lambda: run_backfill_batch(get_connection()), write=True):
+        await asyncio.sleep(DB_BACKFILL_PAUSE)
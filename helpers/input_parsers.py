@@ -0,0 +1,106 @@
+# /helpers/input_parsers.py
+
+# NOTE:
+## Parsers for the free-form text users send to the bot. They never raise on bad
+## input; instead they return what could be understood together with one readable
+## error per rejected piece, so handlers can act on the valid part and report the rest.
+
+
+def parse_task_lines(text: str) -> tuple[list[tuple[str, int]], list[str]]:
+    """Parses one "task:priority" pair per line.
+
+    The priority is taken after the last ":" so tasks may contain colons \
+    themselves (e.g. "Call mom at 18:30:2"). Blank lines are ignored.
+
+    Args:
+        text (str): The message text, without any leading command.
+
+    Returns:
+        tuple[list[tuple[str, int]], list[str]]: The valid (task, priority) \
+        pairs in the order they were sent, and an error line for every \
+        line that was rejected.
+    """
+    tasks, errors = [], []
+
+    for (line_number, line) in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line:
+            continue
+
+        content, separator, priority = line.rpartition(":")
+        content = content.strip()
+        if not separator or not content:
+            errors.append(f"Line {line_number} (\"{line}\"): expected task:priority.")
+            continue
+
+        try:
+            priority = int(priority)
+        except ValueError:
+            errors.append(f"Line {line_number} (\"{line}\"): the priority is not a number.")
+            continue
+
+        if priority not in (1, 2, 3):
+            errors.append(f"Line {line_number} (\"{line}\"): the priority must be 1, 2 or 3.")
+            continue
+
+        tasks.append((content, priority))
+
+    return tasks, errors
+
+
+def parse_row_selection(text: str, row_count: int) -> tuple[list[int], list[str]]:
+    """Parses a selection of list rows such as "3", "1-5" or "1-5, 8".
+
+    Args:
+        text (str): The selection, comma separated numbers and ranges.
+        row_count (int): How many rows the list the user saw has.
+
+    Returns:
+        tuple[list[int], list[str]]: The selected (1-based) row numbers, \
+        each once and in the order given, and an error line for every part \
+        that isn't a number/range or falls outside 1..row_count.
+    """
+    rows, errors = [], []
+
+    for part in text.replace(" ", "").split(","):
+        if not part:
+            continue
+
+        start, dash, end = part.partition("-")
+        try:
+            first = int(start)
+            last = int(end) if dash else first
+        except ValueError:
+            errors.append(f"\"{part}\" is not a row number or a range like 1-5.")
+            continue
+
+        first, last = min(first, last), max(first, last)
+        if first < 1 or last > row_count:
+            errors.append(f"\"{part}\" is out of range (your list has {row_count} row(s)).")
+            continue
+
+        rows.extend(range(first, last + 1))
+
+    if not rows and not errors:
+        errors.append("No row numbers were given.")
+
+    return list(dict.fromkeys(rows)), errors
+
+
+def highest_row_number(text: str) -> int:
+    """The largest row number a selection (see :parse_row_selection) names.
+
+    Lets a caller load enough of a paged list before checking the selection \
+    against it. Parts that aren't numbers or ranges are ignored.
+
+    Returns:
+        int: The largest number in the selection, 0 if there's none.
+    """
+    highest = 0
+
+    for part in text.replace(" ", "").split(","):
+        for number in part.partition("-")[::2]:
+            if number.isdecimal():
+                highest = max(highest, int(number))
+
+    return highest
@@ -0,0 +1,236 @@
+# /helpers/outbound_queue.py
+
+# GENERAL PYTHON imports ->
+import asyncio
+from collections import deque
+import logging
+import time
+from typing import Any, Callable, Coroutine
+# TELEGRAM BOT imports ->
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+# LOCAL imports ->
+from config import (
+    OUTBOUND_CHAT_BURST,
+    OUTBOUND_CHAT_MESSAGES_PER_SECOND,
+    OUTBOUND_GROUP_MESSAGES_PER_MINUTE,
+    OUTBOUND_MAX_RETRIES,
+    OUTBOUND_MESSAGES_PER_SECOND,
+    OUTBOUND_RETRY_BACKOFF,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# NOTE:
+## Telegram allows a bot about 30 messages per second overall, about one per second
+## in a private chat and 20 per minute in a group, and answers anything beyond that
+## with RetryAfter. Every request the bot makes to a chat (menu replies and edits
+## through the application's bot, reminders through :module:reminder_sender) goes
+## through the one :class:OutboundQueue below: new messages first wait for the chat's
+## own bucket, then every request waits in a queue per lane drained by a single
+## global bucket, lower lanes first. Edits and deletes skip the chat's bucket (the
+## per-chat limit is on messages, and one menu step already edits or deletes and
+## sends). A menu edit therefore never waits behind a 09:00 burst of reminders, and
+## a RetryAfter pauses all lanes (the limit is the bot's, not the chat's) before the
+## request is retried.
+
+INTERACTIVE_LANE = 0 # Replies and menu edits, the default
+REMINDER_LANE = 1 # Pass as rate_limit_args to send in the background lane
+
+LATENCY_SAMPLES = 1000 # Recent sends per lane the latency percentiles are taken over
+MAX_CHAT_BUCKETS = 10000 # Chats tracked before idle (full) buckets are dropped
+# Endpoints that post a new message to the chat, besides send*, so use up its bucket
+MESSAGE_ENDPOINTS = ("copyMessage", "copyMessages", "forwardMessage", "forwardMessages")
+
+
+class TokenBucket:
+    """*rate* tokens per second, up to *capacity* saved up.
+
+    :method:reserve hands out a token even when there is none yet and returns \
+    how long to wait for it, so waiters are served in the order they came.
+    """
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def delay(self) -> float:
+        """Seconds until a token is available (0 if one is)."""
+        self._refill()
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self._rate
+
+    def is_full(self) -> bool:
+        self._refill()
+        return self._tokens >= self._capacity
+
+    def reserve(self) -> float:
+        """Takes a token and returns the seconds to wait before using it."""
+        wait = self.delay()
+        self._tokens -= 1
+        return wait
+
+
+class OutboundQueue(BaseRateLimiter[int]):
+    """The bot's rate limiter (see :module:telegram.ext:class:BaseRateLimiter).
+
+    Handed to both the application's bot and the reminders' bot; each \
+    initializes and shuts it down with itself, and it runs while either \
+    does. rate_limit_args is the request's lane, INTERACTIVE_LANE if unset. \
+    Requests without a chat (e.g. answerCallbackQuery) are not throttled, \
+    and only new messages (see MESSAGE_ENDPOINTS) count against the chat's \
+    bucket.
+    """
+    def __init__(self, lanes: int = 2):
+        self._lanes = [deque() for _ in range(lanes)]
+        self._global = TokenBucket(OUTBOUND_MESSAGES_PER_SECOND, OUTBOUND_MESSAGES_PER_SECOND)
+        self._chats: dict[int | str, TokenBucket] = {}
+        self._paused_until = 0.0 # time.monotonic() at which a RetryAfter pause ends
+        self._pending: asyncio.Event | None = None
+        self._pump_task: asyncio.Task | None = None
+        self._users = 0 # Bots currently initialized with this queue
+
+        self.peak_depth = [0] * lanes
+        self.sent = [0] * lanes
+        self.retried = 0
+        self.failed = 0
+        self._latencies = [deque(maxlen=LATENCY_SAMPLES) for _ in range(lanes)]
+
+    def __str__(self):
+        print("__STR__: This class serves to keep the bot's messages under Telegram's flood limits.")
+
+    async def initialize(self):
+        self._users += 1
+        self._start_pump()
+
+    async def shutdown(self):
+        self._users = max(0, self._users - 1)
+        if self._users == 0 and self._pump_task is not None:
+            self._pump_task.cancel()
+            self._pump_task = None
+            logger.info(f"Outbound queue stopped: {self.stats()}")
+
+    def _start_pump(self):
+        if self._pump_task is None or self._pump_task.done():
+            self._pending = asyncio.Event()
+            self._pump_task = asyncio.get_running_loop().create_task(self._pump())
+
+    def _chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if isinstance(chat_id, str) or chat_id < 0: # Groups and channels
+                bucket = TokenBucket(OUTBOUND_GROUP_MESSAGES_PER_MINUTE / 60, OUTBOUND_CHAT_BURST)
+            else:
+                bucket = TokenBucket(OUTBOUND_CHAT_MESSAGES_PER_SECOND, OUTBOUND_CHAT_BURST)
+            if len(self._chats) >= MAX_CHAT_BUCKETS:
+                # A full bucket is no different from a new one
+                self._chats = {key: value for (key, value) in self._chats.items() if not value.is_full()}
+            self._chats[chat_id] = bucket
+        return bucket
+
+    async def _pump(self):
+        """Grants the global bucket's tokens to the first waiter of the lowest lane."""
+        while True:
+            await self._pending.wait()
+            wait = max(self._paused_until - time.monotonic(), self._global.delay())
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            waiter = self._next_waiter()
+            if waiter is None:
+                self._pending.clear()
+                continue
+            self._global.reserve()
+            waiter.set_result(None)
+
+    def _next_waiter(self) -> asyncio.Future | None:
+        for lane in self._lanes:
+            while lane:
+                waiter = lane.popleft()
+                if not waiter.done(): # Skipping requests cancelled while queued
+                    return waiter
+        return None
+
+    async def _wait_for_turn(self, lane: int):
+        if self._pump_task is None or self._pump_task.done():
+            self._start_pump() # Used before (or after) a bot initialized it
+        waiter = asyncio.get_running_loop().create_future()
+        self._lanes[lane].append(waiter)
+        self.peak_depth[lane] = max(self.peak_depth[lane], len(self._lanes[lane]))
+        self._pending.set()
+        await waiter
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Any]],
+        args: Any,
+        kwargs: dict[str, Any],
+        endpoint: str,
+        data: dict[str, Any],
+        rate_limit_args: int | None,
+    ):
+        chat_id = data.get("chat_id")
+        if chat_id is None:
+            return await callback(*args, **kwargs)
+
+        try:
+            chat_id = int(chat_id)
+        except (TypeError, ValueError):
+            pass # @channelusername
+        lane = min(rate_limit_args or INTERACTIVE_LANE, len(self._lanes) - 1)
+        new_message = endpoint.startswith("send") or endpoint in MESSAGE_ENDPOINTS
+        started = time.perf_counter()
+
+        for attempt in range(OUTBOUND_MAX_RETRIES + 1):
+            if new_message:
+                chat_wait = self._chat_bucket(chat_id).reserve()
+                if chat_wait:
+                    await asyncio.sleep(chat_wait)
+            await self._wait_for_turn(lane)
+            try:
+                result = await callback(*args, **kwargs)
+            except RetryAfter as e:
+                if attempt == OUTBOUND_MAX_RETRIES:
+                    self.failed += 1
+                    logger.error(f"{e}-> {endpoint} to chat {chat_id} still rate limited after {attempt} retries.")
+                    raise
+                self.retried += 1
+                pause = e.retry_after if isinstance(e.retry_after, (int, float)) else e.retry_after.total_seconds()
+                pause += OUTBOUND_RETRY_BACKOFF * 2 ** attempt
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+                logger.warning(f"{e}-> Pausing outbound messages for {pause:.1f}s (retry {attempt + 1} of {endpoint}).")
+            else:
+                self.sent[lane] += 1
+                self._latencies[lane].append(time.perf_counter() - started)
+                return result
+
+    def stats(self) -> dict:
+        """Queue depths (now and peak), sends and send latency (p50/p95/max \
+        over the last LATENCY_SAMPLES sends, queueing included) per lane."""
+        lanes = {}
+        for (lane, name) in ((INTERACTIVE_LANE, 'interactive'), (REMINDER_LANE, 'reminder')):
+            latencies = sorted(self._latencies[lane])
+
+            def percentile(share: float) -> float:
+                return round(latencies[int(share * (len(latencies) - 1))] * 1000, 1) if latencies else 0.0
+
+            lanes[name] = {
+                'depth': sum(not waiter.done() for waiter in self._lanes[lane]),
+                'peak_depth': self.peak_depth[lane],
+                'sent': self.sent[lane],
+                'p50_ms': percentile(0.5),
+                'p95_ms': percentile(0.95),
+                'max_ms': percentile(1),
+            }
+        return {'lanes': lanes, 'retried': self.retried, 'failed': self.failed}
+
+
+# Process-wide instance shared by the application's and the reminders' bot.
+outbound_queue = OutboundQueue()
@@ -0,0 +1,98 @@
+# /helpers/scheduler/jobstore.py
+
+# GENERAL PYTHON imports ->
+import logging
+from pathlib import Path
+import sqlite3
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from sqlalchemy import create_engine, event
+# LOCAL imports ->
+from config import DATABASE_FILE, DB_BUSY_TIMEOUT_MS, DB_SYNCHRONOUS, JOBSTORE_BACKEND, JOBSTORE_FILE
+
+logger = logging.getLogger(__name__)
+
+
+# NOTE:
+## In "jobs" mode APScheduler rewrites a job's row after every fire. With the jobstore
+## inside data/database.db ("shared", how the bot started out) those commits queue up
+## for the same SQLite writer lock as every task the users add, so a popular reminder
+## minute stalls the menus. JOBSTORE_BACKEND picks where the jobs live instead:
+## - "sqlite" (default): data/jobs.db, a file of its own in WAL mode. Jobs left in
+##   database.db by earlier versions are moved over the first time.
+## - "memory": no file at all; the jobs are rebuilt from the *reminders* table (the
+##   source of truth anyway) every time the bot starts, see :module:reconciliation.
+
+JOBS_TABLE = "apscheduler_jobs" # SQLAlchemyJobStore's default tablename
+
+
+def sqlite_jobstore(jobstore_file: Path) -> SQLAlchemyJobStore:
+    """A SQLAlchemyJobStore on jobstore_file, with the same WAL journal and \
+    pragmas as :module:db_utils's connections."""
+    engine = create_engine(f"sqlite:///{jobstore_file.resolve()}", connect_args={'timeout': DB_BUSY_TIMEOUT_MS / 1000})
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute(f"PRAGMA synchronous = {DB_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+    return SQLAlchemyJobStore(engine=engine, tablename=JOBS_TABLE)
+
+
+def move_shared_jobs(database_file: Path, jobstore_file: Path) -> int:
+    """Moves the jobs an earlier version kept in database_file into jobstore_file.
+
+    Returns:
+        int: The number of jobs moved (0 when there were none).
+    """
+    if not database_file.exists():
+        return 0
+    conn = sqlite3.connect(database_file, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+    try:
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE (type = 'table' AND name = ?)", (JOBS_TABLE,)).fetchone():
+            return 0
+        conn.execute("ATTACH DATABASE ? AS jobs", (str(jobstore_file),))
+        # Same layout SQLAlchemyJobStore creates, so it adopts the table as it is
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS jobs.{JOBS_TABLE} ("
+            "id VARCHAR(191) NOT NULL, next_run_time FLOAT, job_state BLOB NOT NULL, PRIMARY KEY (id))"
+        )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS jobs.ix_{JOBS_TABLE}_next_run_time ON {JOBS_TABLE} (next_run_time)")
+        moved = conn.execute(f"INSERT OR IGNORE INTO jobs.{JOBS_TABLE} SELECT id, next_run_time, job_state FROM main.{JOBS_TABLE}").rowcount
+        conn.execute(f"DROP TABLE main.{JOBS_TABLE}")
+        conn.commit()
+        return moved
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.error(f"{e}-> Could not move the jobs out of {database_file}; they stay there until the next start.")
+        return 0
+    finally:
+        conn.close()
+
+
+def build_jobstore(backend: str = JOBSTORE_BACKEND, database_file: Path = DATABASE_FILE, jobstore_file: Path = JOBSTORE_FILE):
+    """The jobstore bot.py registers as APScheduler's 'default' one.
+
+    Args:
+        backend (str, optional): "sqlite", "memory" or "shared". Defaults \
+        to JOBSTORE_BACKEND.
+        database_file (Path, optional): The bot's database. Defaults to \
+        DATABASE_FILE.
+        jobstore_file (Path, optional): The "sqlite" backend's file. \
+        Defaults to JOBSTORE_FILE.
+    """
+    if backend == "memory":
+        return MemoryJobStore()
+    if backend == "shared":
+        return SQLAlchemyJobStore(url=f"sqlite:///{database_file.resolve()}", tablename=JOBS_TABLE)
+    if backend != "sqlite":
+        logger.warning(f"Unknown JOBSTORE_BACKEND {backend!r}, using 'sqlite'.")
+
+    moved = move_shared_jobs(database_file, jobstore_file)
+    if moved:
+        logger.info(f"Moved {moved} reminder job(s) from {database_file} to {jobstore_file}.")
+    return sqlite_jobstore(jobstore_file)
+
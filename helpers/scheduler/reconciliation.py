@@ -0,0 +1,272 @@
+# /helpers/scheduler/reconciliation.py
+
+# GENERAL PYTHON imports ->
+from datetime import datetime
+import logging
+import pickle
+import sqlite3
+import time
+from typing import NamedTuple
+import apscheduler
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.util import datetime_to_utc_timestamp
+import pytz
+from sqlalchemy import select
+# LOCAL imports ->
+from config import FORMAT_STRING_C, REMINDER_MODE
+from helpers.scheduler.scheduler import reminder_job_id, schedule_reminder_job
+from helpers.user_data_util_classes.time_module import next_local_occurrence
+
+logger = logging.getLogger(__name__)
+
+
+# NOTE:
+## A reminder is written to three places: its *reminders* row, the user's
+## reminder_*_enabled flag and (in "jobs" mode) an APScheduler job. A crash between
+## those writes, or a bug, leaves them disagreeing, so every start reconciles them
+## with the *reminders* rows as the source of truth:
+## - rows of users that no longer exist are deleted;
+## - flags are set where a row exists and cleared where none does;
+## - "jobs" mode: jobs without a row are removed, rows without a job get one, and
+##   jobs firing at another time of day than the row's local time (e.g. after a
+##   timezone change) are replaced. "dispatcher" mode: every reminder job is
+##   removed and next_fire_utc is recomputed where it's missing or wrong.
+## Everything is done with set-based statements and one read of each source. Jobs
+## are added through the scheduler (see :module:scheduler:method:schedule_reminder_job)
+## and removed through the jobstore's own methods, except on the APScheduler release
+## requirements.txt pins, whose SQLAlchemyJobStore table and Job state format this
+## was written against: there jobs are compared by id and next run time without
+## unpickling them, and inserted and deleted in bulk, so 100k users take seconds.
+## It runs before the scheduler starts (see bot.py); the scheduler is woken up
+## afterwards if it is running.
+
+BULK_APSCHEDULER_VERSION = (3, 11)
+JOB_STATE_VERSION = 1 # Job.__getstate__()['version'] on that release
+BULK_CHUNK_SIZE = 500 # Job ids per DELETE ... IN (...) statement
+
+
+class ReconciliationReport(NamedTuple):
+    reminders: int # Rows left after the repairs
+    orphaned_rows: int # Rows deleted, their user was gone
+    flags_enabled: int
+    flags_cleared: int
+    unusable: int # Rows whose time or timezone can't be scheduled
+    jobs_added: int
+    jobs_removed: int
+    jobs_rescheduled: int
+    fire_times_fixed: int
+    seconds: float
+
+
+def repair_reminder_rows(conn: sqlite3.Connection) -> tuple[int, int, int]:
+    """Deletes orphaned *reminders* rows and aligns the users' flags with \
+    the rows, in one transaction.
+
+    Returns:
+        tuple[int, int, int]: Rows deleted, flags set and flags cleared.
+    """
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        orphaned = conn.execute("DELETE FROM reminders WHERE user_id NOT IN (SELECT telegram_id FROM users)").rowcount
+        enabled = cleared = 0
+        for (reminder_type, column) in (('DONE', 'reminder_done_enabled'), ('LEFT', 'reminder_left_enabled')):
+            enabled += conn.execute(
+                f"UPDATE users SET {column} = 1 WHERE {column} IS NOT 1 "
+                "AND telegram_id IN (SELECT user_id FROM reminders WHERE type = ?)", (reminder_type,)
+            ).rowcount
+            cleared += conn.execute(
+                f"UPDATE users SET {column} = 0 WHERE {column} IS NOT 0 "
+                "AND telegram_id NOT IN (SELECT user_id FROM reminders WHERE type = ?)", (reminder_type,)
+            ).rowcount
+        conn.commit()
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    return orphaned, enabled, cleared
+
+
+class FireTime(NamedTuple):
+    """When reminders set for one local time in one timezone fire next."""
+    at: datetime # Aware, in the timezone
+    timestamp: float
+    iana_timezone: str # Keeps equal instants of different timezones apart
+
+
+def expected_fire_times(rows: list[tuple], now_utc: datetime) -> tuple[dict[tuple[int, str], FireTime], int]:
+    """Next fire time of every (rowid, user_id, type, reminder_time_locale, \
+    IANA_timezone, next_fire_utc) row, keyed by (user_id, type).
+
+    Returns:
+        tuple[dict, int]: The fire times, and how many rows had none.
+    """
+    first_fires = {} # Per (timezone, HH:MM), which most reminders share
+    expected = {}
+    unusable = 0
+    for (_, user_id, reminder_type, reminder_time_locale, iana_timezone, _) in rows:
+        try:
+            key = (iana_timezone or "UTC", reminder_time_locale[11:16])
+            if key not in first_fires:
+                reminder_hour, reminder_minute = map(int, key[1].split(":"))
+                first_fire = next_local_occurrence(key[0], reminder_hour, reminder_minute, now_utc)
+                first_fires[key] = FireTime(first_fire, first_fire.timestamp(), key[0])
+        except (TypeError, ValueError, pytz.UnknownTimeZoneError) as e:
+            logger.warning(f"{e}-> Reminder {reminder_type} of user {user_id} has no usable time ({reminder_time_locale!r}).")
+            unusable += 1
+            continue
+        expected[(user_id, reminder_type)] = first_fires[key]
+    return expected, unusable
+
+
+def supports_bulk_writes(store) -> bool:
+    """Whether store's jobs may be read, inserted and deleted straight \
+    through its table, see BULK_APSCHEDULER_VERSION."""
+    return (
+        isinstance(store, SQLAlchemyJobStore)
+        and apscheduler.version_info[:2] == BULK_APSCHEDULER_VERSION
+        and store.engine.dialect.name == "sqlite"
+        and set(store.jobs_t.c.keys()) == {'id', 'next_run_time', 'job_state'}
+    )
+
+
+def read_reminder_jobs(store, bulk: bool) -> dict[str, float | None]:
+    """Id and next run time (UTC timestamp) of every reminder job in store."""
+    if isinstance(store, SQLAlchemyJobStore):
+        store.jobs_t.create(store.engine, checkfirst=True) # Before the scheduler started it
+    if bulk: # Without unpickling every job
+        with store.engine.connect() as connection:
+            rows = connection.execute(select(store.jobs_t.c.id, store.jobs_t.c.next_run_time)).all()
+    else:
+        rows = [(job.id, datetime_to_utc_timestamp(job.next_run_time)) for job in store.get_all_jobs()]
+    return {job_id: next_run_time for (job_id, next_run_time) in rows if job_id.startswith("reminder_")}
+
+
+def delete_jobs(store, job_ids: list[str], bulk: bool):
+    if bulk:
+        with store.engine.begin() as connection:
+            for start in range(0, len(job_ids), BULK_CHUNK_SIZE):
+                connection.execute(store.jobs_t.delete().where(store.jobs_t.c.id.in_(job_ids[start:start + BULK_CHUNK_SIZE])))
+    else:
+        for job_id in job_ids:
+            store.remove_job(job_id)
+
+
+def add_reminder_jobs(scheduler, store, wanted: list[tuple[tuple[int, str], FireTime]], bulk: bool, alias: str = 'default'):
+    """Adds the jobs of many (user_id, reminder_type) reminders through \
+    :module:scheduler:method:schedule_reminder_job, one trigger per fire time.
+
+    With bulk writes, only the first job of every fire time is added that \
+    way; the others are copies of its pickled state that differ in id, name \
+    and args, inserted in one statement. Building and validating a Job is \
+    most of the cost of adding one.
+
+    The jobs are added in the order MemoryJobStore keeps them (next run \
+    time, then id), so each one lands at the end of its list instead of \
+    shifting the ones already there.
+    """
+    triggers = {}
+    templates = {}
+    rows = []
+    wanted = sorted(wanted, key=lambda reminder: (reminder[1].timestamp, reminder_job_id(*reminder[0])))
+    for ((user_id, reminder_type), fire_time) in wanted:
+        if fire_time not in triggers:
+            triggers[fire_time] = IntervalTrigger(days=1, start_date=fire_time.at)
+            job = schedule_reminder_job(scheduler, user_id, reminder_type, fire_time.at, triggers[fire_time], alias)
+            if bulk:
+                templates[fire_time] = job.__getstate__()
+                if templates[fire_time].get('version') != JOB_STATE_VERSION:
+                    logger.warning(f"Unexpected job state {templates[fire_time].get('version')!r}; adding jobs one by one.")
+                    bulk = False
+            continue
+        if not bulk:
+            schedule_reminder_job(scheduler, user_id, reminder_type, fire_time.at, triggers[fire_time], alias)
+            continue
+        job_id = reminder_job_id(user_id, reminder_type)
+        state = {**templates[fire_time], 'id': job_id, 'name': job_id, 'args': (user_id, reminder_type)}
+        rows.append((job_id, fire_time.timestamp, pickle.dumps(state, store.pickle_protocol)))
+
+    if rows:
+        with store.engine.begin() as connection:
+            # Straight to the driver: binding 200k rows through SQLAlchemy's types costs more than the inserts
+            connection.exec_driver_sql(f"INSERT INTO {store.jobs_t.name} (id, next_run_time, job_state) VALUES (?, ?, ?)", rows)
+
+
+def reconcile_reminders(conn: sqlite3.Connection, scheduler, store, mode: str = REMINDER_MODE) -> ReconciliationReport:
+    """Repairs drift between *reminders*, the users' flags and the jobstore.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the bot's database.
+        scheduler: The application's APScheduler.
+        store: Its default jobstore (see :module:jobstore:method:build_jobstore), \
+        a SQLAlchemyJobStore or a MemoryJobStore.
+        mode (str, optional): Defaults to REMINDER_MODE.
+
+    Returns:
+        ReconciliationReport: What was found and repaired.
+    """
+    started = time.perf_counter()
+    now_utc = datetime.now(pytz.utc)
+    orphaned, enabled, cleared = repair_reminder_rows(conn)
+
+    rows = conn.execute(
+        "SELECT r.rowid, r.user_id, r.type, r.reminder_time_locale, u.IANA_timezone, r.next_fire_utc "
+        "FROM reminders AS r JOIN users AS u ON (u.telegram_id = r.user_id)"
+    ).fetchall()
+    expected, unusable = expected_fire_times(rows, now_utc)
+
+    if not isinstance(store, (SQLAlchemyJobStore, MemoryJobStore)):
+        raise TypeError(f"Can't reconcile reminders with a {type(store).__name__}.")
+    bulk = supports_bulk_writes(store)
+    if isinstance(store, SQLAlchemyJobStore) and not bulk:
+        logger.warning(f"No bulk job writes on APScheduler {apscheduler.release}; reconciling through its API (slower).")
+    scheduled = read_reminder_jobs(store, bulk)
+
+    fire_times_fixed = rescheduled = 0
+    new_jobs = [] # ((user_id, reminder_type), FireTime)
+    if mode == "dispatcher":
+        stale_ids = list(scheduled)
+        now_string = now_utc.strftime(FORMAT_STRING_C)
+        updates = []
+        for (rowid, user_id, reminder_type, _, _, next_fire_utc) in rows:
+            fire_time = expected.get((user_id, reminder_type))
+            if fire_time is None:
+                continue
+            fire_time_string = fire_time.at.astimezone(pytz.utc).strftime(FORMAT_STRING_C)
+            # A past one is due and left to the dispatcher, which reschedules it as it claims it
+            if next_fire_utc is None or (next_fire_utc > now_string and next_fire_utc != fire_time_string):
+                updates.append((fire_time_string, rowid))
+        conn.executemany("UPDATE reminders SET next_fire_utc = ? WHERE rowid = ?", updates)
+        conn.commit()
+        fire_times_fixed = len(updates)
+    else:
+        wanted = {reminder_job_id(*key): (key, fire_time) for (key, fire_time) in expected.items()}
+        stale_ids = [job_id for job_id in scheduled if job_id not in wanted]
+        for (job_id, (key, fire_time)) in wanted.items():
+            if job_id in scheduled:
+                next_run_time = scheduled[job_id]
+                # Same time of day (in UTC) as the reminder's next fire means it's on schedule
+                if next_run_time is None or round(next_run_time - fire_time.timestamp) % 86400 == 0:
+                    continue
+                stale_ids.append(job_id)
+                rescheduled += 1
+            new_jobs.append((key, fire_time))
+
+    delete_jobs(store, stale_ids, bulk)
+    add_reminder_jobs(scheduler, store, new_jobs, bulk)
+    if scheduler.running and (stale_ids or new_jobs):
+        scheduler.wakeup()
+
+    return ReconciliationReport(
+        reminders = len(rows),
+        orphaned_rows = orphaned,
+        flags_enabled = enabled,
+        flags_cleared = cleared,
+        unusable = unusable,
+        jobs_added = len(new_jobs) - rescheduled,
+        jobs_removed = len(stale_ids) - rescheduled,
+        jobs_rescheduled = rescheduled,
+        fire_times_fixed = fire_times_fixed,
+        seconds = time.perf_counter() - started,
+    )
@@ -0,0 +1,205 @@
+# /helpers/scheduler/reminder_dispatcher.py
+
+# GENERAL PYTHON imports ->
+import asyncio
+from datetime import datetime, timedelta
+import logging
+import sqlite3
+from typing import NamedTuple
+import pytz
+# LOCAL imports ->
+from config import (
+    FORMAT_STRING_C,
+    REMINDER_DISPATCH_BATCH_SIZE,
+    REMINDER_DISPATCH_CONCURRENCY,
+    REMINDER_MISFIRE_GRACE,
+)
+from helpers.db_utils import get_connection, run_db_call
+from helpers.outbound_queue import outbound_queue
+from helpers.scheduler.reminder_sender import reminder_sender
+from helpers.scheduler.send_reminder_message import render_reminders, send_rendered_reminder
+from helpers.user_data_util_classes.time_module import next_local_occurrence
+
+logger = logging.getLogger(__name__)
+
+
+# NOTE:
+## REMINDER_MODE = "dispatcher" replaces the one-APScheduler-job-per-reminder setup
+## (see :module:scheduler) with a single loop that wakes up once a minute and asks
+## the *reminders* table for everything due, through the index on next_fire_utc.
+## Every due reminder's next_fire_utc is moved to its next local occurrence in the
+## same transaction that claims it, before anything is sent: a crash or restart can
+## drop a reminder, never send it twice. Reminders that came due while the bot was
+## down are sent if they are at most REMINDER_MISFIRE_GRACE seconds late, and
+## skipped (but rescheduled) otherwise, like the job mode's misfire_grace_time.
+
+
+class DueReminder(NamedTuple):
+    user_id: int
+    reminder_type: str
+
+
+def _utc_string(moment: datetime) -> str:
+    return moment.astimezone(pytz.utc).strftime(FORMAT_STRING_C)
+
+
+def _next_fire_utc(iana_timezone: str | None, reminder_time_locale: str, now_utc: datetime) -> str:
+    reminder_hour, reminder_minute = map(int, reminder_time_locale[11:16].split(":"))
+    return _utc_string(next_local_occurrence(iana_timezone or "UTC", reminder_hour, reminder_minute, now_utc))
+
+
+def claim_due_reminders(conn: sqlite3.Connection, now_utc: datetime, batch_size: int = REMINDER_DISPATCH_BATCH_SIZE) -> tuple[list[DueReminder], int]:
+    """Claims up to batch_size reminders due at now_utc and reschedules them.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the bot's database.
+        now_utc (datetime): An aware datetime, the tick's time.
+        batch_size (int, optional): Defaults to REMINDER_DISPATCH_BATCH_SIZE.
+
+    Returns:
+        tuple[list[DueReminder], int]: The reminders to send now, and how \
+        many rows were claimed (0 on error or when nothing is due).
+    """
+    oldest_to_send = _utc_string(now_utc - timedelta(seconds=REMINDER_MISFIRE_GRACE))
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        due = conn.execute(
+            "SELECT r.rowid, r.user_id, r.type, r.reminder_time_locale, r.next_fire_utc, u.IANA_timezone, "
+            "CASE r.type WHEN 'DONE' THEN u.reminder_done_enabled ELSE u.reminder_left_enabled END "
+            "FROM reminders AS r LEFT JOIN users AS u ON (u.telegram_id = r.user_id) "
+            "WHERE r.next_fire_utc <= ? ORDER BY r.next_fire_utc LIMIT ?",
+            (_utc_string(now_utc), batch_size)
+        ).fetchall()
+        if not due:
+            conn.rollback()
+            return [], 0
+
+        # Reminders due together mostly share a timezone and a time of day
+        next_fire_times = {}
+        updates = []
+        unusable = set()
+        for (rowid, user_id, reminder_type, reminder_time_locale, _, iana_timezone, _) in due:
+            try:
+                key = (iana_timezone, reminder_time_locale[11:16])
+                if key not in next_fire_times:
+                    next_fire_times[key] = _next_fire_utc(iana_timezone, reminder_time_locale, now_utc)
+            except (TypeError, ValueError, pytz.UnknownTimeZoneError) as e:
+                # A NULL next_fire_utc takes it out of the claims until the reminder is set again
+                logger.warning(
+                    f"{e}-> Reminder row {rowid} ({reminder_type} of user {user_id}) has no usable time "
+                    f"({reminder_time_locale!r}, {iana_timezone!r}); it won't fire until it's set again."
+                )
+                unusable.add(rowid)
+                updates.append((None, rowid))
+                continue
+            updates.append((next_fire_times[key], rowid))
+        conn.executemany("UPDATE reminders SET next_fire_utc = ? WHERE rowid = ?", updates)
+        conn.commit()
+    except sqlite3.Error as e:
+        if conn.in_transaction:
+            conn.rollback()
+        logger.error(f"{e}-> Claiming due reminders failed; they will be retried on the next tick.")
+        return [], 0
+
+    to_send = [
+        DueReminder(user_id, reminder_type)
+        for (rowid, user_id, reminder_type, _, next_fire_utc, iana_timezone, enabled) in due
+        if enabled == 1 and iana_timezone and next_fire_utc >= oldest_to_send and rowid not in unusable
+    ]
+    if len(to_send) < len(due):
+        logger.info(f"Rescheduled {len(due) - len(to_send)} disabled or missed reminder(s) without sending them.")
+    return to_send, len(due)
+
+
+def fill_missing_fire_times(conn: sqlite3.Connection) -> int:
+    """Gives reminders logged before next_fire_utc existed their next fire time.
+
+    Returns:
+        int: The number of reminders updated.
+    """
+    now_utc = datetime.now(pytz.utc)
+    rows = conn.execute(
+        "SELECT r.rowid, r.reminder_time_locale, u.IANA_timezone FROM reminders AS r "
+        "LEFT JOIN users AS u ON (u.telegram_id = r.user_id) WHERE r.next_fire_utc IS NULL"
+    ).fetchall()
+    updates = []
+    for (rowid, reminder_time_locale, iana_timezone) in rows:
+        try:
+            updates.append((_next_fire_utc(iana_timezone, reminder_time_locale, now_utc), rowid))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"{e}-> Reminder row {rowid} has no usable time ({reminder_time_locale!r}); it won't fire.")
+
+    conn.executemany("UPDATE reminders SET next_fire_utc = ? WHERE rowid = ?", updates)
+    conn.commit()
+    return len(updates)
+
+
+async def dispatch_due_reminders(now_utc: datetime, send=send_rendered_reminder) -> int:
+    """Claims everything due at now_utc, batch by batch on the writer thread, \
+    renders each batch at once (see :module:send_reminder_message:method:render_reminders) \
+    and sends it with at most REMINDER_DISPATCH_CONCURRENCY sends in flight.
+
+    Args:
+        now_utc (datetime): An aware datetime, the tick's time.
+        send (optional): Coroutine function of (user_id, reminder_type, \
+        reminder_content). Defaults to send_rendered_reminder.
+
+    Returns:
+        int: The number of reminders sent (or attempted).
+    """
+    semaphore = asyncio.Semaphore(REMINDER_DISPATCH_CONCURRENCY)
+
+    async def send_one(reminder: DueReminder, reminder_content: str):
+        async with semaphore:
+            await send(reminder.user_id, reminder.reminder_type, reminder_content)
+
+    sent = 0
+    while True:
+        to_send, claimed = await run_db_call(lambda: claim_due_reminders(get_connection(), now_utc), write=True)
+        if to_send:
+            texts = await run_db_call(render_reminders, to_send)
+            await asyncio.gather(*(send_one(reminder, text) for (reminder, text) in zip(to_send, texts)))
+        sent += len(to_send)
+        if claimed < REMINDER_DISPATCH_BATCH_SIZE:
+            return sent
+
+
+async def dispatch_reminders_forever():
+    """Ticks at the start of every minute (see bot.py, REMINDER_MODE). \
+    Reminder jobs left from running in "jobs" mode, which would send every \
+    reminder a second time, are removed by :module:reconciliation before.
+    """
+    filled = await run_db_call(lambda: fill_missing_fire_times(get_connection()), write=True)
+    if filled:
+        logger.info(f"Computed next_fire_utc for {filled} reminder(s).")
+
+    async def tick(now_utc: datetime):
+        try:
+            sent = await dispatch_due_reminders(now_utc)
+        except Exception as e:
+            logger.error(f"{e}-> A reminder dispatch tick failed.")
+        else:
+            if sent:
+                logger.info(
+                    f"Dispatched {sent} reminder(s) due by {_utc_string(now_utc)} UTC; "
+                    f"sender: {reminder_sender.stats()}, queue: {outbound_queue.stats()}"
+                )
+
+    # Sends are paced by :module:outbound_queue, so a big minute can take longer than
+    # a minute to deliver; ticks don't wait for each other, or the reminders due in
+    # the meantime would be claimed late (and past REMINDER_MISFIRE_GRACE, skipped).
+    running_ticks = set()
+    try:
+        while True:
+            task = asyncio.create_task(tick(datetime.now(pytz.utc)))
+            running_ticks.add(task)
+            task.add_done_callback(running_ticks.discard)
+
+            now_utc = datetime.now(pytz.utc)
+            await asyncio.sleep(60 - now_utc.second - now_utc.microsecond / 1_000_000)
+    finally:
+        # Cancelled at shutdown (see bot.py): ticks still sending go with it. Their
+        # reminders are already rescheduled, so they are dropped, never sent twice.
+        for task in running_ticks:
+            task.cancel()
+        await asyncio.gather(*running_ticks, return_exceptions=True)
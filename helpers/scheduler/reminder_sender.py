@@ -0,0 +1,104 @@
+# /helpers/scheduler/reminder_sender.py
+
+# GENERAL PYTHON imports ->
+import asyncio
+import logging
+import time
+# TELEGRAM BOT imports ->
+from telegram.ext import ExtBot
+from telegram.request import HTTPXRequest
+# LOCAL imports ->
+from config import REMINDER_CONNECTION_POOL_SIZE, REMINDER_POOL_TIMEOUT, TOKEN
+from helpers.outbound_queue import REMINDER_LANE, outbound_queue
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderSender:
+    """The one Bot every reminder is sent through.
+
+    Reminders used to build a new telegram.Bot per send, i.e. a new HTTP \
+    client, connection and TLS handshake every time. This keeps a single \
+    initialized Bot with its own pool of REMINDER_CONNECTION_POOL_SIZE \
+    keep-alive connections (separate from the application's, so a burst \
+    of reminders never delays menu replies), started and stopped by bot.py.
+    Its requests go through :module:outbound_queue in the REMINDER_LANE.
+
+    Sends beyond the pool's size wait for a free connection here instead of \
+    inside httpx, where they would fail after pool_timeout; the counters \
+    this keeps (see :method:stats) show how busy the pool gets.
+    """
+    def __init__(self, pool_size: int = REMINDER_CONNECTION_POOL_SIZE):
+        self._pool_size = pool_size
+        self._bot: ExtBot | None = None
+        self._start_lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(pool_size)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.sent = 0
+        self.failed = 0
+        self.waited = 0 # Sends that found every connection busy
+        self._busy_seconds = 0.0
+
+    def __str__(self):
+        print("__STR__: This class serves to send reminders over one pooled, long-lived Bot.")
+
+    async def start(self) -> ExtBot:
+        """Creates and initializes the Bot; a no-op when it's running."""
+        async with self._start_lock:
+            if self._bot is None:
+                request = HTTPXRequest(connection_pool_size=self._pool_size, pool_timeout=REMINDER_POOL_TIMEOUT)
+                bot = ExtBot(token=TOKEN, request=request, rate_limiter=outbound_queue)
+                await bot.initialize()
+                self._bot = bot
+                logger.info(f"Reminder sender started with {self._pool_size} pooled connection(s).")
+            return self._bot
+
+    async def stop(self):
+        async with self._start_lock:
+            if self._bot is not None:
+                await self._bot.shutdown()
+                self._bot = None
+                logger.info(f"Reminder sender stopped: {self.stats()}")
+
+    async def send_message(self, chat_id: int, text: str, **kwargs):
+        """Bot.send_message over the shared pool (started on first use if \
+        bot.py hasn't yet). Exceptions are the caller's to handle.
+        """
+        bot = self._bot or await self.start()
+        kwargs.setdefault('rate_limit_args', REMINDER_LANE)
+
+        if self._slots.locked():
+            self.waited += 1
+        async with self._slots:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            started = time.perf_counter()
+            try:
+                message = await bot.send_message(chat_id, text, **kwargs)
+            except Exception:
+                self.failed += 1
+                raise
+            else:
+                self.sent += 1
+                return message
+            finally:
+                self._busy_seconds += time.perf_counter() - started
+                self.in_flight -= 1
+
+    def stats(self) -> dict:
+        attempts = self.sent + self.failed
+        return {
+            'pool_size': self._pool_size,
+            'in_flight': self.in_flight,
+            'peak_in_flight': self.peak_in_flight,
+            'peak_utilization': self.peak_in_flight / self._pool_size,
+            'waited_for_connection': self.waited,
+            'sent': self.sent,
+            'failed': self.failed,
+            'mean_send_ms': (self._busy_seconds / attempts * 1000) if attempts else 0.0,
+        }
+
+
+# Process-wide instance used by :module:send_reminder_message.
+reminder_sender = ReminderSender()
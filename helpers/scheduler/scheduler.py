@@ -1,17 +1,19 @@
 # /helpers/scheduler.py
 
 # GENERAL PYTHON imports ->
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.triggers.interval import IntervalTrigger
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
-from pytz import timezone
+import pytz
 # TELEGRAM BOT imports ->
 from telegram import Update, Bot
 from telegram.constants import ParseMode
 from telegram.ext import ContextTypes
 from telegram.helpers import escape_markdown
 # LOCAL imports ->
-from config import FORMAT_STRING_C
+from config import FORMAT_STRING_C, REMINDER_MODE
+from helpers.user_data_util_classes.time_module import next_local_occurrence
 from helpers.user_data_util_classes.user_module import User
 from helpers.scheduler.send_reminder_message import send_reminder_runner
 
@@ -35,6 +37,66 @@ logger = logging.getLogger(__name__)
 
 
 # >>> Scheduler Logic >>>
+# NOTE:
+## A reminder's job id is derived from the user and the reminder type
+## ("reminder_{uid}_{type}"), so jobs are always addressed by that key: removing one
+## is a single DELETE by primary key in the jobstore. Listing the jobs instead would
+## load (and unpickle) every user's reminders on each change.
+def remove_reminder_job(scheduler, job_id: str) -> bool:
+    """Removes the job with job_id from the default jobstore, if scheduled.
+
+    Returns:
+        bool: True if a job was removed, False if none was scheduled.
+    """
+    try:
+        scheduler.remove_job(job_id, jobstore='default')
+    except JobLookupError:
+        logger.info(f"No existing job found with name: {job_id}")
+        return False
+    else:
+        logger.info(f"Removed existing reminder job with name: {job_id}")
+        return True
+
+
+def reminder_job_id(user_id: int, reminder_type: str) -> str:
+    return f"reminder_{user_id}_{reminder_type}"
+
+
+def schedule_reminder_job(
+        scheduler,
+        user_id: int,
+        reminder_type: str,
+        first_fire: datetime,
+        trigger: IntervalTrigger | None = None,
+        jobstore: str = 'default'
+    ):
+    """Adds the daily job of one reminder, first firing at first_fire. An \
+    existing job with the same id is replaced in place (a keyed update in \
+    the jobstore).
+
+    To avoid passing context (not a clean object) the job triggers the \
+    standalone :module:send_reminder_message:method:send_reminder_runner.
+    Reminders sharing a first fire time can share one trigger, e.g. when \
+    :module:reconciliation adds many at once.
+    """
+    job_id = reminder_job_id(user_id, reminder_type)
+    return scheduler.add_job(
+        func = send_reminder_runner,
+        trigger = trigger or IntervalTrigger(days=1, start_date=first_fire),
+        args = [user_id, reminder_type],
+        id = job_id,
+        replace_existing = True,
+        name = job_id,
+        misfire_grace_time = 60,
+        # APScheduler's defaults, spelled out (like next_run_time) so the job is
+        # complete before the scheduler starts and fills in what's missing
+        coalesce = True,
+        max_instances = 1,
+        next_run_time = first_fire,
+        jobstore = jobstore,
+    )
+
+
 async def set_user_reminder(
         update: Update, 
         context: ContextTypes.DEFAULT_TYPE, 
@@ -57,63 +119,71 @@ async def set_user_reminder(
     user_id = update.effective_chat.id
     user_input = update.message.text
 
-    user_at_hand = User(user_id)
-    user_iana_tz_str = user_at_hand._info.get('IANA_timezone')
-    user_local_time = user_at_hand.time.get_user_local_time()
+    user_at_hand = User.for_context(context, user_id)
+    user_iana_tz_str = await user_at_hand.time.get_user_timezone_async()
 
     reminder_hour, reminder_minute = map(int, user_input.split(":"))
 
     if user_iana_tz_str:
-        user_iana_tz = timezone(user_iana_tz_str)
-
-        todays_reminder_time = user_iana_tz.localize(datetime.now().replace(
-            hour = reminder_hour,
-            minute = reminder_minute,
-            second = 0,
-            microsecond = 0
-        ))
-        
-        if todays_reminder_time <= user_local_time:
-            # Set for a day after if user's local time passed the reminder's
-            todays_reminder_time += timedelta(days=1)
-
+        # Today's, or tomorrow's if user's local time passed the reminder's
+        todays_reminder_time = next_local_occurrence(user_iana_tz_str, reminder_hour, reminder_minute, datetime.now(pytz.utc))
     else:
         del user_at_hand
         return (1, None)
     
     # Setting up job info
-    job_id = f"reminder_{user_id}_{reminder_type_str}"
+    job_id = reminder_job_id(user_id, reminder_type_str)
 
-    # Remove job if it exists to avoid duplicates and exceptions
-    existing_jobs = context.job_queue.scheduler.get_jobs(jobstore='default')
-    jobs_to_remove = [job for job in existing_jobs if job.id == job_id]
-
-    if not jobs_to_remove:
-        logger.info(f"No existing job found with name: {job_id}")
+    if REMINDER_MODE == "dispatcher":
+        # The minute dispatcher picks it up from the *reminders* row logged below
+        remove_reminder_job(context.job_queue.scheduler, job_id)
     else:
-        for job in jobs_to_remove:
-            job.remove()
-        logger.info(f"Removed existing reminder job(s) with name: {job_id}")
-
-    # To avoid passing context (not a clean object) 
-    # trigger a standalone callback function
-    context.job_queue.scheduler.add_job(
-        func = send_reminder_runner,
-        trigger = IntervalTrigger(days=1, start_date=todays_reminder_time),
-        args = [user_id, reminder_type_str],
-        id = job_id,
-        replace_existing = True,
-        name = job_id,
-        misfire_grace_time = 60,
-    )
+        schedule_reminder_job(context.job_queue.scheduler, user_id, reminder_type_str, todays_reminder_time)
     # Log the reminder onto *reminders* data table as well for a more sound structure ->
-    user_at_hand.reminder.log_reminder(reminder_type_str, todays_reminder_time.strftime(FORMAT_STRING_C))
+    await user_at_hand.reminder.log_reminder_async(reminder_type_str, todays_reminder_time.strftime(FORMAT_STRING_C))
     logger.info(f"Scheduled reminder '{job_id}' for {todays_reminder_time}")
 
     del user_at_hand
     return (0, job_id, todays_reminder_time)
 
 
+async def reschedule_user_reminders(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    """Moves the user's reminders to their current timezone, keeping \
+    their local times. To be called after the timezone changed (see \
+    :module:user_module:method:create_user_profile).
+
+    Args:
+        update (Update): Telegram's Update object
+        context (ContextTypes.DEFAULT_TYPE): Telegram's ContextType object
+
+    Returns:
+        int: The number of reminders rescheduled.
+    """
+    user_id = update.effective_chat.id
+    user_at_hand = User.for_context(context, user_id)
+    info = await user_at_hand.user_info_async()
+    user_iana_tz_str = await user_at_hand.time.get_user_timezone_async()
+    if not info or not user_iana_tz_str:
+        return 0
+
+    rescheduled = 0
+    for (reminder_type_str, info_key) in (('DONE', 'reminder_done'), ('LEFT', 'reminder_left')):
+        reminder_time_locale = info.get(info_key)
+        if not reminder_time_locale:
+            continue
+        reminder_hour, reminder_minute = map(int, reminder_time_locale[11:16].split(":"))
+        next_reminder_time = next_local_occurrence(user_iana_tz_str, reminder_hour, reminder_minute, datetime.now(pytz.utc))
+
+        if REMINDER_MODE != "dispatcher":
+            schedule_reminder_job(context.job_queue.scheduler, user_id, reminder_type_str, next_reminder_time)
+        # Also recomputes next_fire_utc, which the dispatcher goes by
+        await user_at_hand.reminder.log_reminder_async(reminder_type_str, next_reminder_time.strftime(FORMAT_STRING_C))
+        logger.info(f"Rescheduled reminder '{reminder_job_id(user_id, reminder_type_str)}' for {next_reminder_time}")
+        rescheduled += 1
+
+    return rescheduled
+
+
 async def unset_user_reminder(
         update: Update, 
         context: ContextTypes.DEFAULT_TYPE, 
@@ -137,25 +207,17 @@ async def unset_user_reminder(
     """
     
     user_id = update.effective_chat.id
-    user_at_hand = User(user_id)
+    user_at_hand = User.for_context(context, user_id)
     
     job_schedule_removal = 0
     database_reminder_removal = 0
         
-    assumed_job_id = f"reminder_{user_id}_{reminder_type_str}"
+    assumed_job_id = reminder_job_id(user_id, reminder_type_str)
 
-    existing_jobs = context.job_queue.scheduler.get_jobs(jobstore='default')
-    jobs_to_remove = [job for job in existing_jobs if job.id == assumed_job_id]
-
-    if not jobs_to_remove:
-        logger.info(f"No existing job found with name: {assumed_job_id}")
-    else:
-        for job in jobs_to_remove:
-            job.remove()
-        logger.info(f"Removed existing reminder job(s) with name: {assumed_job_id}")
+    if remove_reminder_job(context.job_queue.scheduler, assumed_job_id):
         job_schedule_removal = 1
 
-    database_deletion_result = user_at_hand.reminder.delete_reminder(reminder_type_str)
+    database_deletion_result = await user_at_hand.reminder.delete_reminder_async(reminder_type_str)
     if database_deletion_result == 0:
         logger.info(f"Job with ID {assumed_job_id} was removed from database.")
         database_reminder_removal = 1
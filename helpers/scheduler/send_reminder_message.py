@@ -1,69 +1,156 @@
 # /helpers/scheduler/send_reminder_message.py
 
 # GENERAL PYTHON imports ->
+from datetime import datetime
+import json
 import logging
 # TELEGRAM BOT imports
-from telegram import Bot
 from telegram.helpers import escape_markdown
 # LOCAL IMPORTS
-from helpers.user_data_util_classes.user_module import User
-from config import TOKEN
+from config import FORMAT_STRING_DATE
+from helpers.db_utils import execute_query, run_db_call
+from helpers.scheduler.reminder_sender import reminder_sender
+from helpers.user_data_util_classes.task_module import TaskRow, format_task_rows
+from helpers.user_data_util_classes.time_module import TimeManager, user_timezones
 
 logger = logging.getLogger(__name__)
 
-def determine_message(user_id: int, reminder_type: str) -> str:
+
+# NOTE:
+## A reminder only needs the user's tasks of their local today, so rather than a
+## full User per reminder (a dozen queries each), everything due in a tick is read
+## together: the timezones that aren't cached in one query, then every user's tasks
+## of their own local day in another (json_each carries the (user, day) pairs, so a
+## batch of any size is one statement), and all the texts are rendered in one pass.
+
+def load_todays_tasks(user_ids: list[int]) -> dict[int, list[TaskRow]]:
+    """Reads today's tasks of many users at once.
+
+    Args:
+        user_ids (list[int]): Telegram user ids.
+
+    Returns:
+        dict[int, list[TaskRow]]: Each user's tasks of their local today in \
+        display order (see :module:task_module:method:get_user_tasks); users \
+        without any are left out.
+    """
+    timezones = {}
+    missing = []
+    for uid in set(user_ids):
+        try:
+            timezones[uid] = user_timezones.get(uid)
+        except KeyError:
+            missing.append(uid)
+    if missing:
+        cache_version = user_timezones.version
+        rows = execute_query(
+            "SELECT telegram_id, IANA_timezone FROM users WHERE telegram_id IN (SELECT value FROM json_each(?))",
+            (json.dumps(missing),), True
+        )
+        for (uid, iana_timezone) in rows or []:
+            timezones[uid] = iana_timezone
+            if iana_timezone:
+                user_timezones.put(uid, iana_timezone, cache_version)
+
+    local_days = {} # Per timezone, most users due together share a handful
+    user_days = []
+    for (uid, iana_timezone) in timezones.items():
+        if iana_timezone not in local_days:
+            local_days[iana_timezone] = datetime.strftime(TimeManager.local_time_in(iana_timezone), FORMAT_STRING_DATE)
+        user_days.append((uid, local_days[iana_timezone]))
+
+    query = (
+        "SELECT t.user_id, t.id, t.content, t.priority, t.is_done, t.created_at "
+        "FROM json_each(?) AS j JOIN tasks AS t "
+        "ON (t.user_id = json_extract(j.value, '$[0]') AND t.local_day = json_extract(j.value, '$[1]')) "
+        "ORDER BY t.user_id, t.priority DESC, t.created_at ASC, t.id ASC"
+    )
+    todays_tasks = {}
+    for (uid, *task) in execute_query(query, (json.dumps(user_days),), True) or []:
+        todays_tasks.setdefault(uid, []).append(TaskRow(*task))
+    return todays_tasks
+
+
+def render_reminder(reminder_type: str, user_tasks: list[TaskRow] | None) -> str:
     """Based on reminder_type ('DONE' or 'LEFT') and user's tasks \
     this function creates the proper reminder message text.
 
     Args:
-        user_id (int): Telegram user id
         reminder_type (str): 'DONE' or 'LEFT'
+        user_tasks (list[TaskRow] | None): The user's tasks of today in \
+        display order.
 
     Returns:
-        str: Proper reminder message content
+        str: Proper reminder message content (MarkdownV2)
     """
-    user_at_hand = User(user_id)
-    user_tasks = user_at_hand.task.get_user_tasks()
-    info = user_at_hand._info
+    # Numbered like the list in the tasks menu, so "/mark_done <row>" still applies.
+    # Newlines aren't special to MarkdownV2, so the joined lines are escaped at once.
+    user_task_lines = list(zip(user_tasks, format_task_rows(user_tasks))) if user_tasks else []
 
     if reminder_type == 'DONE':
         reminder_content = escape_markdown(f"🎉 Your achievement reminder for today! Here's your summary:\n\n", version=2)
         if not user_tasks:
             reminder_content += escape_markdown(f"No tasks were logged today! Try adding some new ones.", version=2)
         else:
-            tasks_done_count = f"{info.get('todays_tasks_done', 0)} / {info.get('todays_tasks', "NaN")}"
-            tasks_done_list = [task for task in user_tasks if "✅" in task]
+            tasks_done_list = [line for (task, line) in user_task_lines if task.is_done]
+            tasks_done_count = f"{len(tasks_done_list)} / {len(user_tasks)}"
             reminder_content += escape_markdown(f"You have completed *{tasks_done_count}* tasks so far today:", version=2)
-            reminder_content += "\n".join([escape_markdown(s, version=2) for s in tasks_done_list])
+            reminder_content += escape_markdown("\n".join(tasks_done_list), version=2)
 
     elif reminder_type == 'LEFT':
         reminder_content = escape_markdown(f"⏰ Last call reminder! Tasks still remaining:\n\n", version=2)
         if not user_tasks :
             reminder_content += escape_markdown("No tasks were logged today! Try adding some new ones.", version=2)
         else:
-            tasks_left_list = [task for task in user_tasks if "✅" not in task]
+            tasks_left_list = [line for (task, line) in user_task_lines if not task.is_done]
             if tasks_left_list:
-                reminder_content += "\n".join([escape_markdown(s, version=2) for s in tasks_left_list])
+                reminder_content += escape_markdown("\n".join(tasks_left_list), version=2)
             else:
                 reminder_content += escape_markdown("Great job! All tasks are done for today!", version=2)
 
-    del user_at_hand
     return reminder_content
 
 
-async def send_reminder_runner(user_id: int, reminder_type: str):
-    """This function instantiates a telegram Bot object (standalone) \
-    and sends a message when triggered by the scheduler logic and APScheduler.
+def render_reminders(reminders: list[tuple[int, str]]) -> list[str]:
+    """Renders the texts of many (user_id, reminder_type) reminders, \
+    reading all of their tasks with :load_todays_tasks.
+
+    Returns:
+        list[str]: One message per reminder, in the same order.
+    """
+    todays_tasks = load_todays_tasks([user_id for (user_id, _) in reminders])
+    return [render_reminder(reminder_type, todays_tasks.get(user_id)) for (user_id, reminder_type) in reminders]
+
+
+def determine_message(user_id: int, reminder_type: str) -> str:
+    """:render_reminders for a single reminder (the "jobs" mode's path)."""
+    return render_reminders([(user_id, reminder_type)])[0]
+
+
+async def send_rendered_reminder(user_id: int, reminder_type: str, reminder_content: str):
+    """Sends an already rendered reminder through the process-wide \
+    :module:reminder_sender (one pooled Bot, no context needed).
 
     Args:
         user_id (int): Telegram user id
         reminder_type (str): 'DONE' or 'LEFT'
+        reminder_content (str): The text, see :render_reminders
     """
-    bot = Bot(token=TOKEN)
-    reminder_content = determine_message(user_id, reminder_type)
-
     try:
-        await bot.send_message(user_id, reminder_content, parse_mode="MarkdownV2")
+        await reminder_sender.send_message(user_id, reminder_content, parse_mode="MarkdownV2")
     except Exception as e:
         logger.error(f"Could not send reminder: {e}")
-    logger.info(f"Reminder sent for user {user_id} of type {reminder_type}.")
\ No newline at end of file
+    else:
+        logger.info(f"Reminder sent for user {user_id} of type {reminder_type}.")
+
+
+async def send_reminder_runner(user_id: int, reminder_type: str):
+    """This function renders and sends one reminder when triggered by the \
+    scheduler logic and APScheduler.
+
+    Args:
+        user_id (int): Telegram user id
+        reminder_type (str): 'DONE' or 'LEFT'
+    """
+    reminder_content = await run_db_call(determine_message, user_id, reminder_type)
+    await send_rendered_reminder(user_id, reminder_type, reminder_content)
\ No newline at end of file
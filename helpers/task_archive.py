@@ -0,0 +1,92 @@
+# /helpers/task_archive.py
+
+# GENERAL PYTHON imports ->
+import asyncio
+from datetime import datetime, timedelta, timezone
+import logging
+import sqlite3
+# LOCAL imports ->
+from config import (
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_INTERVAL,
+    DB_BACKFILL_PAUSE,
+    FORMAT_STRING_C,
+    FORMAT_STRING_DATE,
+    TASK_RETENTION_DAYS,
+)
+from helpers.db_utils import get_connection, run_db_call
+
+logger = logging.getLogger(__name__)
+
+
+# NOTE:
+## Every screen of the bot reads today's tasks (or a few days around it), yet the
+## *tasks* table used to keep every task ever logged. Tasks older than
+## TASK_RETENTION_DAYS are moved to *tasks_archive* instead, a batch at a time, so
+## the hot table (and its indexes) only hold recent history. Lifetime counters live
+## in *user_stats* and are unaffected: its delete trigger skips rows that are
+## already in the archive (see :module:db_migrations:method:_user_stats).
+
+
+def archive_batch(conn: sqlite3.Connection, cutoff_day: str, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Moves up to batch_size tasks logged before cutoff_day into the archive.
+
+    The copy and the delete are one transaction, so a task is always in \
+    exactly one of the two tables.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the bot's database.
+        cutoff_day (str): A YYYY-MM-DD day; tasks of earlier days are moved.
+        batch_size (int, optional): Defaults to ARCHIVE_BATCH_SIZE.
+
+    Returns:
+        int: The number of tasks moved (0 on error or when nothing is left).
+    """
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        # Rows not reached by the local_day backfill yet fall back to created_at
+        ids = [row[0] for row in conn.execute(
+            "SELECT id FROM tasks WHERE COALESCE(local_day, substr(created_at, 1, 10)) < ? ORDER BY id LIMIT ?",
+            (cutoff_day, batch_size)
+        )]
+        if not ids:
+            conn.rollback()
+            return 0
+
+        placeholders = ", ".join("?" for _ in ids)
+        conn.execute(
+            "INSERT INTO tasks_archive (id, user_id, content, priority, is_done, created_at, local_day, archived_at) "
+            "SELECT id, user_id, content, priority, is_done, created_at, COALESCE(local_day, substr(created_at, 1, 10)), ? "
+            f"FROM tasks WHERE id IN ({placeholders})",
+            (datetime.now(timezone.utc).strftime(FORMAT_STRING_C), *ids)
+        )
+        conn.execute(f"DELETE FROM tasks WHERE id IN ({placeholders})", ids)
+        conn.commit()
+    except sqlite3.Error as e:
+        if conn.in_transaction:
+            conn.rollback()
+        logger.error(f"{e}-> Archiving a batch of tasks failed; it will be retried on the next run.")
+        return 0
+    else:
+        logger.debug(f"Archived {len(ids)} task(s) logged before {cutoff_day}.")
+        return len(ids)
+
+
+async def archive_in_background():
+    """Runs the archival every ARCHIVE_INTERVAL seconds, batch by batch on \
+    the writer thread with a pause in between, so interactive writes are \
+    never blocked for long.
+    """
+    while True:
+        cutoff_day = (datetime.now(timezone.utc) - timedelta(days=TASK_RETENTION_DAYS)).strftime(FORMAT_STRING_DATE)
+        archived = 0
+        while True:
+            moved = await run_db_call(lambda: archive_batch(get_connection(), cutoff_day), write=True)
+            archived += moved
+            if moved < ARCHIVE_BATCH_SIZE:
+                break
+            await asyncio.sleep(DB_BACKFILL_PAUSE)
+
+        if archived:
+            logger.info(f"Archived {archived} task(s) logged before {cutoff_day}.")
+        await asyncio.sleep(ARCHIVE_INTERVAL)
@@ -0,0 +1,28 @@
+# /helpers/update_scope.py
+
+# GENERAL PYTHON imports ->
+import logging
+# TELEGRAM BOT imports ->
+from telegram import Update
+from telegram.ext import Application
+# LOCAL imports ->
+from helpers.db_utils import count_queries
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateScopedApplication(Application):
+    """PTB Application that wraps every update in a per-update scope.
+
+    While an update is processed, every database statement it causes \
+    (directly or through :module:db_utils:method:run_db_call) is counted \
+    and the total is logged once all handlers are done. The per-update \
+    User identity map lives on the CallbackContext itself, see \
+    :module:user_module:method:User.for_context.
+    """
+    async def process_update(self, update: object) -> None:
+        with count_queries() as counter:
+            await super().process_update(update)
+
+        if isinstance(update, Update):
+            logger.info(f"Update {update.update_id} caused {counter.queries} database hit(s).")
@@ -3,9 +3,12 @@
 # GENERAL PYTHON imports ->
 from datetime import datetime
 import logging
+import pytz
 from sqlite3 import Error
 # LOCAL imports ->
-from helpers.db_utils import execute_query
+from config import FORMAT_STRING_C
+from helpers.db_utils import execute_query, run_db_call
+from .time_module import TimeManager, next_local_occurrence
 
 logger = logging.getLogger(__name__)
 
@@ -20,12 +23,18 @@ class ReminderManager:
     One to log new reminders on the *reminders* table and delete from it, 
     all the same.
     """
-    def __init__(self, uid: int):
+    def __init__(self, uid: int, time: TimeManager | None = None, on_change=None):
         self._uid = uid
+        self.time = time if time is not None else TimeManager(self._uid)
+        self._on_change = on_change # Called after every successful write (see User.invalidate)
 
     def __str__(self):
         print("__STR__: This class serves to add, get, and remove reminders to and from the database.")
 
+    def _notify_change(self):
+        if self._on_change is not None:
+            self._on_change()
+
     def check_reminder_state(self, reminder_type: str, state: int) -> int:
         """This method checks the reminder_done/left_enabled state \
         on the *users* data table.
@@ -81,6 +90,7 @@ class ReminderManager:
             return 1
         else:
             logger.info("User's reminder flag was successfully updated!")
+            self._notify_change()
             return 0
     
     def log_reminder(self, reminder_type: str, reminder_time: datetime) -> int:
@@ -100,14 +110,19 @@ class ReminderManager:
             int: 0 indicates success and 1 due to various reasons is indicating \
             a faliure.
         """
-        reminder_state = self.check_reminder_state(reminder_type, 1)
-
-        if reminder_state != 0:
-            query = "INSERT INTO reminders VALUES (?, ?, ?)"
-            parameters = (self._uid, reminder_type, reminder_time)
-        else:
-            query = "UPDATE reminders SET type = ?, reminder_time_locale = ? WHERE user_id = ?"
-            parameters = (reminder_type, reminder_time, self._uid)
+        # When it's due next, in UTC, for the minute dispatcher (see :module:reminder_dispatcher)
+        iana_timezone = self.time.get_user_timezone()
+        reminder_hour, reminder_minute = map(int, str(reminder_time)[11:16].split(":"))
+        next_fire = next_local_occurrence(iana_timezone or "UTC", reminder_hour, reminder_minute, datetime.now(pytz.utc))
+        next_fire_utc = next_fire.astimezone(pytz.utc).strftime(FORMAT_STRING_C)
+
+        # One row per user and type (see :module:db_migrations:method:_reminder_dispatch)
+        query = (
+            "INSERT INTO reminders (user_id, type, reminder_time_locale, next_fire_utc) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(user_id, type) DO UPDATE SET "
+            "reminder_time_locale = excluded.reminder_time_locale, next_fire_utc = excluded.next_fire_utc"
+        )
+        parameters = (self._uid, reminder_type, reminder_time, next_fire_utc)
 
         try:
             execute_query(query, parameters)
@@ -116,6 +131,7 @@ class ReminderManager:
             return 1
         else:
             logger.info(f"User's reminder was added to the database!")
+            self._notify_change()
             state_update = self.set_reminder_state(reminder_type, 1)
             if state_update != 0:
                 logger.warning("Failed to update user's reminder state.")
@@ -151,7 +167,21 @@ class ReminderManager:
                 return 1
             else:
                 logger.info("User's reminder was successfully deleted from the database!")
+                self._notify_change()
                 state_update = self.set_reminder_state(reminder_type, 0)
                 if state_update != 0:
                     logger.warning("Failed to update user's reminder state.")
                 return 0
+
+    # >>> Awaitable counterparts (see :module:db_utils:method:run_db_call) >>>
+    async def check_reminder_state_async(self, reminder_type: str, state: int) -> int:
+        return await run_db_call(self.check_reminder_state, reminder_type, state)
+
+    async def set_reminder_state_async(self, reminder_type: str, state: int) -> int:
+        return await run_db_call(self.set_reminder_state, reminder_type, state, write=True)
+
+    async def log_reminder_async(self, reminder_type: str, reminder_time: datetime) -> int:
+        return await run_db_call(self.log_reminder, reminder_type, reminder_time, write=True)
+
+    async def delete_reminder_async(self, reminder_type) -> int:
+        return await run_db_call(self.delete_reminder, reminder_type, write=True)
@@ -0,0 +1,157 @@
+# /helpers/user_data_util_classes/stats_module.py
+
+# GENERAL PYTHON imports ->
+from datetime import date, datetime, timedelta
+import logging
+from sqlite3 import Error
+from typing import NamedTuple
+# LOCAL imports ->
+from config import FORMAT_STRING_DATE, STATS_WINDOWS
+from helpers.db_utils import execute_query, run_db_call
+from .time_module import TimeManager
+
+logger = logging.getLogger(__name__)
+
+
+class DayStats(NamedTuple):
+    """One row of *daily_stats*: what a user logged and finished on a local day."""
+    local_day: str
+    logged: int
+    done: int
+
+
+def summarize_daily_stats(rows: list[DayStats], today: date) -> dict:
+    """Folds per-day rows into the numbers the stats screen shows.
+
+    Args:
+        rows (list[DayStats]): The user's days, oldest first, covering at \
+        least the longest of STATS_WINDOWS.
+        today (date): The user's local date.
+
+    Returns:
+        dict: *'windows'* maps each of STATS_WINDOWS to (logged, done, \
+        previous_done), where previous_done is the same count for the \
+        window right before it (None when that reaches past the rows read); \
+        *'last_week'* is the done count of each of the last seven days, \
+        oldest first; *'streak'* and *'best_streak'* count consecutive days \
+        with at least one task done.
+    """
+    by_day = {row.local_day: row for row in rows}
+    longest_window = max(STATS_WINDOWS)
+
+    def totals(first_offset: int, days: int) -> tuple[int, int]:
+        logged = done = 0
+        for offset in range(first_offset, first_offset + days):
+            row = by_day.get((today - timedelta(days=offset)).strftime(FORMAT_STRING_DATE))
+            if row is not None:
+                logged += row.logged
+                done += row.done
+        return logged, done
+
+    windows = {}
+    for days in STATS_WINDOWS:
+        logged, done = totals(0, days)
+        previous_done = totals(days, days)[1] if 2 * days <= longest_window else None
+        windows[days] = (logged, done, previous_done)
+
+    last_week = [totals(offset, 1)[1] for offset in range(6, -1, -1)]
+
+    # Today doesn't break a streak until it's over
+    streak = 0
+    offset = 0 if last_week[-1] else 1
+    while offset < longest_window and totals(offset, 1)[1]:
+        streak += 1
+        offset += 1
+
+    best_streak = run = 0
+    previous_day = None
+    for row in rows:
+        if not row.done:
+            run = 0
+            continue
+        current_day = datetime.strptime(row.local_day, FORMAT_STRING_DATE).date()
+        run = run + 1 if previous_day is not None and current_day - previous_day == timedelta(days=1) else 1
+        previous_day = current_day
+        best_streak = max(best_streak, run)
+
+    return {'windows': windows, 'last_week': last_week, 'streak': streak, 'best_streak': best_streak}
+
+
+class StatsManager:
+    """This class reads a user's activity trends from *daily_stats*, the \
+    per-day rollup kept by triggers on *tasks* (see :module:db_migrations). \
+    A year of trends is at most one row per active day, so the stats screen \
+    never has to scan the tasks themselves.
+    """
+    def __init__(self, uid: int, time: TimeManager | None = None):
+        self._uid = uid
+        self.time = time if time is not None else TimeManager(self._uid)
+
+    def __str__(self):
+        print("__STR__: This class serves to read users' daily task statistics.")
+
+    def get_daily_stats(self, days: int = max(STATS_WINDOWS)) -> tuple[date, list[DayStats]] | None:
+        """Getting the user's per-day counts of the last *days* days
+
+        Args:
+            days (int, optional): How far back to read, today included. \
+            Defaults to the longest of STATS_WINDOWS.
+
+        Returns:
+            tuple[date, list[DayStats]] | None: The user's local date and \
+            their active days in that range, oldest first; None if the \
+            query fails.
+        """
+        today = self.time.get_user_local_time().date()
+        first_day = (today - timedelta(days=days - 1)).strftime(FORMAT_STRING_DATE)
+        query = (
+            "SELECT local_day, logged, done FROM daily_stats "
+            "WHERE (user_id = ? AND local_day >= ?) "
+            "ORDER BY local_day ASC"
+        )
+        try:
+            rows = execute_query(query, (self._uid, first_day), True)
+        except Error as e:
+            logger.error(f"{e}-> Reading daily_stats of user {self._uid} failed.")
+            return None
+        else:
+            return today, [DayStats(*row) for row in rows or []]
+
+    def get_user_stats(self) -> str:
+        """Formats the user's trends into stats-screen ready text
+
+        Returns:
+            str: One block per window of STATS_WINDOWS plus the last week \
+            and streaks, or a short apology if nothing could be read.
+        """
+        daily_stats = self.get_daily_stats()
+        if daily_stats is None:
+            return "Couldn't read your stats right now, please try again later."
+
+        today, rows = daily_stats
+        summary = summarize_daily_stats(rows, today)
+
+        formatted_strings = ["📊 Your Stats"]
+        for (days, (logged, done, previous_done)) in summary['windows'].items():
+            rate = f"{round(100 * done / logged)}%" if logged else "--"
+            line = f"🗓 Last {days} days: {done} done out of {logged} logged ({rate})"
+            if previous_done is not None:
+                change = done - previous_done
+                line += f", {"+" if change >= 0 else ""}{change} vs. the {days} days before"
+            formatted_strings.append(line)
+
+        last_week = " ".join(str(done) for done in summary['last_week'])
+        formatted_strings.extend([
+            f"📈 Done per day this week (oldest first): {last_week}",
+            f"🔥 Current streak: {summary['streak']} day(s)",
+            f"🏆 Best streak (last {max(STATS_WINDOWS)} days): {summary['best_streak']} day(s)",
+        ])
+
+        return "\n".join(formatted_strings)
+
+    # >>> Awaitable counterparts (see :module:db_utils:method:run_db_call) >>>
+    async def get_daily_stats_async(self, days: int = max(STATS_WINDOWS)) -> tuple[date, list[DayStats]] | None:
+        return await run_db_call(self.get_daily_stats, days)
+
+    async def get_user_stats_async(self) -> str:
+        return await run_db_call(self.get_user_stats)
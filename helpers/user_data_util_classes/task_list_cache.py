@@ -0,0 +1,124 @@
+# /helpers/user_data_util_classes/task_list_cache.py
+
+# GENERAL PYTHON imports ->
+from collections import OrderedDict
+from datetime import datetime
+import logging
+import threading
+# LOCAL imports ->
+from config import FORMAT_STRING_DATE, TASK_LIST_CACHE_SIZE
+from helpers.user_data_util_classes.time_module import TimeManager
+
+logger = logging.getLogger(__name__)
+
+
+class TaskListCache:
+    """A bounded LRU cache of the task list pages users navigate through.
+
+    Opening the tasks menu, returning to it from a prompt and paging back \
+    and forth all show the same rows again, so the pages read by \
+    :module:task_module:method:get_user_tasks_page are kept here per user, \
+    together with the user's timezone and the local day they belong to. A \
+    lookup therefore only needs the clock: once the user's local day rolls \
+    over, their pages simply stop matching.
+
+    The cache is write-through: adding or removing tasks drops the user's \
+    entry (page boundaries shift), marking tasks done patches the cached rows \
+    in place, and changing the timezone or deleting the profile drops it too \
+    (see :module:user_module). Only the least recently used users are kept, \
+    up to *max_users*.
+
+    Reads and writes run on different threads, so a page read while the \
+    same user's tasks were written may already be stale; :method:put drops \
+    it. Each user's writes are versioned separately, so other users' writes \
+    never keep a page out.
+    """
+    def __init__(self, max_users: int = TASK_LIST_CACHE_SIZE):
+        self._max_users = max_users
+        self._entries: OrderedDict[int, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._versions: dict[int, int] = {} # Per uid, bumped by every write to its tasks
+        self._epoch = 0 # Bumped when _versions is cleared, outdating every version handed out
+        self.hits = 0
+        self.misses = 0
+
+    def __str__(self):
+        print("__STR__: This class serves to keep recently viewed task list pages out of the database.")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def version(self, uid: int) -> tuple[int, int]:
+        """Read this before querying a page of uid's and hand it to :method:put."""
+        with self._lock:
+            return (self._epoch, self._versions.get(uid, 0))
+
+    def _bump_version(self, uid: int):
+        # Called with the lock held. Versions are kept for at most a few times as
+        # many users as pages are; past that they all start over in a new epoch.
+        if uid not in self._versions and len(self._versions) >= 4 * self._max_users:
+            self._versions.clear()
+            self._epoch += 1
+        self._versions[uid] = self._versions.get(uid, 0) + 1
+
+    def get(self, uid: int, page_key: tuple):
+        """Returns the cached page (a list of TaskRow, or None for an empty \
+        page) or raises KeyError on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(uid)
+            if entry is not None:
+                today = datetime.strftime(TimeManager.local_time_in(entry['timezone']), FORMAT_STRING_DATE)
+                if entry['local_day'] == today and page_key in entry['pages']:
+                    self._entries.move_to_end(uid)
+                    self.hits += 1
+                    return entry['pages'][page_key]
+            self.misses += 1
+        raise KeyError(page_key)
+
+    def put(self, uid: int, timezone: str | None, local_day: str, page_key: tuple, rows, version: tuple[int, int]):
+        with self._lock:
+            if version != (self._epoch, self._versions.get(uid, 0)):
+                return # One of the user's writes landed while the page was being read
+            entry = self._entries.get(uid)
+            if entry is None or entry['local_day'] != local_day or entry['timezone'] != timezone:
+                entry = {'timezone': timezone, 'local_day': local_day, 'pages': {}}
+                self._entries[uid] = entry
+            entry['pages'][page_key] = list(rows) if rows else None
+            self._entries.move_to_end(uid)
+
+            while len(self._entries) > self._max_users:
+                self._entries.popitem(last=False)
+
+    def mark_done(self, uid: int, task_ids):
+        """Patches the cached rows of task_ids to done instead of dropping them."""
+        task_ids = set(task_ids)
+        with self._lock:
+            self._bump_version(uid)
+            entry = self._entries.get(uid)
+            if entry is None:
+                return
+            for (page_key, rows) in entry['pages'].items():
+                if rows:
+                    entry['pages'][page_key] = [
+                        row._replace(is_done=True) if row.id in task_ids else row for row in rows
+                    ]
+
+    def invalidate(self, uid: int):
+        with self._lock:
+            self._bump_version(uid)
+            self._entries.pop(uid, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'users': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+# Process-wide instance shared by every TaskManager.
+task_list_cache = TaskListCache()
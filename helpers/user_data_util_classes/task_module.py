@@ -3,35 +3,113 @@
 # GENERAL PYTHON imports ->
 from datetime import datetime
 from sqlite3 import Error
+from typing import NamedTuple
 # LOCAL imports ->
-from helpers.db_utils import execute_query
+from helpers.db_utils import execute_many, execute_query, run_db_call
+from helpers.user_data_util_classes.task_list_cache import task_list_cache
 from helpers.user_data_util_classes.time_module import TimeManager
 from config import FORMAT_STRING_DATE, FORMAT_STRING_C
 
+
+class TaskRow(NamedTuple):
+    """One of the user's tasks as read from the database."""
+    id: int
+    content: str
+    priority: int
+    is_done: bool
+    created_at: str
+
+
+def format_task_rows(rows: list[TaskRow], first_row_number: int = 1) -> list[str]:
+    """Renders tasks as the numbered lines the bot shows to users.
+
+    Args:
+        rows (list[TaskRow]): Tasks in display order.
+        first_row_number (int, optional): Row number of rows[0], so pages \
+        after the first keep counting where the previous one stopped. \
+        Defaults to 1.
+
+    Returns:
+        list[str]: One "|01|-- content -- 🔥🔥 -- (🔲)" line per task.
+    """
+    formatted_list = []
+    for (row_number, task) in enumerate(rows, start=first_row_number):
+        priority = "🔥" * task.priority
+        is_done = "✅" if task.is_done else "🔲"
+        formatted_list.append(f"|{"0" if row_number <= 9 else ""}{row_number}|-- {task.content} -- {priority} -- ({is_done})")
+
+    return formatted_list
+
+
+class TaskMatch(NamedTuple):
+    """A task found by :TaskManager:search_user_tasks, live or archived."""
+    id: int
+    content: str
+    is_done: bool
+    local_day: str
+
+
+def format_task_matches(rows: list[TaskMatch], first_row_number: int = 1) -> list[str]:
+    """Renders search results like :format_task_rows, with the task's day \
+    instead of its priority (results span the user's whole history).
+    """
+    formatted_list = []
+    for (row_number, task) in enumerate(rows, start=first_row_number):
+        is_done = "✅" if task.is_done else "🔲"
+        formatted_list.append(f"|{"0" if row_number <= 9 else ""}{row_number}|-- {task.content} -- {task.local_day} -- ({is_done})")
+
+    return formatted_list
+
+
+def fts_match_expression(uid: int, text: str) -> str | None:
+    """Turns what the user typed into an FTS5 MATCH expression for *tasks_fts*.
+
+    Every word must occur (as a word prefix, so "shop" finds "shopping") \
+    in one of the user's tasks. Words are quoted, so FTS5 syntax in the \
+    input (AND, *, quotes, column filters) is searched for literally \
+    instead of failing the query.
+
+    Returns:
+        str | None: The expression, None if the text holds no words.
+    """
+    # Words without letters or digits hold no token and would match nothing
+    words = [word.replace('"', '""') for word in text.split() if any(char.isalnum() for char in word)]
+    if not words:
+        return None
+    terms = " AND ".join(f'"{word}"*' for word in words)
+    return f'owner : "u{uid}" AND content : ({terms})'
+
+
 class TaskManager:
     """This class, contains methods for getting, adding, deleting, and \
         marking tasks done on(to) to the database. 
     """
-    def __init__(self, uid: int):
+    def __init__(self, uid: int, time: TimeManager | None = None, on_change=None):
         self._uid = uid
-        self.time = TimeManager(self._uid)
+        self.time = time if time is not None else TimeManager(self._uid)
+        self._on_change = on_change # Called after every successful write (see User.invalidate)
 
     def __str__(self):
         print("__STR__: This class serves to add, get, and remove tasks to and from the database.")
 
-    def get_user_tasks(self) -> list[str] | None:
+    def _notify_change(self):
+        if self._on_change is not None:
+            self._on_change()
+
+    def get_user_tasks(self) -> list[TaskRow] | None:
         """Getting user's tasks from the database
 
         Returns:
-            list[str] | None: Either returns a list of formatted strings \
-            or None if user entered no new tasks or simply something \
-            goes wrong with executing the query.
+            list[TaskRow] | None: Either returns today's tasks in display \
+            order (see :format_task_rows for rendering them) or None if user \
+            entered no new tasks or simply something goes wrong with executing \
+            the query.
         """
-        date = datetime.strftime(self.time.get_user_local_time(), FORMAT_STRING_DATE) + "%"
+        date = datetime.strftime(self.time.get_user_local_time(), FORMAT_STRING_DATE)
         query = (
-            "SELECT * FROM tasks "
-            "WHERE (user_id = ? AND (created_at LIKE ?)) "
-            "ORDER BY priority DESC, created_at ASC "
+            "SELECT id, content, priority, is_done, created_at FROM tasks "
+            "WHERE (user_id = ? AND local_day = ?) "
+            "ORDER BY priority DESC, created_at ASC, id ASC "
         )
         try:
             today_tasks = execute_query(query, (self._uid, date), True)
@@ -39,16 +117,58 @@ class TaskManager:
             return None
         else:
             if today_tasks:
-                formatted_list = []
-                for (index, task) in enumerate(today_tasks):
-                    priority = "🔥" * task[3]
-                    is_done = "✅" if task[4] == 1 else "🔲"
-                    formatted_string = f"|{"0" if index <= 8 else ""}{index+1}|-- {task[2]} -- {priority} -- ({is_done})"
-                    formatted_list.append(formatted_string)
-
-                return formatted_list
+                return [TaskRow(*task) for task in today_tasks]
             else:
                 return None
+
+    def get_user_tasks_page(self, limit: int, after: TaskRow | None = None) -> list[TaskRow] | None:
+        """Getting one page of user's tasks for today, in the same order as \
+        :get_user_tasks, using keyset pagination.
+
+        Rather than an OFFSET (which reads and throws away every earlier row), \
+        a page starts right after the (priority, created_at, id) key of the \
+        last row of the previous one, so only *limit* rows are ever read.
+
+        Args:
+            limit (int): The maximum number of rows to return. Ask for one \
+            more than the page size to learn whether another page follows.
+            after (TaskRow | None, optional): The last row of the previous \
+            page, None for the first page. Defaults to None.
+
+        Returns:
+            list[TaskRow] | None: The page, or None if it's empty or the \
+            query fails. Pages are served from :module:task_list_cache \
+            when possible.
+        """
+        try:
+            return task_list_cache.get(self._uid, self._page_key(limit, after))
+        except KeyError:
+            return self._read_user_tasks_page(limit, after)
+
+    @staticmethod
+    def _page_key(limit: int, after: TaskRow | None) -> tuple:
+        return (limit, after.id if after is not None else None)
+
+    def _read_user_tasks_page(self, limit: int, after: TaskRow | None) -> list[TaskRow] | None:
+        cache_version = task_list_cache.version(self._uid)
+        timezone = self.time.get_user_timezone()
+        date = datetime.strftime(TimeManager.local_time_in(timezone), FORMAT_STRING_DATE)
+        query = "SELECT id, content, priority, is_done, created_at FROM tasks WHERE (user_id = ? AND local_day = ?) "
+        params = [self._uid, date]
+        if after is not None:
+            query += "AND (priority < ? OR (priority = ? AND (created_at > ? OR (created_at = ? AND id > ?)))) "
+            params += [after.priority, after.priority, after.created_at, after.created_at, after.id]
+        query += "ORDER BY priority DESC, created_at ASC, id ASC LIMIT ?"
+        params.append(limit)
+
+        try:
+            page = execute_query(query, tuple(params), True)
+        except Error:
+            return None
+        else:
+            rows = [TaskRow(*task) for task in page] if page else None
+            task_list_cache.put(self._uid, timezone, date, self._page_key(limit, after), rows, cache_version)
+            return rows
            
     def add_user_task(self, task: str, priority: int) -> int:
         """Adds user tasks based on the priority and task string they have sent
@@ -63,58 +183,163 @@ class TaskManager:
             executing the query. 1 Would mean the number entered is out \
             range (not a 1, 2, or a 3). 0 Would mean success.
         """
-        user_current_time_string = datetime.strftime(self.time.get_user_local_time(), FORMAT_STRING_C)
-
-        if priority in [1, 2, 3]:
-            try:
-                execute_query("INSERT INTO tasks (user_id, content, priority, created_at) VALUES (?, ?, ?, ?)",
-                            (self._uid, task, priority, user_current_time_string))
-            except Error:
-                return 2
-        else:
+        return self.add_user_tasks([(task, priority)])
+
+    def add_user_tasks(self, tasks: list[tuple[str, int]]) -> int:
+        """Adds several tasks at once, in one transaction (all or none).
+
+        Args:
+            tasks (list[tuple[str, int]]): (task, priority) pairs, e.g. \
+            as parsed by :module:input_parsers:method:parse_task_lines.
+
+        Returns:
+            int: Same codes as :add_user_task; 1 if any priority is out \
+            of range (nothing is added then).
+        """
+        if not tasks or any(priority not in [1, 2, 3] for (_, priority) in tasks):
             return 1
 
+        user_current_time = self.time.get_user_local_time()
+        user_current_time_string = datetime.strftime(user_current_time, FORMAT_STRING_C)
+        user_local_day = datetime.strftime(user_current_time, FORMAT_STRING_DATE)
+
+        try:
+            execute_many(
+                "INSERT INTO tasks (user_id, content, priority, created_at, local_day) VALUES (?, ?, ?, ?, ?)",
+                [(self._uid, task, priority, user_current_time_string, user_local_day) for (task, priority) in tasks]
+            )
+        except Error:
+            return 2
+
+        task_list_cache.invalidate(self._uid)
+        self._notify_change()
         return 0
     
-    def remove_user_task(self, task: str) -> int:
-        """This method searches for the task and removes it from \
-        the database.
+    def remove_user_task(self, task_id: int) -> int:
+        """Removes one of today's tasks by its id. See :remove_user_tasks."""
+        return self.remove_user_tasks([task_id])
+
+    def remove_user_tasks(self, task_ids: list[int]) -> int:
+        """Removes the given tasks of today with one DELETE by id.
 
         Args:
-            task (str): The entered tasks desired to be removed
+            task_ids (list[int]): Ids of the tasks (see :TaskRow) to be removed.
 
         Returns:
             int: The return value of 1 would mean an error in the \
-            processing of the query, whereas a 0 would mean success in \
-            removing the task
+            processing of the query, 2 that some of the ids weren't (or \
+            no longer were) the user's tasks for today (e.g. they came \
+            from a list rendered on a previous day), whereas a 0 would \
+            mean success in removing all of them
         """
+        user_local_date = datetime.strftime(self.time.get_user_local_time(), FORMAT_STRING_DATE)
+        placeholders = ", ".join("?" for _ in task_ids)
         try:
-            execute_query("DELETE FROM tasks WHERE (user_id = ? AND content = ?)", (self._uid, task))
+            removed = execute_query(
+                f"DELETE FROM tasks WHERE (user_id = ? AND local_day = ? AND id IN ({placeholders}))",
+                (self._uid, user_local_date, *task_ids)
+            )
         except Error:
             return 1
-        
-        return 0
+
+        if removed:
+            task_list_cache.invalidate(self._uid)
+            self._notify_change()
+        return 0 if removed == len(task_ids) else 2
     
-    def mark_done_and_return_new_list(self, task: str) -> list | int | None:
-        """Marks the desired tasks done and returns the updated list of \
-        formatted tasks.
+    def mark_user_task_done(self, task_id: int) -> int:
+        """Marks one of today's tasks done by its id. See :mark_user_tasks_done."""
+        return self.mark_user_tasks_done([task_id])
+
+    def mark_user_tasks_done(self, task_ids: list[int]) -> int:
+        """Marks the given tasks of today done with one UPDATE by id.
 
         Args:
-            task (str): The desired tasks to be marked done passed in \
-            as a string.
+            task_ids (list[int]): Ids of the tasks (see :TaskRow) to be marked done.
 
         Returns:
-            list | int | None: If operation successful, return value would \
-            be a list of formatted (tasks + the task that was newly marked done). \
-            If there were no tasks in the day's list, it would return a None \
-            Otherwise, query execution error would be indicated by a value of 1.
+            int: 0 on success, 1 if executing the query failed, and 2 if \
+            some id isn't one of the user's tasks for today (e.g. it came \
+            from a list rendered on a previous day). Marking is idempotent, \
+            so the call can simply be repeated with re-resolved ids then.
         """
-        user_local_date = datetime.strftime(self.time.get_user_local_time(), FORMAT_STRING_DATE) + "%"
-        update_query = "UPDATE tasks SET is_done = TRUE WHERE (user_id = ? AND content = ? AND (created_at LIKE ?))"
+        user_local_date = datetime.strftime(self.time.get_user_local_time(), FORMAT_STRING_DATE)
+        placeholders = ", ".join("?" for _ in task_ids)
+        update_query = f"UPDATE tasks SET is_done = TRUE WHERE (user_id = ? AND local_day = ? AND id IN ({placeholders}))"
         try:
-            execute_query(update_query, (self._uid, task, user_local_date))
+            updated = execute_query(update_query, (self._uid, user_local_date, *task_ids))
         except Error:
             return 1
+
+        if updated:
+            task_list_cache.mark_done(self._uid, task_ids)
+            self._notify_change()
+        return 0 if updated == len(task_ids) else 2
+
+    def search_user_tasks(self, text: str, limit: int, offset: int = 0) -> list[TaskMatch] | None:
+        """Full-text search over all of the user's tasks, archived ones included.
+
+        Matches come from the *tasks_fts* index (see :module:db_migrations), \
+        best first by FTS5's bm25 rank, so the cost depends on how many tasks \
+        match rather than on how many exist.
+
+        Args:
+            text (str): The words to look for, see :fts_match_expression.
+            limit (int): The maximum number of matches to return. Ask for \
+            one more than the page size to learn whether another page follows.
+            offset (int, optional): Matches to skip. Defaults to 0.
+
+        Returns:
+            list[TaskMatch] | None: The matches, or None if there are none, \
+            the text holds no words, or the query fails.
+        """
+        match_expression = fts_match_expression(self._uid, text)
+        if match_expression is None:
+            return None
+
+        query = (
+            "SELECT f.rowid, f.content, COALESCE(t.is_done, a.is_done), "
+            "COALESCE(t.local_day, substr(t.created_at, 1, 10), a.local_day) "
+            "FROM tasks_fts AS f "
+            "LEFT JOIN tasks AS t ON (t.id = f.rowid) "
+            "LEFT JOIN tasks_archive AS a ON (a.id = f.rowid) "
+            "WHERE tasks_fts MATCH ? "
+            "ORDER BY f.rank, f.rowid DESC LIMIT ? OFFSET ?"
+        )
+        try:
+            matches = execute_query(query, (match_expression, limit, offset), True)
+        except Error:
+            return None
         else:
-            refetched_user_tasks = self.get_user_tasks()
-            return refetched_user_tasks
\ No newline at end of file
+            return [TaskMatch(*match) for match in matches] if matches else None
+
+    # >>> Awaitable counterparts (see :module:db_utils:method:run_db_call) >>>
+    async def get_user_tasks_async(self) -> list[TaskRow] | None:
+        return await run_db_call(self.get_user_tasks)
+
+    async def get_user_tasks_page_async(self, limit: int, after: TaskRow | None = None) -> list[TaskRow] | None:
+        try: # A cached page is answered in memory, without leaving the event loop
+            return task_list_cache.get(self._uid, self._page_key(limit, after))
+        except KeyError:
+            return await run_db_call(self._read_user_tasks_page, limit, after)
+
+    async def add_user_task_async(self, task: str, priority: int) -> int:
+        return await run_db_call(self.add_user_task, task, priority, write=True)
+
+    async def add_user_tasks_async(self, tasks: list[tuple[str, int]]) -> int:
+        return await run_db_call(self.add_user_tasks, tasks, write=True)
+
+    async def remove_user_task_async(self, task_id: int) -> int:
+        return await run_db_call(self.remove_user_task, task_id, write=True)
+
+    async def remove_user_tasks_async(self, task_ids: list[int]) -> int:
+        return await run_db_call(self.remove_user_tasks, task_ids, write=True)
+
+    async def mark_user_task_done_async(self, task_id: int) -> int:
+        return await run_db_call(self.mark_user_task_done, task_id, write=True)
+
+    async def mark_user_tasks_done_async(self, task_ids: list[int]) -> int:
+        return await run_db_call(self.mark_user_tasks_done, task_ids, write=True)
+
+    async def search_user_tasks_async(self, text: str, limit: int, offset: int = 0) -> list[TaskMatch] | None:
+        return await run_db_call(self.search_user_tasks, text, limit, offset)
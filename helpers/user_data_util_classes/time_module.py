@@ -1,16 +1,110 @@
 # /helpers/user_data_util_classes/time_module.py
 
 # GENERAL PYTHON imports ->
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, time, timedelta, tzinfo
+from functools import lru_cache
 import logging
 import pytz
 from sqlite3 import Error
+import threading
 # LOCAL imports ->
-from helpers.db_utils import execute_query
+from config import TZINFO_CACHE_SIZE, USER_TIMEZONE_CACHE_SIZE
+from helpers.db_utils import execute_query, run_db_call
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=TZINFO_CACHE_SIZE)
+def tzinfo_for(iana_timezone: str) -> tzinfo:
+    """pytz.timezone, memoized: the tz database has a few hundred zones and \
+    every user maps to one of them, so each is only built once.
+    """
+    return pytz.timezone(iana_timezone)
+
+
+class UserTimezoneCache:
+    """A bounded LRU map of telegram id to IANA timezone name.
+
+    Nearly every read of the bot starts with the user's local date, i.e. \
+    with their timezone, which only changes through \
+    :module:user_module:method:create_user_profile. So it is read from the \
+    *users* table once and kept here; create_user_profile and \
+    delete_user_profile drop it. Only the least recently used *max_users* \
+    are kept.
+    """
+    def __init__(self, max_users: int = USER_TIMEZONE_CACHE_SIZE):
+        self._max_users = max_users
+        self._timezones: OrderedDict[int, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0 # Bumped by every invalidation, see :method:put
+
+    def __str__(self):
+        print("__STR__: This class serves to keep users' timezones out of the database.")
+
+    def __len__(self) -> int:
+        return len(self._timezones)
+
+    @property
+    def version(self) -> int:
+        """Read this before querying a timezone and hand it to :method:put."""
+        return self._version
+
+    def get(self, uid: int) -> str:
+        """Returns the cached timezone name or raises KeyError on a miss."""
+        with self._lock:
+            iana_timezone = self._timezones[uid]
+            self._timezones.move_to_end(uid)
+            return iana_timezone
+
+    def put(self, uid: int, iana_timezone: str, version: int):
+        with self._lock:
+            if version != self._version:
+                # The timezone changed while it was being read (on another thread)
+                return
+            self._timezones[uid] = iana_timezone
+            self._timezones.move_to_end(uid)
+
+            while len(self._timezones) > self._max_users:
+                self._timezones.popitem(last=False)
+
+    def invalidate(self, uid: int):
+        with self._lock:
+            self._version += 1
+            self._timezones.pop(uid, None)
+
+
+# Process-wide instance shared by every TimeManager.
+user_timezones = UserTimezoneCache()
+
+
+def next_local_occurrence(iana_timezone: str, hour: int, minute: int, after: datetime) -> datetime:
+    """The first moment strictly after *after* at which the wall clock in \
+    iana_timezone reads hour:minute.
+
+    Days are stepped on the local calendar, so a daily reminder keeps its \
+    wall-clock time across DST changes: when the clock skips hour:minute \
+    it fires right after the jump, and when it shows it twice only the \
+    second (standard time) occurrence counts.
+
+    Args:
+        iana_timezone (str): The user's IANA timezone.
+        hour (int): Local hour, 0-23.
+        minute (int): Local minute, 0-59.
+        after (datetime): An aware datetime, usually now.
+
+    Returns:
+        datetime: An aware datetime in iana_timezone.
+    """
+    user_tz = tzinfo_for(iana_timezone)
+    local_day = after.astimezone(user_tz).date()
+    for days_ahead in range(3):
+        naive = datetime.combine(local_day + timedelta(days=days_ahead), time(hour, minute))
+        candidate = user_tz.normalize(user_tz.localize(naive, is_dst=False))
+        if candidate > after:
+            return candidate
+
+
 class TimeManager:
     """A class with two methods to validate time zone and get user's local time
 
@@ -26,16 +120,45 @@ class TimeManager:
     def is_timezone_valid(self, user_input: str) -> bool:
         return (user_input in pytz.all_timezones_set)
 
-    def get_user_local_time(self) -> datetime:
+    def get_user_timezone(self) -> str | None:
         try:
-            user_tz_string = execute_query("SELECT IANA_timezone FROM users WHERE telegram_id = ?", (self._uid,), True)[0][0]
+            return user_timezones.get(self._uid)
+        except KeyError:
+            pass
+
+        cache_version = user_timezones.version
+        try:
+            iana_timezone = execute_query("SELECT IANA_timezone FROM users WHERE telegram_id = ?", (self._uid,), True)[0][0]
         except (TypeError, ValueError, IndexError, Error) as e:
             logger.error(f"No timezone accessible: {e}")
-            user_tz_string = None
+            return None
+        else:
+            if iana_timezone:
+                user_timezones.put(self._uid, iana_timezone, cache_version)
+            return iana_timezone
 
+    def get_user_local_time(self) -> datetime:
+        return self.local_time_in(self.get_user_timezone())
+
+    @staticmethod
+    def local_time_in(user_tz_string: str | None) -> datetime:
+        """Current time in the given IANA timezone, for callers that \
+        already fetched it (e.g. :module:user_module:method:user_info) and \
+        shouldn't pay for another lookup.
+        """
         if user_tz_string:
-            user_tz = pytz.timezone(user_tz_string)
-            return datetime.now(user_tz)
+            return datetime.now(tzinfo_for(user_tz_string))
         else:
             logger.warning("No IANA timezone found, defaulting to UTC.")
-            return datetime.now(pytz.utc)
\ No newline at end of file
+            return datetime.now(pytz.utc)
+
+    async def get_user_timezone_async(self) -> str | None:
+        """Awaitable counterpart of :method:get_user_timezone."""
+        try: # A cached timezone is answered in memory, without leaving the event loop
+            return user_timezones.get(self._uid)
+        except KeyError:
+            return await run_db_call(self.get_user_timezone)
+
+    async def get_user_local_time_async(self) -> datetime:
+        """Awaitable counterpart of :method:get_user_local_time."""
+        return self.local_time_in(await self.get_user_timezone_async())
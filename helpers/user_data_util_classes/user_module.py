@@ -2,15 +2,19 @@
 
 # GENERAL PYTHON imports ->
 from datetime import datetime, timedelta
+from functools import cached_property
 import logging
 import pytz
 from sqlite3 import Error
 # LOCAL imports ->
 from config import FORMAT_STRING_DATE
-from helpers.db_utils import execute_query
+from helpers.db_utils import execute_query, run_db_call, transaction
 from .reminder_module import ReminderManager
+from .stats_module import StatsManager
+from .task_list_cache import task_list_cache
 from .task_module import TaskManager
-from .time_module import TimeManager
+from .time_module import TimeManager, tzinfo_for, user_timezones
+from .user_registry import registered_users
 
 logger = logging.getLogger(__name__)
 
@@ -24,28 +28,104 @@ class User:
     reminders on the database.
     """
     def __init__(self, uid: int):
+        # Construction is free; everything below is loaded on first access and
+        # memoized on the instance. See :method:invalidate for dropping it after writes.
         self._uid = uid
-        self._is_a_user = self.is_a_user()
-        if self._is_a_user: # Only if user has setup timezone, initiate task and reminder manager.
-            self.task = TaskManager(self._uid)
-            self.time = self.task.time
-            self.reminder = ReminderManager(self._uid)
-            self._info = self.user_info()
-        else: # Time manager is initiated either way for setting up timezone
-            self.time = TimeManager(self._uid) 
-            self._info = None
 
     def __str__(self):
         print("__STR__: This class serves to initialize, validate, and get the required info about a user.")
 
+    @cached_property
+    def _is_a_user(self) -> bool:
+        return self.is_a_user()
+
+    @cached_property
+    def _info(self) -> dict | None:
+        # Only if user has setup timezone, there is any info to collect.
+        return self.user_info() if self._is_a_user else None
+
+    @cached_property
+    def time(self) -> TimeManager:
+        return TimeManager(self._uid)
+
+    @cached_property
+    def task(self) -> TaskManager:
+        return TaskManager(self._uid, time=self.time, on_change=self.invalidate)
+
+    @cached_property
+    def reminder(self) -> ReminderManager:
+        return ReminderManager(self._uid, time=self.time, on_change=self.invalidate)
+
+    @cached_property
+    def stats(self) -> StatsManager:
+        return StatsManager(self._uid, time=self.time)
+
+    def invalidate(self, membership: bool = False):
+        """Drops the memoized profile so the next access reloads it.
+
+        The task and reminder managers call this after every successful \
+        write; profile creation/deletion also drops the membership flag.
+
+        Args:
+            membership (bool, optional): Also forget :attr:_is_a_user. \
+            Defaults to False.
+        """
+        self.__dict__.pop('_info', None)
+        if membership:
+            self.__dict__.pop('_is_a_user', None)
+
+    @classmethod
+    def for_context(cls, context, uid: int) -> "User":
+        """Returns the User for uid from the update's identity map.
+
+        One CallbackContext lives for exactly one update and is shared by \
+        every handler (and helper) processing it, so the map is kept on it: \
+        all lookups of the same uid within an update get the same, already \
+        loaded instance instead of reloading it from the database.
+
+        Args:
+            context (ContextTypes.DEFAULT_TYPE): The update's context.
+            uid (int): Telegram user id.
+
+        Returns:
+            User: The shared instance.
+        """
+        identity_map = getattr(context, 'user_identity_map', None)
+        if identity_map is None:
+            identity_map = context.user_identity_map = {}
+
+        if uid not in identity_map:
+            identity_map[uid] = cls(uid)
+        return identity_map[uid]
+
+    @classmethod
+    async def create(cls, uid: int, context=None) -> "User":
+        """Builds a User with its membership flag already resolved, \
+        without blocking the event loop.
+
+        Meant for the handlers that gate on :attr:_is_a_user. Callers that \
+        don't need it can construct User(uid) directly, which is free. When \
+        the update's context is given, the instance comes from (and stays \
+        in) its identity map, see :method:for_context.
+        """
+        user = cls(uid) if context is None else cls.for_context(context, uid)
+        await user.is_a_user_async()
+        return user
+
     def is_a_user(self):
         """Checking to see if user exists on the database based on self._uid
 
+        Once bot.py has loaded :module:user_registry:registered_users, this \
+        is answered from memory and the database isn't queried at all.
+
         Returns:
             bool: If user is already on the database and associated with a timezone \
             the return value will be True. Otherwise, it will be False
         """         
-        user = execute_query('SELECT * FROM users WHERE telegram_id = ?', (self._uid,), True)
+        if registered_users.loaded:
+            return self._uid in registered_users
+
+        user = execute_query('SELECT telegram_id FROM users WHERE telegram_id = ?', (self._uid,), True)
 
         if user is None:
             return False
@@ -65,32 +145,46 @@ class User:
             *'tasks_left'*, *'todays_tasks'*, *'todays_tasks_done'*, *'reminder_done'*, \
             *'reminder_left'*
         """
-        timezone = execute_query("SELECT utc_offset, IANA_timezone FROM users WHERE telegram_id = ?", (self._uid,), True)[0]
-        tasks_logged = execute_query("SELECT COUNT(id) FROM tasks WHERE user_id = ?", (self._uid,), True)[0][0]
-        tasks_done = execute_query("SELECT COUNT(id) FROM tasks WHERE (user_id = ? AND is_done = 1)", (self._uid,), True)[0][0]
-        tasks_left = execute_query("SELECT COUNT(id) FROM tasks WHERE (user_id = ? AND is_done = 0)", (self._uid,), True)[0][0]
-        
-        todays_date = datetime.strftime(self.time.get_user_local_time(), FORMAT_STRING_DATE) + "%"
-        todays_tasks = execute_query(
-            query = "SELECT COUNT(id) FROM tasks WHERE (user_id = ? AND (created_at LIKE ?))",
-            params = (self._uid, todays_date,), 
-            fetch = True
-        )[0][0]
-        todays_tasks_done = execute_query(
-            query = "SELECT COUNT(id) FROM tasks WHERE (user_id = ? AND is_done = 1 AND (created_at LIKE ?))",
-            params = (self._uid, todays_date),
-            fetch = True
-        )[0][0]
-        
-        if execute_query("SELECT reminder_done_enabled FROM users WHERE telegram_id = ?", (self._uid,), True)[0][0] == 1:
-            reminder_done = execute_query("SELECT reminder_time_locale FROM reminders WHERE (user_id = ? AND type = 'DONE')", (self._uid,), True)[0][0]
-        else:
-            reminder_done = None
-        
-        if execute_query("SELECT reminder_left_enabled FROM users WHERE telegram_id = ?", (self._uid,), True)[0][0] == 1:
-            reminder_left = execute_query("SELECT reminder_time_locale FROM reminders WHERE (user_id = ? AND type = 'LEFT')", (self._uid,), True)[0][0]
-        else:
-            reminder_left = None
+        # NOTE:
+        ## Everything is read in one statement. Lifetime counters are a primary-key
+        ## read of *user_stats*, which triggers keep current (see :module:user_stats).
+        ## The user's local date isn't known before their timezone is, but it is
+        ## always the UTC date or one day either side of it, so today's counts are
+        ## grouped per day for those candidates only (one result row each) and the
+        ## right row is picked once the timezone comes back with it.
+        earliest_candidate = (datetime.now(pytz.utc) - timedelta(days=1)).strftime(FORMAT_STRING_DATE)
+        timezone_cache_version = user_timezones.version
+        query = (
+            "SELECT u.utc_offset, u.IANA_timezone, "
+            "s.tasks_logged, s.tasks_done, "
+            "d.day, d.day_tasks, d.day_tasks_done, "
+            "CASE WHEN u.reminder_done_enabled = 1 THEN rd.reminder_time_locale END, "
+            "CASE WHEN u.reminder_left_enabled = 1 THEN rl.reminder_time_locale END "
+            "FROM users AS u "
+            "LEFT JOIN user_stats AS s ON (s.user_id = u.telegram_id) "
+            "LEFT JOIN (SELECT local_day AS day, COUNT(id) AS day_tasks, SUM(is_done = 1) AS day_tasks_done "
+                "FROM tasks WHERE (user_id = ? AND local_day >= ?) GROUP BY local_day) AS d "
+            "LEFT JOIN reminders AS rd ON (rd.user_id = u.telegram_id AND rd.type = 'DONE') "
+            "LEFT JOIN reminders AS rl ON (rl.user_id = u.telegram_id AND rl.type = 'LEFT') "
+            "WHERE u.telegram_id = ?"
+        )
+        rows = execute_query(query, (self._uid, earliest_candidate, self._uid), True)
+
+        timezone = None
+        tasks_logged = tasks_done = tasks_left = todays_tasks = todays_tasks_done = None
+        reminder_done = reminder_left = None
+
+        if rows:
+            utc_offset, iana_timezone, tasks_logged, tasks_done, _, _, _, reminder_done, reminder_left = rows[0]
+            timezone = (utc_offset, iana_timezone)
+            if iana_timezone:
+                user_timezones.put(self._uid, iana_timezone, timezone_cache_version)
+            tasks_left = (tasks_logged or 0) - (tasks_done or 0)
+
+            todays_date = datetime.strftime(self.time.local_time_in(iana_timezone), FORMAT_STRING_DATE)
+            for (_, _, _, _, day, day_tasks, day_tasks_done, _, _) in rows:
+                if day == todays_date:
+                    todays_tasks, todays_tasks_done = day_tasks, day_tasks_done
 
         user_info = {
             "utc_offset": timezone[0] if timezone else "UTC+00:00",
@@ -112,7 +206,7 @@ class User:
         Args:
             user_input (str): Takes in the input user IANA time zone
         """
-        user_tz = pytz.timezone(user_input)
+        user_tz = tzinfo_for(user_input)
         user_tz_raw = datetime.now(user_tz).strftime("%z")
         user_tz_offset = f"UTC{user_tz_raw[0:3]}:{user_tz_raw[3:]}"
 
@@ -124,45 +218,51 @@ class User:
             params = (user_tz_offset, user_input, self._uid)
 
         execute_query(query, params)
+        registered_users.add(self._uid)
+        user_timezones.invalidate(self._uid)
+        task_list_cache.invalidate(self._uid) # Cached pages belong to the old timezone's day
+        self.invalidate(membership=True)
 
     def delete_user_profile(self):
-        """Removes user's data from *users* and *tasks* tables 
+        """Removes user's data from *users*, *tasks* and the task archive
 
-        This method deletes all exisiting data on a user from two tables.\
+        This method deletes all exisiting data on a user from these tables.\
         Removing from the data from the table *reminders* is up to \
         :method:unset_user_reminder function within the scheduler module.
 
         See Also: :module:scheduler:method:unset_user_reminder 
         """
-        query_1 = "DELETE FROM users WHERE telegram_id = ?"
-        query_2 = "DELETE FROM tasks WHERE user_id = ?"
         param = (self._uid,)
 
         try:
-            execute_query(query_1, param)
+            # One transaction, so a failure never leaves tasks without their user
+            with transaction() as conn:
+                conn.execute("DELETE FROM users WHERE telegram_id = ?", param)
+                conn.execute("DELETE FROM tasks WHERE user_id = ?", param)
+                conn.execute("DELETE FROM tasks_archive WHERE user_id = ?", param)
+                conn.execute("DELETE FROM user_stats WHERE user_id = ?", param)
+                conn.execute("DELETE FROM daily_stats WHERE user_id = ?", param)
         except Error as e:
-            logger.error(f"No user with ID {self._uid} was accessible.")
+            logger.error(f"{e}-> Removing the data of user {self._uid} failed; nothing was removed.")
         else:
-            logger.info("User's row was successfully removed!")
+            registered_users.discard(self._uid)
+            logger.info("User's row and tasks were successfully removed!")
 
-        try:
-            execute_query(query_2, param)
-        except Error as e:
-            logger.error("No tasks for the user with ID {self._uid} was accessible.")
-        else:
-            logger.info("User's tasks were successfully removed!")
+        user_timezones.invalidate(self._uid)
+        task_list_cache.invalidate(self._uid)
+        self.invalidate(membership=True)
 
     def get_user_profile(self) -> str:
         """Formats user info into profile ready data
 
-        This function takes the data in the info dictionary returned \
-        from the :method:self.user_info
+        This function takes the data in the (memoized) info dictionary \
+        returned from the :method:self.user_info
 
         Returns:
             str: Returns a formatted string ready to be put into the \
             main_menu_handler's profile section.
         """
-        info = self.user_info()
+        info = self._info
 
         if info.get('reminder_done') is None:
             reminder_done = "None set!"
@@ -187,4 +287,29 @@ class User:
 
         whole_string = "\n".join(formatted_strings)
         
-        return whole_string
\ No newline at end of file
+        return whole_string
+
+    # >>> Awaitable counterparts (see :module:db_utils:method:run_db_call) >>>
+    async def is_a_user_async(self) -> bool:
+        if '_is_a_user' not in self.__dict__:
+            if registered_users.loaded: # In-memory answer, no need to leave the event loop
+                self.__dict__['_is_a_user'] = self.is_a_user()
+            else:
+                self.__dict__['_is_a_user'] = await run_db_call(self.is_a_user)
+        return self._is_a_user
+
+    async def user_info_async(self) -> dict | None:
+        """Awaitable access to the memoized :attr:_info."""
+        if '_info' not in self.__dict__:
+            await self.is_a_user_async()
+            self.__dict__['_info'] = await run_db_call(self.user_info) if self._is_a_user else None
+        return self._info
+
+    async def create_user_profile_async(self, user_input: str):
+        return await run_db_call(self.create_user_profile, user_input, write=True)
+
+    async def delete_user_profile_async(self):
+        return await run_db_call(self.delete_user_profile, write=True)
+
+    async def get_user_profile_async(self) -> str:
+        return await run_db_call(self.get_user_profile)
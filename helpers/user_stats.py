@@ -0,0 +1,98 @@
+# /helpers/user_stats.py
+
+# GENERAL PYTHON imports ->
+import argparse
+import logging
+import sqlite3
+# LOCAL imports ->
+from config import DATABASE_FILE
+from helpers.db_migrations import USER_STATS_REBUILD_QUERY
+
+logger = logging.getLogger(__name__)
+
+
+# NOTE:
+## *user_stats* holds each user's lifetime tasks_logged/tasks_done so the profile
+## screen reads one row instead of counting all of the user's tasks. Triggers on
+## *tasks* keep it exact (see :module:db_migrations:method:_user_stats); the
+## functions below verify that against the real rows and rebuild it if needed.
+## Tasks that existed before the table did are counted by migration 4's batched
+## backfill, so counters are short until it completes.
+
+USER_STATS_MIGRATION = 4
+
+
+def find_inconsistent_stats(conn: sqlite3.Connection) -> list[tuple]:
+    """Compares *user_stats* with counts recomputed from *tasks* and *tasks_archive*.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the bot's database.
+
+    Returns:
+        list[tuple]: (user_id, stored_logged, stored_done, actual_logged, \
+        actual_done) for every user whose counters are off or missing.
+    """
+    query = (
+        "WITH actual AS ("
+            "SELECT user_id, COUNT(id) AS logged, SUM(is_done = 1) AS done FROM ("
+                "SELECT user_id, id, is_done FROM tasks UNION ALL SELECT user_id, id, is_done FROM tasks_archive"
+            ") WHERE user_id IS NOT NULL GROUP BY user_id"
+        ") "
+        "SELECT a.user_id, s.tasks_logged, s.tasks_done, a.logged, a.done FROM actual AS a "
+        "LEFT JOIN user_stats AS s ON (s.user_id = a.user_id) "
+        "WHERE s.user_id IS NULL OR s.tasks_logged != a.logged OR s.tasks_done != a.done "
+        "UNION ALL "
+        "SELECT s.user_id, s.tasks_logged, s.tasks_done, 0, 0 FROM user_stats AS s "
+        "WHERE (s.tasks_logged != 0 OR s.tasks_done != 0) AND s.user_id NOT IN (SELECT user_id FROM actual)"
+    )
+    return conn.execute(query).fetchall()
+
+
+def backfill_pending(conn: sqlite3.Connection) -> bool:
+    """Whether migration 4's backfill is still counting older tasks."""
+    return conn.execute(
+        "SELECT 1 FROM schema_version WHERE (version = ? AND backfill_done = 0)", (USER_STATS_MIGRATION,)
+    ).fetchone() is not None
+
+
+def rebuild_user_stats(conn: sqlite3.Connection):
+    """Recomputes every user's counters from scratch in one transaction. \
+    That counts every task, so a pending backfill is marked done with it."""
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM user_stats")
+        conn.execute(USER_STATS_REBUILD_QUERY)
+        conn.execute(
+            "UPDATE schema_version SET backfill_cursor = 0, backfill_done = 1 WHERE version = ?", (USER_STATS_MIGRATION,)
+        )
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.error(f"{e}-> Rebuilding user_stats failed and was rolled back.")
+        raise
+    else:
+        logger.info("Rebuilt user_stats.")
+
+
+if __name__ == "__main__":
+    # python -m helpers.user_stats [--rebuild]
+    parser = argparse.ArgumentParser(description="Check (and optionally rebuild) TodoPrompt's user_stats counters.")
+    parser.add_argument("--rebuild", action="store_true", help="recompute the counters if any are inconsistent")
+    arguments = parser.parse_args()
+
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', level=logging.INFO)
+    if not DATABASE_FILE.exists():
+        parser.exit(1, f"No database at {DATABASE_FILE.resolve()}; run this from the bot's directory.\n")
+    connection = sqlite3.connect(DATABASE_FILE)
+    if backfill_pending(connection):
+        logger.warning("The user_stats backfill hasn't finished; counters of users with older tasks are expected to be short.")
+
+    mismatches = find_inconsistent_stats(connection)
+    for (user_id, stored_logged, stored_done, actual_logged, actual_done) in mismatches:
+        logger.warning(f"User {user_id}: stored {stored_logged}/{stored_done}, actual {actual_logged}/{actual_done} (logged/done).")
+    logger.info(f"{len(mismatches)} user(s) with inconsistent counters.")
+
+    if mismatches and arguments.rebuild:
+        rebuild_user_stats(connection)
+    connection.close()
+    parser.exit(1 if mismatches and not arguments.rebuild else 0)